@@ -0,0 +1,168 @@
+"""
+배포용 단일 모델 번들 생성 스크립트 (ksl_bundle.bin)
+정적 모델 + 시퀀스 모델 + 라벨 + 설정을 파일 하나로 묶는다.
+
+번들 구조 (리틀 엔디언):
+  0   8바이트  매직 b"KSLBNDL\\0"
+  8   uint32   포맷 버전
+  12  uint32   헤더 길이 (바이트)
+  16  헤더 JSON (UTF-8): 라벨, max_timesteps, 각 섹션의 offset/shape/dtype
+  이후 64바이트 정렬된 데이터 섹션들 (가중치 배열, 정규화 통계, TFLite 모델)
+
+정적 모델은 정규화 (x - mean) / std를 첫 번째 Dense 레이어에 미리 합쳐서 저장하므로
+서버에서 별도 정규화 없이 바로 NumPy로 추론한다.
+서버(myproject/api/model_bundle.py)는 이 파일을 mmap으로 열어 복사 없이 사용한다.
+
+사용법: python build_bundle.py [시퀀스 TFLite 종류: fp16|fp32|int8] (기본 fp16)
+서버는 KSL_USE_BUNDLE=1로 실행할 때만 myproject/model/ksl_bundle.bin을 사용한다.
+"""
+import os
+import sys
+import json
+import struct
+from datetime import datetime
+import numpy as np
+
+# 경로 설정
+BASE_DIR = os.path.dirname(__file__)
+MODEL_DIR = os.path.join(BASE_DIR, "model")
+BUNDLE_PATH = os.path.join(MODEL_DIR, "ksl_bundle.bin")
+
+MAGIC = b"KSLBNDL\0"
+FORMAT_VERSION = 1
+ALIGN = 64
+
+
+def load_static_layers():
+    """정적 모델 Dense 레이어 (W, b, activation) 목록
+
+    export_numpy.py 결과(ksl_model.npz)가 있으면 TensorFlow 없이 읽고,
+    없으면 ksl_model.h5에서 직접 추출한다.
+    """
+    npz_path = os.path.join(MODEL_DIR, "ksl_model.npz")
+    if os.path.exists(npz_path):
+        with np.load(npz_path) as data:
+            n = int(data["num_layers"])
+            return [(data[f"W{i}"], data[f"b{i}"], str(data["activations"][i])) for i in range(n)]
+
+    import tensorflow as tf
+    model = tf.keras.models.load_model(os.path.join(MODEL_DIR, "ksl_model.h5"))
+    layers = []
+    for layer in model.layers:
+        if isinstance(layer, tf.keras.layers.Dropout):
+            continue
+        if not isinstance(layer, tf.keras.layers.Dense):
+            raise ValueError(f"❌ Dense/Dropout 외 레이어는 번들에 넣을 수 없습니다: {layer.name}")
+        W, b = layer.get_weights()
+        layers.append((W, b, layer.get_config()["activation"]))
+    return layers
+
+
+def fold_normalization(layers, mean, std):
+    """(x - mean) / std @ W + b  ==  x @ (W / std) + (b - (mean / std) @ W)"""
+    W, b, activation = layers[0]
+    W = W.astype(np.float64)
+    folded_W = W / std.astype(np.float64)[:, None]
+    folded_b = b.astype(np.float64) - (mean.astype(np.float64) / std.astype(np.float64)) @ W
+    return [(folded_W, folded_b, activation)] + list(layers[1:])
+
+
+class BundleWriter:
+    """헤더에 들어갈 섹션 정보를 모으면서 데이터 섹션을 정렬해 쌓는다"""
+
+    def __init__(self):
+        self.sections = []  # (상대 offset, bytes)
+        self.size = 0
+
+    def _add(self, data):
+        self.size += (-self.size) % ALIGN
+        offset = self.size
+        self.sections.append((offset, data))
+        self.size += len(data)
+        return offset
+
+    def add_array(self, array, dtype=np.float32):
+        array = np.ascontiguousarray(array, dtype=dtype)
+        offset = self._add(array.tobytes())
+        return {"offset": offset, "shape": list(array.shape), "dtype": np.dtype(dtype).str}
+
+    def add_bytes(self, data):
+        return {"offset": self._add(data), "length": len(data)}
+
+    def write(self, path, header):
+        # 헤더 길이가 정해져야 데이터 시작 위치가 정해지므로, 상대 offset을 절대 offset으로 고친 뒤
+        # 헤더 길이가 바뀌지 않을 때까지 반복
+        data_start = 0
+        while True:
+            fixed = _shift_offsets(header, data_start)
+            header_bytes = json.dumps(fixed, ensure_ascii=False).encode("utf-8")
+            start = 16 + len(header_bytes)
+            start += (-start) % ALIGN
+            if start == data_start:
+                break
+            data_start = start
+
+        with open(path, "wb") as f:
+            f.write(struct.pack("<8sII", MAGIC, FORMAT_VERSION, len(header_bytes)))
+            f.write(header_bytes)
+            for offset, data in self.sections:
+                f.write(b"\0" * (data_start + offset - f.tell()))
+                f.write(data)
+
+
+def _shift_offsets(node, base):
+    if isinstance(node, dict):
+        return {k: (v + base if k == "offset" else _shift_offsets(v, base)) for k, v in node.items()}
+    if isinstance(node, list):
+        return [_shift_offsets(v, base) for v in node]
+    return node
+
+
+def main():
+    seq_variant = sys.argv[1] if len(sys.argv) > 1 else "fp16"
+    writer = BundleWriter()
+
+    # 1. 정적 모델 (정규화를 첫 레이어에 합침)
+    layers = load_static_layers()
+    mean = np.load(os.path.join(MODEL_DIR, "ksl_norm_mean.npy"))
+    std = np.load(os.path.join(MODEL_DIR, "ksl_norm_std.npy"))
+    layers = fold_normalization(layers, mean, std)
+    static_labels = np.load(os.path.join(MODEL_DIR, "ksl_labels.npy"), allow_pickle=True)
+    header = {
+        "format_version": FORMAT_VERSION,
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "static": {
+            "labels": [str(l) for l in static_labels],
+            "normalization": "folded",
+            "layers": [
+                {"W": writer.add_array(W), "b": writer.add_array(b), "activation": activation}
+                for W, b, activation in layers
+            ]
+        }
+    }
+    print(f"✅ 정적 모델: {len(layers)}개 Dense 레이어, {len(static_labels)}개 라벨 (정규화 합침)")
+
+    # 2. 시퀀스 모델 (TFLite 모델 바이트를 그대로 넣음)
+    seq_tflite_path = os.path.join(MODEL_DIR, f"ksl_sequence_{seq_variant}.tflite")
+    if os.path.exists(seq_tflite_path):
+        with open(seq_tflite_path, "rb") as f:
+            tflite_bytes = f.read()
+        seq_labels = np.load(os.path.join(MODEL_DIR, "ksl_seq_labels.npy"), allow_pickle=True)
+        header["sequence"] = {
+            "labels": [str(l) for l in seq_labels],
+            "max_timesteps": int(np.load(os.path.join(MODEL_DIR, "ksl_seq_max_timesteps.npy"))),
+            "norm_mean": writer.add_array(np.load(os.path.join(MODEL_DIR, "ksl_seq_norm_mean.npy"))),
+            "norm_std": writer.add_array(np.load(os.path.join(MODEL_DIR, "ksl_seq_norm_std.npy"))),
+            "tflite": dict(writer.add_bytes(tflite_bytes), variant=f"tflite-{seq_variant}")
+        }
+        print(f"✅ 시퀀스 모델: {os.path.basename(seq_tflite_path)}, {len(seq_labels)}개 라벨")
+    else:
+        print(f"⚠️ 시퀀스 TFLite 모델 없음: {seq_tflite_path} - 정적 모델만 번들에 포함")
+        print("   export_sequence_tflite.py를 먼저 실행하세요.")
+
+    writer.write(BUNDLE_PATH, header)
+    print(f"\n✅ 번들 저장 완료: {BUNDLE_PATH} ({os.path.getsize(BUNDLE_PATH) / 1024:.1f} KB)")
+
+
+if __name__ == "__main__":
+    main()
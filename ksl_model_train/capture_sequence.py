@@ -1,11 +1,16 @@
 import os
+import sys
 import csv
 import time
 import cv2
+import numpy as np
 import mediapipe as mp
-from collections import deque
 from datetime import datetime
 
+# 서버와 같은 특징 계산 (myproject/api/features.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "myproject"))
+from api.features import SEQUENCE_LANDMARKS, SEQUENCE_LANDMARK_NAMES, sequence_features
+
 # Paths
 BASE_DIR = os.path.dirname(__file__)
 OUT_ROOT = os.path.join(BASE_DIR, "data_seq")
@@ -14,10 +19,7 @@ os.makedirs(OUT_ROOT, exist_ok=True)
 # Capture params
 FPS_TARGET = 20
 WINDOW_FRAMES = 16  # ~0.8s at 20fps; adjust to 12 for ~0.6s
-USE_LANDMARKS = {
-    0: "wrist",
-    8: "index_tip",
-}
+USE_LANDMARKS = SEQUENCE_LANDMARK_NAMES  # {0: "wrist", 8: "index_tip"}
 
 # Target count
 TARGET_COUNT = 50  # 목표 수집 개수
@@ -75,9 +77,6 @@ def write_sequence_csv(seq_rows, out_dir, label):
         writer.writerows(seq_rows)
     return fpath
 
-# Ring buffer for last frame to compute deltas
-prev_xy = {}
-
 while True:
     ret, frame = cap.read()
     if not ret:
@@ -133,8 +132,9 @@ while True:
     
     print("🎬 녹화 시작! 지금 움직이세요!")
     
-    seq_rows = []
-    prev_xy = {}
+    clip_frames = []  # 손이 감지된 프레임 번호
+    clip_points = []  # 그 프레임의 (21, 2) 랜드마크
+    clip_visibility = []
     frames_to_capture = WINDOW_FRAMES
 
     for fi in range(frames_to_capture):
@@ -168,43 +168,34 @@ while True:
 
         if res2.multi_hand_landmarks:
             lms = res2.multi_hand_landmarks[0].landmark
-            # Collect only selected landmarks
-            cur_frame_rows = []
-            spd_sum_total = 0.0
-            for lm_id, lm_name in USE_LANDMARKS.items():
-                lm = lms[lm_id]
-                x, y, vis = float(lm.x), float(lm.y), float(getattr(lm, "visibility", 1.0))
-                dx = dy = 0.0
-                if lm_id in prev_xy:
-                    dx = x - prev_xy[lm_id][0]
-                    dy = y - prev_xy[lm_id][1]
-                spd = abs(dx) + abs(dy)
-                spd_sum_total += spd
-                cur_frame_rows.append({
+            clip_frames.append(fi)
+            clip_points.append([(lm.x, lm.y) for lm in lms])
+            clip_visibility.append([float(getattr(lms[lm_id], "visibility", 1.0)) for lm_id in SEQUENCE_LANDMARKS])
+        # 손이 없는 프레임은 기록하지 않음 (dx/dy는 직전에 손이 감지된 프레임 기준)
+
+        # pace capture
+        time.sleep(max(0, 1.0 / FPS_TARGET - 0.001))
+
+    # 클립 전체 특징을 한 번에 계산 (서버와 같은 함수, CSV에는 float64 그대로 기록)
+    seq_rows = []
+    if clip_points:
+        features = sequence_features(np.array(clip_points, dtype=np.float32), dtype=np.float64)
+        features = features.reshape(len(clip_points), len(SEQUENCE_LANDMARKS), -1)
+        for fi, frame_features, visibility in zip(clip_frames, features, clip_visibility):
+            for lm_id, (x, y, dx, dy, spd_sum), vis in zip(SEQUENCE_LANDMARKS, frame_features.tolist(), visibility):
+                seq_rows.append({
                     "frame": fi,
                     "landmark_id": lm_id,
-                    "name": lm_name,
+                    "name": USE_LANDMARKS[lm_id],
                     "x": x,
                     "y": y,
                     "visibility": vis,
                     "dx": dx,
                     "dy": dy,
-                    "spd_sum": None,  # fill after sum for the frame
+                    "spd_sum": spd_sum,
                 })
-                prev_xy[lm_id] = (x, y)
-
-            # Fill spd_sum for each row of this frame (same total)
-            for r in cur_frame_rows:
-                r["spd_sum"] = spd_sum_total
-            seq_rows.extend(cur_frame_rows)
-        else:
-            # No hand detected: still write placeholders for consistency if desired
-            pass
-
-        # pace capture
-        time.sleep(max(0, 1.0 / FPS_TARGET - 0.001))
 
-    print(f"🎬 녹화 완료! {len(seq_rows)}개 프레임 수집됨")
+    print(f"🎬 녹화 완료! {len(clip_points)}개 프레임 수집됨")
     
     if seq_rows:
         out_path = write_sequence_csv(seq_rows, label_dir, label)
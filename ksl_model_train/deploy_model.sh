@@ -21,6 +21,15 @@ cp "$SOURCE_DIR/ksl_labels.npy" "$TARGET_DIR/" && echo "  ✅ ksl_labels.npy"
 cp "$SOURCE_DIR/ksl_norm_mean.npy" "$TARGET_DIR/" && echo "  ✅ ksl_norm_mean.npy"
 cp "$SOURCE_DIR/ksl_norm_std.npy" "$TARGET_DIR/" && echo "  ✅ ksl_norm_std.npy"
 
+# 모델 번들 / TFLite / NumPy 모델 복사 (build_bundle.py, export_*.py 실행 시 생성)
+# 번들(ksl_bundle.bin)이 있으면 서버는 번들 하나만 읽음 (KSL_USE_BUNDLE=0 으로 끄기)
+for f in ksl_bundle.bin ksl_model.npz ksl_model_fp32.tflite ksl_model_fp16.tflite ksl_model_int8.tflite \
+         ksl_sequence_fp32.tflite ksl_sequence_fp16.tflite ksl_sequence_int8.tflite; do
+    if [ -f "$SOURCE_DIR/$f" ]; then
+        cp "$SOURCE_DIR/$f" "$TARGET_DIR/" && echo "  ✅ $f"
+    fi
+done
+
 # 시퀀스 모델 복사 (쌍자음/복합모음)
 if [ -f "$SOURCE_DIR/ksl_sequence_model.h5" ]; then
     echo "📦 시퀀스 모델 복사 중..."
@@ -0,0 +1,85 @@
+"""
+정적 모델 (Dense MLP) → NumPy 가중치(.npz) 변환 스크립트
+서버에서 TensorFlow 없이 추론하기 위한 용도 (KSL_STATIC_BACKEND=numpy)
+"""
+import os
+import numpy as np
+import tensorflow as tf
+
+# 경로 설정
+BASE_DIR = os.path.dirname(__file__)
+MODEL_DIR = os.path.join(BASE_DIR, "model")
+H5_PATH = os.path.join(MODEL_DIR, "ksl_model.h5")
+NPZ_PATH = os.path.join(MODEL_DIR, "ksl_model.npz")
+DATA_DIR = os.path.join(BASE_DIR, "data")
+
+# 허용 오차 (Keras 결과와의 최대 절대 오차)
+TOLERANCE = 1e-5
+
+if not os.path.exists(H5_PATH):
+    raise FileNotFoundError(f"❌ 모델을 찾을 수 없습니다: {H5_PATH}")
+
+model = tf.keras.models.load_model(H5_PATH)
+print(f"✅ 모델 로드: {H5_PATH}")
+
+# Dense 레이어 가중치 추출 (Dropout은 추론 시 항등 함수라 건너뜀)
+weights = {}
+activations = []
+for layer in model.layers:
+    if isinstance(layer, tf.keras.layers.Dropout):
+        continue
+    if not isinstance(layer, tf.keras.layers.Dense):
+        raise ValueError(f"❌ Dense/Dropout 외 레이어는 변환할 수 없습니다: {layer.name} ({type(layer).__name__})")
+    W, b = layer.get_weights()
+    i = len(activations)
+    weights[f"W{i}"] = W.astype(np.float32)
+    weights[f"b{i}"] = b.astype(np.float32)
+    activations.append(layer.get_config()["activation"])
+    print(f"   Dense {i}: {W.shape[0]} → {W.shape[1]} ({activations[-1]})")
+
+np.savez(
+    NPZ_PATH,
+    num_layers=np.int64(len(activations)),
+    activations=np.array(activations),
+    **weights
+)
+print(f"✅ NumPy 가중치 저장: {NPZ_PATH} ({os.path.getsize(NPZ_PATH) / 1024:.1f} KB)")
+
+
+# ==== Keras 결과와 비교 검증 ====
+def numpy_forward(x):
+    """서버 NumpyMLPBackend와 같은 계산 (matmul + ReLU ... + softmax)"""
+    for i, activation in enumerate(activations):
+        x = x @ weights[f"W{i}"] + weights[f"b{i}"]
+        if activation == "relu":
+            x = np.maximum(x, 0)
+        elif activation == "softmax":
+            x = np.exp(x - x.max(axis=1, keepdims=True))
+            x = x / x.sum(axis=1, keepdims=True)
+    return x
+
+
+samples = []
+if os.path.isdir(DATA_DIR):
+    for fname in sorted(os.listdir(DATA_DIR)):
+        if fname.endswith(".csv"):
+            data = np.genfromtxt(os.path.join(DATA_DIR, fname), delimiter=",", dtype=np.float32)
+            samples.append(np.atleast_2d(data)[:20, : model.input_shape[1]])
+x = np.concatenate(samples) if samples else np.random.rand(256, model.input_shape[1]).astype(np.float32)
+
+norm_mean_path = os.path.join(MODEL_DIR, "ksl_norm_mean.npy")
+norm_std_path = os.path.join(MODEL_DIR, "ksl_norm_std.npy")
+if os.path.exists(norm_mean_path) and os.path.exists(norm_std_path):
+    x = ((x - np.load(norm_mean_path)) / np.load(norm_std_path)).astype(np.float32)
+
+keras_probs = model.predict(x, verbose=0)
+numpy_probs = numpy_forward(x)
+max_diff = float(np.max(np.abs(keras_probs - numpy_probs)))
+same_argmax = float(np.mean(np.argmax(keras_probs, axis=1) == np.argmax(numpy_probs, axis=1)))
+
+print(f"\n📊 검증 ({len(x)}개 샘플)")
+print(f"   최대 절대 오차: {max_diff:.2e} (허용: {TOLERANCE:.0e})")
+print(f"   argmax 일치율: {same_argmax * 100:.2f}%")
+if max_diff > TOLERANCE:
+    raise SystemExit("❌ Keras 결과와 차이가 허용 오차를 넘습니다.")
+print("✅ 변환 완료!")
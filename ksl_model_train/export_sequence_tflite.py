@@ -3,9 +3,14 @@
 라즈베리파이 3 및 임베디드 환경 최적화
 """
 import os
+import sys
 import numpy as np
 import tensorflow as tf
 
+# 서버와 같은 특징 계산 (myproject/api/features.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "myproject"))
+from api.features import read_sequence_csv
+
 # 경로 설정
 BASE_DIR = os.path.dirname(__file__)
 MODEL_DIR = os.path.join(BASE_DIR, "model")
@@ -52,25 +57,8 @@ def representative_dataset():
             
             csv_path = os.path.join(label_path, csv_file)
             try:
-                import pandas as pd
-                df = pd.read_csv(csv_path)
-                
-                # 프레임별로 시퀀스 생성
-                frames = df['frame'].unique()
-                sequence = []
-                
-                for frame_idx in sorted(frames):
-                    frame_data = df[df['frame'] == frame_idx]
-                    features = []
-                    for _, row in frame_data.iterrows():
-                        features.extend([
-                            row['x'], 
-                            row['y'], 
-                            row['dx'], 
-                            row['dy'],
-                            row['spd_sum']
-                        ])
-                    sequence.append(features)
+                # 프레임별 특징 [x, y, dx, dy, spd_sum] x 랜드마크 (api/features.py, 서버와 같은 값)
+                sequence = read_sequence_csv(csv_path)
                 
                 if len(sequence) > 0:
                     # 패딩 적용
@@ -7,14 +7,21 @@ BASE_DIR = os.path.dirname(__file__)
 MODEL_DIR = os.path.join(BASE_DIR, "model")
 H5_PATH = os.path.join(MODEL_DIR, "ksl_model.h5")
 TFLITE_FP32_PATH = os.path.join(MODEL_DIR, "ksl_model_fp32.tflite")
+TFLITE_FP16_PATH = os.path.join(MODEL_DIR, "ksl_model_fp16.tflite")
 TFLITE_INT8_PATH = os.path.join(MODEL_DIR, "ksl_model_int8.tflite")
 DATA_DIR = os.path.join(BASE_DIR, "data")
+NORM_MEAN_PATH = os.path.join(MODEL_DIR, "ksl_norm_mean.npy")
+NORM_STD_PATH = os.path.join(MODEL_DIR, "ksl_norm_std.npy")
 
 # Load model
 if not os.path.exists(H5_PATH):
     raise FileNotFoundError(f"Model not found: {H5_PATH}")
 model = tf.keras.models.load_model(H5_PATH)
 
+# Runtime feeds (x - mean) / std, so calibrate on normalized inputs too
+norm_mean = np.load(NORM_MEAN_PATH) if os.path.exists(NORM_MEAN_PATH) else None
+norm_std = np.load(NORM_STD_PATH) if os.path.exists(NORM_STD_PATH) else None
+
 # Representative dataset generator for INT8 calibration
 # Uses a few samples from CSVs to estimate activation ranges.
 def representative_dataset():
@@ -43,8 +50,8 @@ def representative_dataset():
             data = data[:, : model.input_shape[1]]
         for i in range(min(len(data), 20)):
             x = data[i].reshape(1, -1)
-            # NOTE: We assume runtime will apply the same normalization as in predict scripts.
-            # If you want to bake normalization into calibration, you can load mean/std here.
+            if norm_mean is not None and norm_std is not None:
+                x = ((x - norm_mean) / norm_std).astype(np.float32)
             yield [x]
             count += 1
             if count >= max_samples:
@@ -57,6 +64,15 @@ with open(TFLITE_FP32_PATH, 'wb') as f:
     f.write(tflite_model)
 print(f"Saved FP32 TFLite model: {TFLITE_FP32_PATH}")
 
+# Convert FP16 (weights in float16, float32 IO)
+converter = tf.lite.TFLiteConverter.from_keras_model(model)
+converter.optimizations = [tf.lite.Optimize.DEFAULT]
+converter.target_spec.supported_types = [tf.float16]
+fp16_tflite_model = converter.convert()
+with open(TFLITE_FP16_PATH, 'wb') as f:
+    f.write(fp16_tflite_model)
+print(f"Saved FP16 TFLite model: {TFLITE_FP16_PATH}")
+
 # Convert INT8 (full integer quantization)
 converter = tf.lite.TFLiteConverter.from_keras_model(model)
 converter.optimizations = [tf.lite.Optimize.DEFAULT]
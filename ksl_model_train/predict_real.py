@@ -6,6 +6,11 @@ from PIL import ImageFont, ImageDraw, Image
 import os
 import time
 from collections import deque
+import sys
+
+# 모션 피크 검출은 서버(myproject/api/motion_gate.py)와 같은 코드를 사용
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "myproject"))
+from api.motion_gate import count_motion_peaks
 
 """All file paths are resolved relative to this script directory."""
 BASE_DIR = os.path.dirname(__file__)
@@ -152,42 +157,6 @@ def detect_vowel_transition(labels_list, min_frac=TRANSITION_MIN_FRAC):
     
     return None
 
-def count_motion_peaks(values, min_gap=MIN_GAP, max_gap=MAX_GAP, thresh_std=THRESH_STD):
-    if not values:
-        return 0, []
-    arr = np.array(values, dtype=np.float32)
-    mean = float(np.mean(arr))
-    std = float(np.std(arr))
-    thresh = mean + thresh_std * std
-    peak_idxs = [i for i, v in enumerate(arr) if v >= thresh]
-    # merge consecutive indices into single peaks
-    merged = []
-    for idx in peak_idxs:
-        if not merged or idx - merged[-1] > 1:
-            merged.append(idx)
-    # enforce gap constraints by selecting peaks with proper spacing
-    selected = []
-    for idx in merged:
-        if not selected:
-            selected.append(idx)
-        else:
-            gap = idx - selected[-1]
-            if gap >= min_gap:
-                selected.append(idx)
-    # filter by max_gap pairwise if needed (keep peaks where any adjacent gap <= max_gap)
-    filtered = []
-    for i, idx in enumerate(selected):
-        if i == 0:
-            filtered.append(idx)
-        else:
-            gap = idx - selected[i-1]
-            if gap <= max_gap:
-                filtered.append(idx)
-            else:
-                # if too far, start a new group
-                filtered = [idx]
-    return len(filtered), filtered
-
 while cap.isOpened():
     ret, frame = cap.read()
     if not ret:
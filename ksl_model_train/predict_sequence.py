@@ -4,6 +4,11 @@ import mediapipe as mp
 from tensorflow.keras.models import load_model
 from collections import deque
 import os
+import sys
+
+# 서버와 같은 특징 계산 (myproject/api/features.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "myproject"))
+from api.features import sequence_features
 
 # 경로 설정
 BASE_DIR = os.path.dirname(__file__)
@@ -31,15 +36,9 @@ hands = mp_hands.Hands(
     min_tracking_confidence=0.5
 )
 
-# 사용할 랜드마크 (capture_sequence.py와 동일)
-USE_LANDMARKS = {
-    0: "wrist",
-    8: "index_tip",
-}
-
 # 시퀀스 버퍼
 sequence_buffer = deque(maxlen=max_timesteps)
-prev_xy = {}
+prev_points = None  # 직전 프레임 랜드마크 (dx/dy 기준)
 
 # 웹캠 시작
 cap = cv2.VideoCapture(0)
@@ -71,36 +70,10 @@ while True:
                 image, hand_landmarks, mp_hands.HAND_CONNECTIONS
             )
             
-            # 특징 추출
-            lms = hand_landmarks.landmark
-            frame_features = []
-            spd_sum_total = 0.0
-            
-            for lm_id in USE_LANDMARKS.keys():
-                lm = lms[lm_id]
-                x, y = float(lm.x), float(lm.y)
-                vis = float(getattr(lm, "visibility", 1.0))
-                
-                dx = dy = 0.0
-                if lm_id in prev_xy:
-                    dx = x - prev_xy[lm_id][0]
-                    dy = y - prev_xy[lm_id][1]
-                
-                spd = abs(dx) + abs(dy)
-                spd_sum_total += spd
-                prev_xy[lm_id] = (x, y)
-            
-            # 모든 랜드마크의 특징을 하나의 벡터로
-            for lm_id in USE_LANDMARKS.keys():
-                lm = lms[lm_id]
-                x, y = float(lm.x), float(lm.y)
-                
-                dx = dy = 0.0
-                if lm_id in prev_xy:
-                    dx = x - prev_xy[lm_id][0]
-                    dy = y - prev_xy[lm_id][1]
-                
-                frame_features.extend([x, y, dx, dy, spd_sum_total])
+            # 특징 추출 (api/features.py: wrist/index_tip의 [x, y, dx, dy, spd_sum], 학습 데이터와 같은 값)
+            points = np.array([(lm.x, lm.y) for lm in hand_landmarks.landmark], dtype=np.float32)
+            frame_features = sequence_features(points[None], prev_points)[0]
+            prev_points = points
             
             # 버퍼에 추가
             sequence_buffer.append(frame_features)
@@ -128,7 +101,7 @@ while True:
         # 손이 감지되지 않으면 버퍼 초기화
         if len(sequence_buffer) > 0:
             sequence_buffer.clear()
-            prev_xy.clear()
+            prev_points = None
         prediction_text = "손 감지 안됨"
         confidence = 0.0
     
@@ -170,7 +143,7 @@ while True:
         break
     elif key == 32:  # SPACE
         sequence_buffer.clear()
-        prev_xy.clear()
+        prev_points = None
         print("버퍼 초기화")
 
 cap.release()
@@ -10,6 +10,10 @@ import mediapipe as mp
 import time
 from collections import deque
 
+# 서버와 같은 특징 계산 (myproject/api/features.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "myproject"))
+from api.features import sequence_features
+
 # TFLite 인터프리터 import
 try:
     from tflite_runtime.interpreter import Interpreter
@@ -101,6 +105,7 @@ print("✅ 카메라 열기 성공")
 # 시퀀스 버퍼 (0.5~0.8초 분량)
 sequence_buffer = deque(maxlen=max_timesteps)
 feature_dim = norm_mean.shape[0]
+prev_points = None  # 직전 프레임 랜드마크 (dx/dy 기준)
 
 print("\n" + "="*60)
 print("🎯 시퀀스 인식 시작")
@@ -140,26 +145,13 @@ try:
             for hand_landmarks in result.multi_hand_landmarks:
                 mp_draw.draw_landmarks(image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
 
-                # 특징 추출
-                features = []
-                lm_list = list(hand_landmarks.landmark)
-                
-                for i, lm in enumerate(lm_list):
-                    features.extend([lm.x, lm.y])
-                    
-                    # dx, dy, spd_sum 계산 (간단한 근사)
-                    if i > 0:
-                        prev_lm = lm_list[i-1]
-                        dx = lm.x - prev_lm.x
-                        dy = lm.y - prev_lm.y
-                        spd = np.sqrt(dx**2 + dy**2)
-                    else:
-                        dx, dy, spd = 0, 0, 0
-                    
-                    features.extend([dx, dy, spd])
+                # 특징 추출 (학습 데이터와 같은 [x, y, dx, dy, spd_sum] x wrist/index_tip, dx/dy는 직전 프레임 기준)
+                points = np.array([(lm.x, lm.y) for lm in hand_landmarks.landmark], dtype=np.float32)
+                features = sequence_features(points[None], prev_points)[0]
+                prev_points = points
                 
                 # 버퍼에 추가
-                sequence_buffer.append(features[:feature_dim])
+                sequence_buffer.append(features)
 
                 # 예측 (충분한 프레임이 쌓이면)
                 if (len(sequence_buffer) >= max_timesteps // 2 and 
@@ -213,6 +205,7 @@ try:
             break
         elif key == 32:  # SPACE
             sequence_buffer.clear()
+            prev_points = None
             latest_char = ""
             print("🔄 버퍼 초기화")
 
@@ -1,6 +1,6 @@
-import pandas as pd
 import numpy as np
 import os
+import sys
 from sklearn.preprocessing import LabelEncoder
 from sklearn.model_selection import train_test_split
 from tensorflow.keras.models import Sequential
@@ -12,6 +12,10 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 import random
 
+# 서버와 같은 특징 계산 (myproject/api/features.py)
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "myproject"))
+from api.features import read_sequence_csv
+
 # 경로 설정
 BASE_DIR = os.path.dirname(__file__)
 DATA_SEQ_DIR = os.path.join(BASE_DIR, "data_seq")
@@ -42,25 +46,8 @@ def load_sequence_data(data_dir):
             
             csv_path = os.path.join(label_path, csv_file)
             try:
-                df = pd.read_csv(csv_path)
-                
-                # 프레임별로 그룹화하여 시퀀스 생성
-                frames = df['frame'].unique()
-                sequence = []
-                
-                for frame_idx in sorted(frames):
-                    frame_data = df[df['frame'] == frame_idx]
-                    # 각 프레임의 특징: x, y, dx, dy, spd_sum (landmark별로)
-                    features = []
-                    for _, row in frame_data.iterrows():
-                        features.extend([
-                            row['x'], 
-                            row['y'], 
-                            row['dx'], 
-                            row['dy'],
-                            row['spd_sum']
-                        ])
-                    sequence.append(features)
+                # 프레임별 특징 [x, y, dx, dy, spd_sum] x 랜드마크 (api/features.py, 서버와 같은 값)
+                sequence = read_sequence_csv(csv_path)
                 
                 if len(sequence) > 0:
                     X_sequences.append(sequence)
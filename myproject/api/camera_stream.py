@@ -0,0 +1,223 @@
+# - 카메라 1대 = 캡처 스레드 1개, 여러 MJPEG 시청자에게 나눠주기
+# 시청자마다 카메라를 열고 MediaPipe/추론/JPEG 인코딩을 따로 돌리는 대신,
+# 첫 시청자가 오면 캡처 스레드를 시작하고 모든 시청자가 같은 최신 프레임을 받는다.
+# 느린 시청자는 밀린 프레임을 건너뛰고 항상 가장 최근 프레임만 받는다.
+# 마지막 시청자가 나가도 grace_period 동안은 카메라를 유지하고 (새로고침/재접속 대비) 이후 해제한다.
+# JPEG 인코딩은 시청자 프로필(해상도/품질/fps)마다 프레임당 한 번만 하고 같은 프로필 시청자끼리 공유한다.
+import threading
+import time
+from collections import deque, namedtuple
+import cv2
+
+# 마지막 시청자가 나간 뒤 카메라를 유지하는 시간 (초)
+DEFAULT_GRACE_PERIOD = 5.0
+# 시청자가 새 프레임을 기다리다 캡처 상태를 다시 확인하는 간격 (초)
+WAIT_INTERVAL = 1.0
+# 프로필별 bytes/sec 계산 구간 (초)
+RATE_WINDOW = 5.0
+
+# 인코딩 프로필: width (None이면 원본), JPEG quality, fps 상한 (None이면 제한 없음)
+EncodeProfile = namedtuple('EncodeProfile', ['width', 'quality', 'fps'])
+DEFAULT_PROFILE = EncodeProfile(None, 75, None)
+# 쿼리 값은 아래 단계 중 가장 가까운 값으로 맞춤 (임의 값마다 인코더가 생기지 않게, 같은 단계 시청자끼리 인코딩 공유)
+PROFILE_WIDTHS = (160, 240, 320, 480, 640, 960, 1280, 1920)
+PROFILE_QUALITIES = (30, 50, 75, 90)
+PROFILE_FPS = (1.0, 5.0, 10.0, 15.0, 30.0)
+
+
+def nearest(value, steps):
+    return min(steps, key=lambda step: abs(step - value))
+
+
+def parse_profile(args):
+    """쿼리 파라미터 (width, quality, fps) → EncodeProfile (각각 정해진 단계 중 가장 가까운 값으로)"""
+    width = args.get('width', type=int)
+    quality = args.get('quality', DEFAULT_PROFILE.quality, type=int)
+    fps = args.get('fps', type=float)
+    return EncodeProfile(
+        nearest(width, PROFILE_WIDTHS) if width else None,
+        nearest(quality, PROFILE_QUALITIES),
+        nearest(fps, PROFILE_FPS) if fps else None
+    )
+
+
+class ProfileEncoder:
+    """프로필 하나의 인코딩 캐시: 같은 프레임(seq)은 한 번만 인코딩"""
+
+    def __init__(self, profile):
+        self.profile = profile
+        self.viewers = 0
+        self._lock = threading.Lock()
+        self._seq = None
+        self._data = None
+        self._sent = deque()  # (monotonic 시각, bytes) - 최근 RATE_WINDOW초
+        self._stats = {'encodes': 0, 'encode_ms_total': 0.0, 'frames_sent': 0, 'bytes_sent': 0}
+
+    def encode(self, seq, frame):
+        with self._lock:
+            if self._seq != seq:
+                start = time.perf_counter()
+                height, width = frame.shape[:2]
+                if self.profile.width and self.profile.width < width:
+                    size = (self.profile.width, round(height * self.profile.width / width))
+                    frame = cv2.resize(frame, size, interpolation=cv2.INTER_AREA)
+                _, buffer = cv2.imencode('.jpg', frame, [int(cv2.IMWRITE_JPEG_QUALITY), self.profile.quality])
+                self._data = buffer.tobytes()
+                self._seq = seq
+                self._stats['encodes'] += 1
+                self._stats['encode_ms_total'] += (time.perf_counter() - start) * 1000
+            data = self._data
+            now = time.monotonic()
+            self._sent.append((now, len(data)))
+            while self._sent[0][0] < now - RATE_WINDOW:
+                self._sent.popleft()
+            self._stats['frames_sent'] += 1
+            self._stats['bytes_sent'] += len(data)
+        return data
+
+    def get_stats(self):
+        with self._lock:
+            now = time.monotonic()
+            recent = sum(size for t, size in self._sent if t >= now - RATE_WINDOW)
+            encodes = self._stats['encodes']
+            return {
+                'profile': self.profile._asdict(),
+                'viewers': self.viewers,
+                'encodes': encodes,
+                'avg_encode_ms': round(self._stats['encode_ms_total'] / encodes, 3) if encodes else 0.0,
+                'frames_sent': self._stats['frames_sent'],
+                'bytes_sent': self._stats['bytes_sent'],
+                'bytes_per_sec': round(recent / RATE_WINDOW)
+            }
+
+
+class CameraBroadcaster:
+    """producer_factory()가 만드는 프레임 생성기를 스레드 하나에서 돌리고 시청자들에게 방송
+
+    producer_factory: 호출하면 BGR 프레임을 계속 yield하는 생성기를 반환
+                      (카메라 열기 실패 시 바로 끝나면 됨, close() 시 자원 해제)
+    """
+
+    def __init__(self, name, producer_factory, grace_period=DEFAULT_GRACE_PERIOD):
+        self.name = name
+        self.producer_factory = producer_factory
+        self.grace_period = grace_period
+        self._cond = threading.Condition()
+        self._thread = None
+        self._running = False
+        self._frame = None
+        self._seq = 0
+        self._viewers = 0
+        self._idle_since = None
+        self._stats = {'starts': 0, 'frames': 0, 'frames_sent': 0, 'frames_skipped': 0}
+        self._encoders = {}  # {EncodeProfile: ProfileEncoder}
+
+    def _start_locked(self):
+        previous = self._thread
+        self._running = True
+        self._idle_since = None
+        self._frame = None
+        self._stats['starts'] += 1
+        self._thread = threading.Thread(target=self._run, args=(previous,), name=f'camera-{self.name}', daemon=True)
+        self._thread.start()
+
+    def _run(self, previous):
+        # 이전 캡처 스레드가 카메라를 놓을 때까지 대기 (grace_period 직후 재접속한 경우)
+        if previous is not None:
+            previous.join()
+        print(f"🎥 캡처 스레드 시작: {self.name}")
+        producer = self.producer_factory()
+        try:
+            for frame in producer:
+                # 생산자가 버퍼를 링으로 재사용하므로 복사본을 방송 (느린 시청자가 인코딩 중인 프레임이 덮어써지지 않게)
+                frame = frame.copy()
+                with self._cond:
+                    self._frame = frame
+                    self._seq += 1
+                    self._stats['frames'] += 1
+                    self._cond.notify_all()
+                    if self._viewers == 0 and self._idle_since is not None and time.monotonic() - self._idle_since >= self.grace_period:
+                        print(f"💤 시청자 없음 ({self.grace_period:g}초) - 캡처 중지: {self.name}")
+                        self._running = False
+                        break
+        finally:
+            producer.close()
+            with self._cond:
+                self._running = False
+                self._cond.notify_all()
+            print(f"✅ 캡처 스레드 종료: {self.name}")
+
+    def frames(self):
+        """시청자 1명용 생성기: 새 프레임이 나올 때마다 가장 최근 (seq, 프레임)만 yield"""
+        with self._cond:
+            self._viewers += 1
+            self._idle_since = None
+            if not self._running:
+                self._start_locked()
+            thread = self._thread
+        seq = 0
+        try:
+            while True:
+                with self._cond:
+                    self._cond.wait_for(lambda: self._seq > seq or self._thread is not thread or not self._running, WAIT_INTERVAL)
+                    if self._seq <= seq or self._frame is None:
+                        if self._thread is not thread or not self._running:
+                            return  # 카메라 종료 (열기 실패 등)
+                        continue
+                    if seq:
+                        self._stats['frames_skipped'] += self._seq - seq - 1
+                    frame, seq = self._frame, self._seq
+                    self._stats['frames_sent'] += 1
+                yield seq, frame
+        finally:
+            with self._cond:
+                self._viewers -= 1
+                if self._viewers == 0:
+                    self._idle_since = time.monotonic()
+
+    def encoded_frames(self, profile=DEFAULT_PROFILE):
+        """시청자 1명용 생성기: 프로필에 맞게 인코딩된 JPEG 바이트 (fps 상한을 넘는 프레임은 건너뜀)"""
+        with self._cond:
+            encoder = self._encoders.get(profile)
+            if encoder is None:
+                encoder = self._encoders[profile] = ProfileEncoder(profile)
+            encoder.viewers += 1
+        min_interval = 1.0 / profile.fps if profile.fps else 0.0
+        last_sent = 0.0
+        try:
+            for seq, frame in self.frames():
+                if min_interval and time.monotonic() - last_sent < min_interval:
+                    continue
+                last_sent = time.monotonic()
+                yield encoder.encode(seq, frame)
+        finally:
+            with self._cond:
+                encoder.viewers -= 1
+                if encoder.viewers == 0 and self._encoders.get(profile) is encoder:
+                    del self._encoders[profile]  # 시청자가 없는 프로필의 JPEG 캐시는 버림
+
+    def get_stats(self):
+        with self._cond:
+            encoders = list(self._encoders.values())
+            stats = dict(self._stats, name=self.name, running=self._running, viewers=self._viewers,
+                         seq=self._seq, grace_period=self.grace_period)
+        stats['profiles'] = [encoder.get_stats() for encoder in encoders]
+        return stats
+
+
+_broadcasters = {}
+_broadcasters_lock = threading.Lock()
+
+
+def get_broadcaster(name, producer_factory, grace_period=DEFAULT_GRACE_PERIOD):
+    """이름(카메라 번호/언어)별 방송기, 없으면 생성"""
+    with _broadcasters_lock:
+        broadcaster = _broadcasters.get(name)
+        if broadcaster is None:
+            broadcaster = _broadcasters[name] = CameraBroadcaster(name, producer_factory, grace_period)
+        return broadcaster
+
+
+def get_all_stats():
+    with _broadcasters_lock:
+        return [b.get_stats() for b in _broadcasters.values()]
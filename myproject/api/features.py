@@ -0,0 +1,84 @@
+# - 손 랜드마크 특징 (정적 모델 42 / 시퀀스 모델 10) - 수집, 학습, TFLite 변환, 서버 추론 공용
+# 시퀀스 특징은 랜드마크(wrist, index_tip)마다 [x, y, dx, dy, spd_sum]:
+#   dx, dy: 직전 (손이 감지된) 프레임과의 차이, 시퀀스 첫 프레임은 0 (prev를 주면 prev 기준)
+#   spd_sum: 그 프레임 선택 랜드마크들의 |dx| + |dy| 합 (랜드마크 순서대로 더함)
+# 이전에는 capture_sequence.py(행 단위 루프), train/export(iterrows), analyze_sequence_sign(루프 2번, dx=0으로 기록),
+# predict_sequence_tflite.py(이웃 랜드마크 차이, 다른 공식)가 따로 계산했다.
+# 계산은 float64 (capture_sequence.py가 파이썬 float로 계산해서 CSV에 쓰던 값과 같음), 모델 입력은 float32.
+# ksl_model_train 스크립트는 sys.path에 myproject를 넣고 `from api.features import ...`로 사용한다.
+import numpy as np
+
+NUM_LANDMARKS = 21
+STATIC_FEATURE_DIM = NUM_LANDMARKS * 2  # [x0, y0, x1, y1, ...]
+
+SEQUENCE_LANDMARKS = (0, 8)  # 시퀀스 모델 입력 랜드마크
+SEQUENCE_LANDMARK_NAMES = {0: 'wrist', 8: 'index_tip'}
+SEQUENCE_COLUMNS = ('x', 'y', 'dx', 'dy', 'spd_sum')  # 랜드마크별 특징 (capture_sequence.py CSV 열 이름)
+SEQUENCE_FEATURE_DIM = len(SEQUENCE_LANDMARKS) * len(SEQUENCE_COLUMNS)
+
+
+def static_features(points, out=None):
+    """(..., 21, 2) 랜드마크 → (..., 42) float32 정적 모델 입력 (hand_capture.py CSV와 같은 순서)
+
+    out: 결과를 쓸 float32 배열 (서버 카메라 스트림의 재사용 입력 버퍼에 바로 쓸 때 사용)
+    """
+    points = np.asarray(points, dtype=np.float32)
+    features = points.reshape(points.shape[:-2] + (STATIC_FEATURE_DIM,))
+    if out is not None:
+        out[...] = features.reshape(out.shape)
+        return out
+    return features
+
+
+def select_sequence_landmarks(points):
+    """(T, 21, 2) 전체 랜드마크 또는 이미 고른 (T, 2, 2) → (T, 2, 2) float64"""
+    points = np.asarray(points)
+    if points.shape[-2] == NUM_LANDMARKS:
+        points = points[..., SEQUENCE_LANDMARKS, :]
+    elif points.shape[-2] != len(SEQUENCE_LANDMARKS):
+        raise ValueError(f'랜드마크 배열 형식 오류: {list(points.shape)} (T x 21 x 2 또는 T x {len(SEQUENCE_LANDMARKS)} x 2)')
+    return points[..., :2].astype(np.float64)
+
+
+def sequence_features(points, prev=None, out=None, dtype=np.float32):
+    """랜드마크 시퀀스 (T, 21, 2) → 시퀀스 모델 특징 (T, 10)
+
+    prev: 시퀀스 직전 프레임 랜드마크 (21, 2) - 프레임을 하나씩 이어 붙일 때 첫 프레임 dx/dy 기준
+    out: 결과를 쓸 배열 (T, 10), 서버 시퀀스 링 버퍼의 행에 바로 쓸 때 사용
+    dtype: 반환 dtype (capture_sequence.py는 CSV에 float64 그대로 기록)
+    """
+    xy = select_sequence_landmarks(points)  # (T, L, 2)
+    deltas = np.zeros_like(xy)
+    deltas[1:] = xy[1:] - xy[:-1]
+    if prev is not None and len(xy):
+        deltas[0] = xy[0] - select_sequence_landmarks(np.asarray(prev)[None])[0]
+    spd = np.abs(deltas[..., 0]) + np.abs(deltas[..., 1])  # (T, L)
+    spd_sum = np.zeros(len(xy))
+    for i in range(spd.shape[1]):
+        spd_sum = spd_sum + spd[:, i]  # capture_sequence.py와 같은 순서로 더함 (0.0 + wrist + index_tip)
+
+    features = np.empty(xy.shape[:2] + (len(SEQUENCE_COLUMNS),))  # (T, L, 5)
+    features[..., 0:2] = xy
+    features[..., 2:4] = deltas
+    features[..., 4] = spd_sum[:, None]
+    features = features.reshape(len(xy), -1)
+    if out is not None:
+        out[...] = features.reshape(out.shape)
+        return out
+    return features.astype(dtype)
+
+
+def sequence_features_from_rows(df):
+    """capture_sequence.py CSV DataFrame (프레임 x 랜드마크 행) → (T, 10) float32 (iterrows 없이 한 번에)"""
+    df = df.sort_values('frame', kind='stable')  # 같은 프레임 안에서는 기록 순서 (wrist, index_tip) 유지
+    counts = df.groupby('frame', sort=True).size()
+    if (counts != len(SEQUENCE_LANDMARKS)).any():
+        raise ValueError(f'프레임마다 랜드마크 {len(SEQUENCE_LANDMARKS)}행이어야 합니다')
+    values = df[list(SEQUENCE_COLUMNS)].to_numpy(dtype=np.float64)
+    return values.reshape(len(counts), SEQUENCE_FEATURE_DIM).astype(np.float32)
+
+
+def read_sequence_csv(path):
+    """시퀀스 CSV 파일 1개 → (T, 10) float32 (float_precision='round_trip'으로 기록된 값 그대로 읽음)"""
+    import pandas as pd  # 학습/변환 스크립트에서만 사용
+    return sequence_features_from_rows(pd.read_csv(path, float_precision='round_trip'))
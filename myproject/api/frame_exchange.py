@@ -0,0 +1,59 @@
+# - 카메라 스트림 → 인식 API 최신 프레임 전달 (프로세스 내 메모리)
+# generate_frames()가 매 프레임 publish하고, analyze-hand가 이미지 없이 호출되면
+# 스트림이 이미 뽑아 둔 랜드마크를 그대로 사용한다 (/tmp JPEG 저장/재디코딩/MediaPipe 재실행 없음).
+import threading
+import time
+from collections import namedtuple
+
+# frame: RGB 이미지, landmarks: 첫 번째 손 (21, 2) 배열 (손이 없으면 None),
+# seq: 1부터 증가하는 프레임 번호, timestamp: time.time()
+# publish()가 frame을 복사해서 보관하므로 스트림이 버퍼를 링으로 재사용해도 (frame_pipeline.BufferRing) 읽는 쪽 프레임은 바뀌지 않음
+FrameSnapshot = namedtuple('FrameSnapshot', ['frame', 'landmarks', 'seq', 'timestamp'])
+
+
+class FrameSlot:
+    """최신 프레임 1개만 보관하는 스레드 안전 슬롯 (새 프레임이 오면 덮어씀)"""
+
+    def __init__(self):
+        self._cond = threading.Condition()
+        self._snapshot = None
+        self._seq = 0
+
+    def publish(self, frame, landmarks, timestamp=None):
+        """최신 프레임 올리기 (frame은 복사해서 보관, 호출자는 버퍼를 바로 재사용해도 됨)"""
+        if frame is not None:
+            frame = frame.copy()
+        with self._cond:
+            self._seq += 1
+            self._snapshot = FrameSnapshot(frame, landmarks, self._seq, timestamp or time.time())
+            self._cond.notify_all()
+        return self._seq
+
+    def latest(self, max_age=None):
+        """가장 최근 프레임 (없거나 max_age초보다 오래됐으면 None)"""
+        snapshot = self._snapshot
+        if snapshot is None:
+            return None
+        if max_age is not None and time.time() - snapshot.timestamp > max_age:
+            return None
+        return snapshot
+
+    def wait_newer(self, seq, timeout=None):
+        """seq보다 새 프레임이 올 때까지 대기 (timeout이면 None)"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: self._seq > seq, timeout):
+                return None
+            return self._snapshot
+
+
+_slots = {}
+_slots_lock = threading.Lock()
+
+
+def get_slot(key):
+    """스트림 키(언어 등)별 슬롯, 없으면 생성"""
+    with _slots_lock:
+        slot = _slots.get(key)
+        if slot is None:
+            slot = _slots[key] = FrameSlot()
+        return slot
@@ -0,0 +1,222 @@
+# - 단계별 스레드 프레임 파이프라인 (캡처 → 랜드마크 → 렌더)
+# 한 생성기 안에서 모든 단계를 순서대로 돌리면 가장 느린 단계가 전체 fps를 정하므로,
+# 단계마다 스레드를 두고 크기가 정해진 큐로 잇는다. 큐가 가득 차면 가장 오래된 프레임을 버려서
+# 뒤 단계가 밀려도 지연이 쌓이지 않고 항상 최신 프레임을 처리한다.
+# 각 단계는 스레드 하나라 프레임 순서와 단계 내부 상태(MediaPipe video 모드 추적 등)는 유지된다.
+import os
+import threading
+import time
+from collections import deque
+import numpy as np
+
+# 단계 사이 큐 크기 (프레임 수)
+QUEUE_SIZE = int(os.environ.get('KSL_PIPELINE_QUEUE_SIZE', '2'))
+# 큐가 닫혔는지 다시 확인하는 간격 (초)
+POLL_INTERVAL = 0.5
+
+
+def ring_size(num_stages, queue_size=QUEUE_SIZE, extra=4):
+    """파이프라인 안에 동시에 살아 있을 수 있는 프레임 수 + 여유 (큐 + 단계별 처리 중 1개 + 출력을 꺼내 복사하는 쪽)"""
+    return queue_size * (num_stages + 1) + num_stages + extra
+
+
+class BufferRing:
+    """미리 만든 배열 count개를 순서대로 돌려 쓰는 링 (프레임마다 새 배열을 만들지 않음)
+
+    count는 같은 버퍼가 다시 쓰일 때 이전 프레임이 이미 파이프라인에서 빠져 있을 만큼 커야 한다 (ring_size).
+    파이프라인 밖(슬롯/시청자)으로 넘기는 프레임은 넘기는 쪽에서 복사해야 한다.
+    shape이 바뀌면 (카메라 해상도 변경) 그 칸만 다시 만든다.
+    """
+
+    def __init__(self, count):
+        self._buffers = [None] * max(1, count)
+        self._index = 0
+        self.allocations = 0
+
+    def next(self, shape, dtype=np.uint8):
+        i = self._index
+        self._index = (i + 1) % len(self._buffers)
+        buffer = self._buffers[i]
+        if buffer is None or buffer.shape != tuple(shape) or buffer.dtype != dtype:
+            buffer = self._buffers[i] = np.empty(shape, dtype=dtype)
+            self.allocations += 1
+        return buffer
+
+
+class QueueClosed(Exception):
+    """닫힌 큐가 비어서 더 받을 프레임이 없는 경우"""
+
+
+class DropOldestQueue:
+    """크기 제한 큐, 가득 차면 가장 오래된 항목을 버리고 넣음 (버린 개수 집계)"""
+
+    def __init__(self, maxsize=QUEUE_SIZE):
+        self.maxsize = max(1, maxsize)
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+        self.dropped = 0
+        self.max_depth = 0
+
+    def put(self, item):
+        with self._cond:
+            if self._closed:
+                return
+            if len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self.max_depth = max(self.max_depth, len(self._items))
+            self._cond.notify()
+
+    def get(self, timeout=POLL_INTERVAL):
+        """항목 하나 (timeout이면 None), 닫혔고 비었으면 QueueClosed"""
+        with self._cond:
+            self._cond.wait_for(lambda: self._items or self._closed, timeout)
+            if self._items:
+                return self._items.popleft()
+            if self._closed:
+                raise QueueClosed()
+            return None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    def depth(self):
+        with self._cond:
+            return len(self._items)
+
+
+class Stage:
+    """입력 큐 → fn(item) → 출력 큐 (fn이 None을 반환하면 그 프레임은 다음 단계로 안 넘김)"""
+
+    def __init__(self, name, fn):
+        self.name = name
+        self.fn = fn
+        self.input = None
+        self.output = None
+        self._stats = {'frames': 0, 'ms_total': 0.0, 'ms_max': 0.0, 'errors': 0}
+
+    def record(self, elapsed_ms):
+        self._stats['frames'] += 1
+        self._stats['ms_total'] += elapsed_ms
+        self._stats['ms_max'] = max(self._stats['ms_max'], elapsed_ms)
+
+    def run(self, stop):
+        try:
+            while not stop.is_set():
+                try:
+                    item = self.input.get()
+                except QueueClosed:
+                    break
+                if item is None:
+                    continue
+                start = time.perf_counter()
+                try:
+                    out = self.fn(item)
+                except Exception as e:
+                    self._stats['errors'] += 1
+                    print(f"❌ 파이프라인 단계 오류 ({self.name}): {e}")
+                    continue
+                self.record((time.perf_counter() - start) * 1000)
+                if out is not None:
+                    self.output.put(out)
+        finally:
+            self.output.close()
+
+    def get_stats(self):
+        frames = self._stats['frames']
+        return {
+            'stage': self.name,
+            'frames': frames,
+            'avg_ms': round(self._stats['ms_total'] / frames, 3) if frames else 0.0,
+            'max_ms': round(self._stats['ms_max'], 3),
+            'errors': self._stats['errors'],
+            'queue_depth': self.input.depth() if self.input else 0,
+            'queue_max_depth': self.input.max_depth if self.input else 0,
+            'dropped': self.input.dropped if self.input else 0
+        }
+
+
+class FramePipeline:
+    """source 생성기(캡처) + 단계들을 각각 스레드로 돌리고, 마지막 단계 출력을 생성기로 내보냄
+
+    for frame in FramePipeline(...): 형태로 기존 프레임 생성기 자리에 그대로 쓸 수 있다.
+    생성기를 닫으면 (시청자 없음) 모든 스레드를 멈추고 join한 뒤 반환한다.
+    """
+
+    def __init__(self, name, source, stages, queue_size=QUEUE_SIZE):
+        self.name = name
+        self.source = source
+        self.source_stage = Stage('capture', None)
+        self.stages = stages
+        queues = [DropOldestQueue(queue_size) for _ in stages]
+        self.output = DropOldestQueue(queue_size)
+        self.source_stage.output = queues[0] if queues else self.output
+        for i, stage in enumerate(stages):
+            stage.input = queues[i]
+            stage.output = queues[i + 1] if i + 1 < len(stages) else self.output
+        self._stop = threading.Event()
+        self._threads = []
+        _register(self)
+
+    def _run_source(self):
+        try:
+            iterator = iter(self.source)
+            while not self._stop.is_set():
+                start = time.perf_counter()
+                try:
+                    item = next(iterator)
+                except StopIteration:
+                    break
+                self.source_stage.record((time.perf_counter() - start) * 1000)
+                self.source_stage.output.put(item)
+        finally:
+            self.source_stage.output.close()
+
+    def __iter__(self):
+        self._threads = [threading.Thread(target=self._run_source, name=f'{self.name}-capture', daemon=True)]
+        self._threads += [threading.Thread(target=stage.run, args=(self._stop,), name=f'{self.name}-{stage.name}', daemon=True)
+                          for stage in self.stages]
+        for thread in self._threads:
+            thread.start()
+        try:
+            while True:
+                try:
+                    item = self.output.get()
+                except QueueClosed:
+                    return
+                if item is not None:
+                    yield item
+        finally:
+            self._stop.set()
+            for thread in self._threads:
+                thread.join()
+
+    def get_stats(self):
+        stats = [self.source_stage.get_stats()] + [stage.get_stats() for stage in self.stages]
+        return {
+            'name': self.name,
+            'running': any(thread.is_alive() for thread in self._threads),
+            'stages': stats,
+            'output_depth': self.output.depth(),
+            'output_dropped': self.output.dropped
+        }
+
+
+_pipelines = {}
+_pipelines_lock = threading.Lock()
+
+
+def _register(pipeline):
+    # 같은 이름(카메라)으로 다시 시작하면 최신 파이프라인으로 교체
+    with _pipelines_lock:
+        _pipelines[pipeline.name] = pipeline
+
+
+def get_all_stats():
+    with _pipelines_lock:
+        pipelines = list(_pipelines.values())
+    return [pipeline.get_stats() for pipeline in pipelines]
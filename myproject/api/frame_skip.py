@@ -0,0 +1,148 @@
+# - 프레임 차이 기반 건너뛰기 (장면이 거의 그대로면 이전 랜드마크/분류 결과 재사용)
+# 카메라 스트림과 200ms 간격 analyze-hand 폴링은 연속 프레임이 거의 같은 경우가 많은데,
+# 매번 MediaPipe + 모델을 다시 돌린다. 작은 흑백 썸네일(32x24)의 평균 절대 차이(MAD)가
+# 임계값보다 작으면 직전에 처리한 결과를 그대로 쓰고, 연속으로는 max_skips 프레임까지만 건너뛴다.
+# 비교 기준은 마지막으로 "실제 처리한" 프레임이라 천천히 움직여도 차이가 누적되면 다시 처리한다.
+import os
+import threading
+import time
+from collections import OrderedDict
+import cv2
+
+# 평균 절대 차이 임계값 (0~255 밝기 단위)
+SKIP_THRESHOLD = float(os.environ.get('KSL_SKIP_MAD', '1.5'))
+# 연속으로 건너뛸 수 있는 최대 프레임 수
+MAX_CONSECUTIVE_SKIPS = int(os.environ.get('KSL_SKIP_MAX', '3'))
+# 사용자별 건너뛰기 상태 최대 개수 (오래 안 쓴 것부터 제거)
+MAX_SKIP_SESSIONS = int(os.environ.get('KSL_SKIP_SESSIONS', '256'))
+# 변화 감지용 썸네일 크기 (width, height)
+THUMB_SIZE = (32, 24)
+
+_stats_lock = threading.Lock()
+skip_stats = {}  # {source: {'frames', 'skipped', 'saved_ms_total', 'check_ms_total'}}
+
+
+def make_thumbnail(image, code=cv2.COLOR_RGB2GRAY):
+    """변화 감지용 작은 흑백 썸네일 (축소 먼저 → 흑백 변환이 더 쌈)"""
+    small = cv2.resize(image, THUMB_SIZE, interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, code) if small.ndim == 3 else small
+
+
+def mean_abs_diff(a, b):
+    """두 썸네일의 평균 절대 차이 (새 배열 없이 cv2.norm L1)"""
+    return cv2.norm(a, b, cv2.NORM_L1) / a.size
+
+
+class FrameSkipper:
+    """입력 하나(스트림 또는 사용자)의 프레임 변화 감지기
+
+    entry = skipper.check(image)
+    if entry is None:                 # 장면이 바뀜 → 실제 처리
+        entry = skipper.store(...처리 결과...)
+    """
+
+    def __init__(self, source, threshold=SKIP_THRESHOLD, max_skips=MAX_CONSECUTIVE_SKIPS, color_code=cv2.COLOR_RGB2GRAY):
+        self.source = source
+        self.threshold = threshold
+        self.max_skips = max_skips
+        self.color_code = color_code
+        self._lock = threading.Lock()
+        self._thumb = None  # 마지막으로 실제 처리한 프레임의 썸네일
+        self._entry = None
+        self._skips = 0
+        self._pending = None  # check()에서 계산한 (썸네일, 처리 시작 시각)
+        self._cost_ms = 0.0  # 실제 처리 시간 이동 평균 (절약한 시간 추정용)
+        with _stats_lock:
+            skip_stats.setdefault(source, {'frames': 0, 'skipped': 0, 'saved_ms_total': 0.0, 'check_ms_total': 0.0})
+
+    def reset(self):
+        with self._lock:
+            self._thumb = None
+            self._entry = None
+            self._skips = 0
+            self._pending = None
+
+    def check(self, image):
+        """직전 결과를 재사용할 수 있으면 그 결과, 아니면 None (이후 store() 호출)"""
+        start = time.perf_counter()
+        thumb = make_thumbnail(image, self.color_code)
+        with self._lock:
+            skip = (self._entry is not None and self._thumb is not None and self._skips < self.max_skips
+                    and thumb.shape == self._thumb.shape and mean_abs_diff(thumb, self._thumb) < self.threshold)
+            if skip:
+                self._skips += 1
+                entry = self._entry
+            else:
+                entry = None
+                self._pending = (thumb, time.perf_counter())
+            saved_ms = self._cost_ms if skip else 0.0
+        check_ms = (time.perf_counter() - start) * 1000
+        with _stats_lock:
+            stats = skip_stats[self.source]
+            stats['frames'] += 1
+            stats['check_ms_total'] += check_ms
+            if skip:
+                stats['skipped'] += 1
+                stats['saved_ms_total'] += saved_ms
+        return entry
+
+    def store(self, entry):
+        """실제 처리한 결과 저장 (check()가 None을 반환한 뒤 호출) → entry"""
+        with self._lock:
+            if self._pending is not None:
+                thumb, started = self._pending
+                cost_ms = (time.perf_counter() - started) * 1000
+                self._cost_ms = cost_ms if not self._cost_ms else 0.8 * self._cost_ms + 0.2 * cost_ms
+                self._thumb = thumb
+                self._pending = None
+            self._entry = entry
+            self._skips = 0
+        return entry
+
+
+class SessionSkippers:
+    """사용자(세션)별 FrameSkipper, 최대 max_sessions개 (가장 오래 안 쓴 것부터 제거)"""
+
+    def __init__(self, source, max_sessions=MAX_SKIP_SESSIONS):
+        self.source = source
+        self.max_sessions = max(1, max_sessions)
+        self._skippers = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            skipper = self._skippers.get(key)
+            if skipper is None:
+                skipper = self._skippers[key] = FrameSkipper(self.source)
+                while len(self._skippers) > self.max_sessions:
+                    self._skippers.popitem(last=False)
+            else:
+                self._skippers.move_to_end(key)
+            return skipper
+
+    def discard(self, key):
+        with self._lock:
+            self._skippers.pop(key, None)
+
+    def __len__(self):
+        return len(self._skippers)
+
+
+def get_skip_stats():
+    """입력 종류별 건너뛴 비율과 절약한 시간 (추정 처리 시간 - 변화 감지 비용)"""
+    with _stats_lock:
+        report = {}
+        for source, stats in skip_stats.items():
+            frames = stats['frames']
+            report[source] = {
+                'frames': frames,
+                'skipped': stats['skipped'],
+                'skip_ratio': round(stats['skipped'] / frames, 3) if frames else 0.0,
+                'saved_ms_total': round(stats['saved_ms_total'], 1),
+                'check_ms_total': round(stats['check_ms_total'], 1),
+                'net_saved_ms': round(stats['saved_ms_total'] - stats['check_ms_total'], 1),
+                'avg_check_ms': round(stats['check_ms_total'] / frames, 3) if frames else 0.0
+            }
+        report['threshold'] = SKIP_THRESHOLD
+        report['max_consecutive_skips'] = MAX_CONSECUTIVE_SKIPS
+        return report
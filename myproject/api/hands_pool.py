@@ -0,0 +1,197 @@
+# - MediaPipe Hands 인스턴스 풀
+# Hands 객체는 스레드 안전하지 않고 video 모드에서는 이전 프레임의 추적 상태를 가지므로,
+# 전역 객체 하나를 모든 요청이 공유하는 대신 모드별로 빌려 쓰고 반납한다.
+#   - image: static_image_mode=True, 업로드/단일 이미지 분석용 (매 프레임 새로 검출)
+#   - video: static_image_mode=False, 카메라 스트림/연속 프레임용 (추적 사용)
+import queue
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+MODES = ('image', 'video')
+
+
+class HandsPool:
+    """모드별 최대 size개의 Hands 인스턴스를 필요할 때 만들고 재사용하는 풀"""
+
+    def __init__(self, mp_hands, size, max_num_hands=2, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        self.mp_hands = mp_hands
+        self.size = max(1, size)
+        self._options = {
+            'max_num_hands': max_num_hands,
+            'min_detection_confidence': min_detection_confidence,
+            'min_tracking_confidence': min_tracking_confidence
+        }
+        self._idle = {mode: queue.LifoQueue() for mode in MODES}
+        self._lock = threading.Lock()
+        self._stats = {
+            mode: {'created': 0, 'checkouts': 0, 'waited': 0, 'wait_ms_total': 0.0, 'wait_ms_max': 0.0}
+            for mode in MODES
+        }
+
+    def _create(self, mode):
+        return self.mp_hands.Hands(static_image_mode=(mode == 'image'), **self._options)
+
+    def acquire(self, mode, timeout=None):
+        """유휴 인스턴스를 빌려오고, 모두 사용 중이면 반납될 때까지 대기 (timeout 초과 시 queue.Empty)"""
+        if mode not in MODES:
+            raise ValueError(f"알 수 없는 Hands 모드: {mode} (선택 가능: {', '.join(MODES)})")
+        stats = self._stats[mode]
+        start = time.perf_counter()
+        try:
+            hands = self._idle[mode].get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = stats['created'] < self.size
+                if can_create:
+                    stats['created'] += 1
+            hands = self._create(mode) if can_create else self._idle[mode].get(timeout=timeout)
+            if not can_create:
+                wait_ms = (time.perf_counter() - start) * 1000
+                with self._lock:
+                    stats['waited'] += 1
+                    stats['wait_ms_total'] += wait_ms
+                    stats['wait_ms_max'] = max(stats['wait_ms_max'], wait_ms)
+        with self._lock:
+            stats['checkouts'] += 1
+        return hands
+
+    def release(self, mode, hands):
+        self._idle[mode].put(hands)
+
+    @contextmanager
+    def checkout(self, mode, timeout=None):
+        hands = self.acquire(mode, timeout)
+        try:
+            yield hands
+        finally:
+            self.release(mode, hands)
+
+    def process(self, image_rgb, mode='image'):
+        """RGB 이미지 한 장 처리 (인스턴스를 빌려 process 후 바로 반납)"""
+        with self.checkout(mode) as hands:
+            return hands.process(image_rgb)
+
+    def get_stats(self):
+        with self._lock:
+            result = {'size_per_mode': self.size}
+            for mode in MODES:
+                stats = self._stats[mode]
+                result[mode] = {
+                    'created': stats['created'],
+                    'idle': self._idle[mode].qsize(),
+                    'checkouts': stats['checkouts'],
+                    'waited': stats['waited'],
+                    'avg_wait_ms': round(stats['wait_ms_total'] / stats['checkouts'], 3) if stats['checkouts'] else 0.0,
+                    'max_wait_ms': round(stats['wait_ms_max'], 3)
+                }
+            return result
+
+
+class SessionTrackers:
+    """사용자별 전용 video 모드 Hands (시퀀스 수어 버퍼용)
+
+    video 모드는 이전 프레임에서 손을 찾았으면 손바닥 검출을 건너뛰고 추적만 하므로,
+    한 사용자의 프레임만 계속 넣어 줘야 효과가 있다. 사용자마다 인스턴스를 하나씩 두고
+    ttl초 동안 사용하지 않았거나(시퀀스 버퍼 타임아웃과 동일) max_sessions를 넘으면
+    가장 오래 쓰지 않은 것부터 닫는다.
+    시퀀스 경로는 첫 번째 손만 사용하므로 max_num_hands=1로 만든다
+    (찾은 손 수가 max_num_hands보다 적으면 MediaPipe가 매 프레임 검출을 다시 돌림).
+    """
+
+    KINDS = ('tracked', 'redetected')
+
+    def __init__(self, mp_hands, max_sessions, ttl, min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        self.mp_hands = mp_hands
+        self.max_sessions = max(1, max_sessions)
+        self.ttl = ttl
+        self._options = {
+            'static_image_mode': False,
+            'max_num_hands': 1,
+            'min_detection_confidence': min_detection_confidence,
+            'min_tracking_confidence': min_tracking_confidence
+        }
+        self._sessions = OrderedDict()  # {session_id: entry}, 오래 쓰지 않은 순
+        self._lock = threading.Lock()
+        self._stats = {'created': 0, 'evicted_ttl': 0, 'evicted_lru': 0}
+        self._latency = {kind: {'frames': 0, 'ms_total': 0.0, 'ms_max': 0.0} for kind in self.KINDS}
+
+    def _pop_expired(self, now):
+        expired = []
+        while self._sessions:
+            session_id, entry = next(iter(self._sessions.items()))
+            if now - entry['last_used'] <= self.ttl:
+                break
+            del self._sessions[session_id]
+            expired.append(entry)
+            self._stats['evicted_ttl'] += 1
+        return expired
+
+    @staticmethod
+    def _close(entries):
+        for entry in entries:
+            # 처리 중인 프레임이 끝난 뒤 닫음
+            with entry['lock']:
+                entry['closed'] = True
+                if entry['hands'] is not None:
+                    entry['hands'].close()
+
+    def _checkout(self, session_id):
+        now = time.monotonic()
+        with self._lock:
+            evicted = self._pop_expired(now)
+            entry = self._sessions.get(session_id)
+            if entry is None:
+                entry = {'hands': None, 'lock': threading.Lock(), 'tracking': False, 'closed': False}
+                self._sessions[session_id] = entry
+                self._stats['created'] += 1
+                while len(self._sessions) > self.max_sessions:
+                    _, old = self._sessions.popitem(last=False)
+                    evicted.append(old)
+                    self._stats['evicted_lru'] += 1
+            else:
+                self._sessions.move_to_end(session_id)
+            entry['last_used'] = now
+        self._close(evicted)
+        return entry
+
+    def process(self, session_id, image_rgb):
+        """session_id 전용 트래커로 RGB 프레임 처리"""
+        while True:
+            entry = self._checkout(session_id)
+            with entry['lock']:
+                if entry['closed']:
+                    continue  # 기다리는 동안 제거됨 - 새로 만듦
+                if entry['hands'] is None:
+                    entry['hands'] = self.mp_hands.Hands(**self._options)
+                kind = 'tracked' if entry['tracking'] else 'redetected'
+                start = time.perf_counter()
+                results = entry['hands'].process(image_rgb)
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                entry['tracking'] = results.multi_hand_landmarks is not None
+            break
+        with self._lock:
+            latency = self._latency[kind]
+            latency['frames'] += 1
+            latency['ms_total'] += elapsed_ms
+            latency['ms_max'] = max(latency['ms_max'], elapsed_ms)
+        return results
+
+    def discard(self, session_id):
+        with self._lock:
+            entry = self._sessions.pop(session_id, None)
+        if entry is not None:
+            self._close([entry])
+
+    def get_stats(self):
+        with self._lock:
+            result = dict(self._stats, active=len(self._sessions), max_sessions=self.max_sessions, ttl_sec=self.ttl)
+            for kind in self.KINDS:
+                latency = self._latency[kind]
+                result[kind] = {
+                    'frames': latency['frames'],
+                    'avg_ms': round(latency['ms_total'] / latency['frames'], 3) if latency['frames'] else 0.0,
+                    'max_ms': round(latency['ms_max'], 3)
+                }
+            return result
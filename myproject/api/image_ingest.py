@@ -0,0 +1,100 @@
+# - 이미지 입력 디코딩 (Base64/업로드 바이트 → MediaPipe용 RGB 배열)
+# PIL → NumPy → BGR → RGB로 여러 번 변환하는 대신 cv2로 한 번에 디코딩하고,
+# JPEG는 디코딩 단계에서 1/2, 1/4, 1/8 크기로 줄여서(IMREAD_REDUCED_*) 12MP 사진도 빠르게 처리한다.
+import os
+import base64
+import binascii
+import cv2
+import numpy as np
+
+# 디코딩 후 긴 변 최대 픽셀 (손 랜드마크 검출에는 이 정도면 충분)
+MAX_IMAGE_SIDE = int(os.environ.get('KSL_MAX_IMAGE_SIDE', '640'))
+# 이미지 1장 최대 크기 (바이트, Base64 디코딩 후 기준)
+MAX_IMAGE_BYTES = int(os.environ.get('KSL_MAX_IMAGE_BYTES', str(12 * 1024 * 1024)))
+
+# 축소 배율 → 디코딩 플래그 (큰 배율부터)
+_REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2)
+)
+
+
+class ImageTooLarge(ValueError):
+    """이미지 데이터가 MAX_IMAGE_BYTES를 넘는 경우"""
+
+
+def jpeg_size(data):
+    """JPEG 헤더(SOF 마커)에서 (width, height) 읽기, JPEG가 아니거나 찾지 못하면 None"""
+    if data[:2] != b'\xff\xd8':
+        return None
+    i, n = 2, len(data)
+    while i + 9 <= n:
+        if data[i] != 0xFF:
+            i += 1
+            continue
+        marker = data[i + 1]
+        if marker == 0xFF or marker == 0x01 or 0xD0 <= marker <= 0xD8:
+            # 채움 바이트 / 길이 없는 마커
+            i += 2 if marker != 0xFF else 1
+            continue
+        # SOF0~SOF15 (DHT C4, JPG C8, DAC CC 제외): [길이 2][정밀도 1][높이 2][너비 2]
+        if 0xC0 <= marker <= 0xCF and marker not in (0xC4, 0xC8, 0xCC):
+            height = int.from_bytes(data[i + 5:i + 7], 'big')
+            width = int.from_bytes(data[i + 7:i + 9], 'big')
+            return width, height
+        i += 2 + int.from_bytes(data[i + 2:i + 4], 'big')
+    return None
+
+
+def reduced_decode_flag(size, max_side):
+    """원본 크기에서 긴 변이 max_side 이상으로 남는 가장 큰 축소 배율의 디코딩 플래그"""
+    if size is None or max_side is None:
+        return cv2.IMREAD_COLOR
+    longest = max(size)
+    for factor, flag in _REDUCED_FLAGS:
+        if longest // factor >= max_side:
+            return flag
+    return cv2.IMREAD_COLOR
+
+
+def decode_image_bytes(data, max_side=MAX_IMAGE_SIDE):
+    """이미지 바이트(JPEG/PNG 등) → RGB uint8 배열 (긴 변 max_side 이하), 디코딩 실패 시 None
+
+    MAX_IMAGE_BYTES를 넘으면 ImageTooLarge
+    """
+    if len(data) > MAX_IMAGE_BYTES:
+        raise ImageTooLarge(f"이미지가 너무 큽니다: {len(data)} bytes (최대 {MAX_IMAGE_BYTES})")
+    if not len(data):
+        return None
+    buffer = np.frombuffer(data, dtype=np.uint8)
+    try:
+        image = cv2.imdecode(buffer, reduced_decode_flag(jpeg_size(data), max_side))
+    except cv2.error:
+        return None
+    if image is None:
+        return None
+
+    # 축소 디코딩 후에도 크면 (JPEG가 아니거나 배율이 맞지 않는 경우) 나머지만 리사이즈
+    height, width = image.shape[:2]
+    if max_side is not None and max(height, width) > max_side:
+        scale = max_side / max(height, width)
+        image = cv2.resize(image, (max(1, round(width * scale)), max(1, round(height * scale))), interpolation=cv2.INTER_AREA)
+
+    # cv2는 BGR로 디코딩하므로 MediaPipe용 RGB로 한 번만 변환
+    return cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=image)
+
+
+def decode_base64(image_data, max_side=MAX_IMAGE_SIDE):
+    """Base64 문자열 (data:image/jpeg;base64, 헤더 포함 가능) → RGB uint8 배열, 실패 시 None"""
+    # Base64 헤더 제거 (data:image/jpeg;base64, 부분)
+    if ',' in image_data:
+        image_data = image_data.split(',', 1)[1]
+    # 디코딩 전에 크기 확인 (Base64 4글자 = 3바이트)
+    if len(image_data) // 4 * 3 > MAX_IMAGE_BYTES:
+        raise ImageTooLarge(f"이미지가 너무 큽니다: 약 {len(image_data) // 4 * 3} bytes (최대 {MAX_IMAGE_BYTES})")
+    try:
+        image_bytes = base64.b64decode(image_data)
+    except (binascii.Error, ValueError):
+        return None
+    return decode_image_bytes(image_bytes, max_side)
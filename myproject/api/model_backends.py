@@ -0,0 +1,233 @@
+# - 모델 추론 백엔드 (Keras / TFLite / NumPy)
+# TensorFlow는 Keras/TFLite 백엔드를 실제로 만들 때만 import 한다 (NumPy 백엔드는 TF 불필요)
+import os
+import queue
+import threading
+from contextlib import contextmanager
+import numpy as np
+
+# 선택 가능한 백엔드 (KSL_STATIC_BACKEND / KSL_SEQ_BACKEND)
+BACKENDS = ('keras', 'tflite-fp32', 'tflite-fp16', 'tflite-int8', 'numpy')
+
+
+class KerasBackend:
+    """Keras 모델을 고정 shape tf.function으로 직접 호출하는 백엔드"""
+
+    name = 'keras'
+
+    def __init__(self, model):
+        import tensorflow as tf
+        self._tf = tf
+        self.model = model
+        self.input_shape = tuple(int(d) for d in model.input_shape[1:])
+        self._infer = tf.function(
+            lambda x: model(x, training=False),
+            input_signature=[tf.TensorSpec(shape=(None,) + self.input_shape, dtype=tf.float32)]
+        )
+        # 첫 요청에서 트레이싱 비용이 나가지 않도록 미리 한 번 실행
+        self._infer(tf.zeros((1,) + self.input_shape, dtype=tf.float32))
+
+    @classmethod
+    def load(cls, path):
+        import tensorflow as tf
+        return cls(tf.keras.models.load_model(path))
+
+    def predict(self, batch):
+        """정규화된 (N, *입력 shape) float32 배열 → (N, 클래스 수) 확률 배열"""
+        return self._infer(self._tf.constant(batch)).numpy()
+
+    def get_stats(self):
+        return {'backend': self.name}
+
+
+def load_interpreter_class():
+    """라즈베리파이용 tflite_runtime 우선, 없으면 TensorFlow 내장 인터프리터"""
+    try:
+        from tflite_runtime.interpreter import Interpreter
+    except ImportError:
+        from tensorflow.lite.python.interpreter import Interpreter
+    return Interpreter
+
+
+def _quantize(x, detail):
+    """float 입력 → 인터프리터 입력 dtype (INT8/UINT8이면 scale/zero_point 양자화)"""
+    scale, zero_point = detail['quantization']
+    if not scale:
+        return x.astype(detail['dtype'], copy=False)
+    info = np.iinfo(detail['dtype'])
+    return np.clip(np.round(x / scale + zero_point), info.min, info.max).astype(detail['dtype'])
+
+
+def _dequantize(q, detail):
+    """인터프리터 출력 → float32 (양자화된 출력이면 역양자화)"""
+    scale, zero_point = detail['quantization']
+    if not scale:
+        return q.astype(np.float32, copy=False)
+    return (q.astype(np.float32) - zero_point) * scale
+
+
+class TFLiteBackend:
+    """TFLite 인터프리터 백엔드
+
+    인터프리터는 스레드 안전하지 않으므로 최대 pool_size개까지 만들어 두고,
+    호출하는 스레드가 하나씩 빌려 쓰고 반납한다 (Flask 요청 스레드는 매번 새로
+    생기므로 스레드마다 새로 만드는 대신 풀에서 재사용).
+    모델 파일은 model_path로 열어서 TFLite가 mmap하므로 인터프리터와 워커 프로세스가 같은 페이지를 공유한다
+    (content를 주면 그 바이트를 모든 인터프리터가 공유, 파일로 꺼낼 수 없는 번들 모델).
+    """
+
+    def __init__(self, path, name, num_threads=2, pool_size=2, content=None):
+        self.name = name
+        self.path = path
+        self.num_threads = num_threads
+        self.pool_size = max(1, pool_size)
+        self._content = content
+        self._interpreter_class = load_interpreter_class()
+        self._idle = queue.LifoQueue()
+        self._lock = threading.Lock()
+        self.created = 0
+
+        with self._checkout() as state:
+            self.input_shape = tuple(int(d) for d in state['input']['shape'][1:])
+            self.input_dtype = np.dtype(state['input']['dtype']).name
+
+    def _create(self):
+        if self._content is None:
+            interpreter = self._interpreter_class(model_path=self.path, num_threads=self.num_threads)
+        else:
+            interpreter = self._interpreter_class(model_content=self._content, num_threads=self.num_threads)
+        interpreter.allocate_tensors()
+        state = {'interpreter': interpreter, 'resizable': True}
+        self._refresh(state)
+        return state
+
+    @staticmethod
+    def _refresh(state):
+        interpreter = state['interpreter']
+        state['input'] = interpreter.get_input_details()[0]
+        state['output'] = interpreter.get_output_details()[0]
+        state['batch'] = int(state['input']['shape'][0])
+
+    @contextmanager
+    def _checkout(self):
+        """유휴 인터프리터를 빌려오고, 풀이 가득 찼으면 반납될 때까지 대기"""
+        try:
+            state = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self.created < self.pool_size
+                if can_create:
+                    self.created += 1
+            state = self._create() if can_create else self._idle.get()
+        try:
+            yield state
+        finally:
+            self._idle.put(state)
+
+    def _invoke(self, state, batch):
+        interpreter = state['interpreter']
+        interpreter.set_tensor(state['input']['index'], _quantize(batch, state['input']))
+        interpreter.invoke()
+        return _dequantize(interpreter.get_tensor(state['output']['index']), state['output'])
+
+    def _resize(self, state, batch_size):
+        """입력 배치 크기 변경, 지원하지 않는 모델(일부 LSTM 변환 결과)이면 False"""
+        if not state['resizable']:
+            return False
+        try:
+            state['interpreter'].resize_tensor_input(state['input']['index'], (batch_size,) + self.input_shape)
+            state['interpreter'].allocate_tensors()
+        except (ValueError, RuntimeError):
+            state['resizable'] = False
+            state['interpreter'].resize_tensor_input(state['input']['index'], (1,) + self.input_shape)
+            state['interpreter'].allocate_tensors()
+            self._refresh(state)
+            return False
+        self._refresh(state)
+        return True
+
+    def predict(self, batch):
+        """정규화된 (N, *입력 shape) float32 배열 → (N, 클래스 수) 확률 배열"""
+        n = batch.shape[0]
+        with self._checkout() as state:
+            if state['batch'] == n or self._resize(state, n):
+                return self._invoke(state, batch)
+            # 배치 크기를 바꿀 수 없으면 한 줄씩 실행
+            return np.concatenate([self._invoke(state, batch[i:i + 1]) for i in range(n)])
+
+    def get_stats(self):
+        return {
+            'backend': self.name,
+            'path': self.path,
+            'input_dtype': self.input_dtype,
+            'num_threads': self.num_threads,
+            'pool_size': self.pool_size,
+            'interpreters': self.created,
+            'idle': self._idle.qsize()
+        }
+
+
+class NumpyMLPBackend:
+    """TensorFlow 없이 NumPy만으로 실행하는 Dense(MLP) 백엔드
+
+    export_numpy.py가 ksl_model.h5에서 뽑아낸 가중치(.npz)를 읽어
+    배치 단위로 matmul + ReLU ... + softmax를 계산한다.
+    정적 모델(42→256→128→64→32→N)처럼 Dense/Dropout으로만 된 모델에만 사용 가능.
+    """
+
+    name = 'numpy'
+    ACTIVATIONS = ('relu', 'softmax', 'linear')
+
+    def __init__(self, weights, biases, activations):
+        for activation in activations:
+            if activation not in self.ACTIVATIONS:
+                raise ValueError(f"지원하지 않는 활성화 함수: {activation}")
+        self.layers = list(zip(weights, biases, activations))
+        self.input_shape = (int(weights[0].shape[0]),)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path) as data:
+            num_layers = int(data['num_layers'])
+            weights = [data[f'W{i}'].astype(np.float32) for i in range(num_layers)]
+            biases = [data[f'b{i}'].astype(np.float32) for i in range(num_layers)]
+            activations = [str(a) for a in data['activations']]
+        return cls(weights, biases, activations)
+
+    def predict(self, batch):
+        """정규화된 (N, 입력 차원) float32 배열 → (N, 클래스 수) 확률 배열"""
+        x = batch
+        for W, b, activation in self.layers:
+            x = x @ W
+            x += b
+            if activation == 'relu':
+                np.maximum(x, 0, out=x)
+            elif activation == 'softmax':
+                x -= x.max(axis=1, keepdims=True)
+                np.exp(x, out=x)
+                x /= x.sum(axis=1, keepdims=True)
+        return x
+
+    def get_stats(self):
+        return {
+            'backend': self.name,
+            'layers': [int(W.shape[1]) for W, _, _ in self.layers]
+        }
+
+
+def load_backend(backend, keras_path, export_paths, num_threads=2, pool_size=2):
+    """백엔드 이름에 맞는 추론 백엔드 생성
+
+    export_paths: {'tflite-fp32': 경로, ..., 'numpy': 경로} (모델별로 있는 것만)
+    파일이 없거나 알 수 없는 이름이면 경고 후 Keras 백엔드 사용
+    """
+    if backend not in BACKENDS:
+        print(f"⚠️ 알 수 없는 백엔드: {backend} (선택 가능: {', '.join(BACKENDS)}) - keras 사용")
+    elif backend != 'keras':
+        path = export_paths.get(backend)
+        if path and os.path.exists(path):
+            if backend == 'numpy':
+                return NumpyMLPBackend.load(path)
+            return TFLiteBackend(path, backend, num_threads, pool_size)
+        print(f"⚠️ {backend} 모델 파일 없음: {path} - keras 사용")
+    return KerasBackend.load(keras_path)
@@ -0,0 +1,104 @@
+# - 단일 모델 번들 (ksl_bundle.bin) 로더
+# 번들은 ksl_model_train/build_bundle.py로 생성 (포맷 설명은 해당 파일 참고)
+# 파일 하나를 mmap으로 열고 가중치는 복사 없이 np.frombuffer로 사용하므로,
+# 여러 워커 프로세스가 같은 페이지(OS 페이지 캐시)를 공유한다.
+# 시퀀스 TFLite 모델은 인터프리터가 bytes만 받으므로 번들 옆 파일로 한 번 꺼내고 model_path로 연다
+# (TFLite가 그 파일을 mmap → 역시 워커끼리 페이지 공유).
+import json
+import mmap
+import os
+import struct
+import zlib
+import numpy as np
+from api.model_backends import NumpyMLPBackend, TFLiteBackend
+
+MAGIC = b"KSLBNDL\0"
+FORMAT_VERSION = 1
+
+
+class ModelBundle:
+    """mmap으로 연 모델 번들 (정적 모델 + 선택적으로 시퀀스 모델)"""
+
+    def __init__(self, path):
+        self.path = path
+        with open(path, 'rb') as f:
+            # mmap은 파일을 닫아도 유지됨
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, header_size = struct.unpack_from('<8sII', self._mm, 0)
+        if magic != MAGIC:
+            raise ValueError(f"모델 번들 파일이 아닙니다: {path}")
+        if version != FORMAT_VERSION:
+            raise ValueError(f"지원하지 않는 번들 버전: {version} (지원: {FORMAT_VERSION})")
+        self.header = json.loads(self._mm[16:16 + header_size].decode('utf-8'))
+
+    def _array(self, ref):
+        """헤더의 섹션 정보 → 번들 메모리를 그대로 가리키는 읽기 전용 배열"""
+        count = int(np.prod(ref['shape'], dtype=np.int64))
+        return np.frombuffer(self._mm, dtype=np.dtype(ref['dtype']), count=count, offset=ref['offset']).reshape(ref['shape'])
+
+    # ---- 정적 모델 ----
+    @property
+    def static_labels(self):
+        return np.array(self.header['static']['labels'])
+
+    def static_backend(self):
+        """정규화가 첫 레이어에 합쳐진 NumPy MLP 백엔드 (별도 정규화 불필요)"""
+        layers = self.header['static']['layers']
+        return NumpyMLPBackend(
+            [self._array(layer['W']) for layer in layers],
+            [self._array(layer['b']) for layer in layers],
+            [layer['activation'] for layer in layers]
+        )
+
+    # ---- 시퀀스 모델 ----
+    @property
+    def has_sequence(self):
+        return 'sequence' in self.header
+
+    @property
+    def sequence_labels(self):
+        return np.array(self.header['sequence']['labels'])
+
+    @property
+    def sequence_max_timesteps(self):
+        return int(self.header['sequence']['max_timesteps'])
+
+    def sequence_norm(self):
+        seq = self.header['sequence']
+        return self._array(seq['norm_mean']), self._array(seq['norm_std'])
+
+    def sequence_backend(self, num_threads=2, pool_size=2):
+        tflite = self.header['sequence']['tflite']
+        path = self._extract(tflite)
+        if path is None:
+            # 번들 폴더에 쓸 수 없으면 모델 바이트를 복사해서 사용 (워커마다 메모리 사용)
+            content = self._mm[tflite['offset']:tflite['offset'] + tflite['length']]
+            return TFLiteBackend(self.path, tflite['variant'], num_threads, pool_size, content=content)
+        return TFLiteBackend(path, tflite['variant'], num_threads, pool_size)
+
+    def _extract(self, ref):
+        """번들 섹션 → 옆 파일 (<번들>.<crc32>.tflite, 내용이 같으면 재사용), 쓸 수 없으면 None"""
+        data = memoryview(self._mm)[ref['offset']:ref['offset'] + ref['length']]
+        try:
+            path = f"{self.path}.{zlib.crc32(data):08x}.tflite"
+            if os.path.exists(path) and os.path.getsize(path) == len(data):
+                return path
+            tmp_path = f"{path}.{os.getpid()}.tmp"  # 워커가 동시에 꺼내도 완성된 파일만 보이게
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            return path
+        except OSError as e:
+            print(f"⚠️ 번들 TFLite 모델 파일 생성 실패 ({e}) - 메모리 복사본 사용")
+            return None
+        finally:
+            data.release()
+
+    def get_info(self):
+        return {
+            'path': self.path,
+            'format_version': self.header['format_version'],
+            'created': self.header.get('created'),
+            'size_bytes': len(self._mm),
+            'has_sequence': self.has_sequence
+        }
@@ -0,0 +1,124 @@
+# - 시퀀스 모델 실행 여부를 정하는 모션 에너지 게이트
+# (ksl_model_train/predict_real.py의 모션 피크 로직을 서버용으로 옮김)
+import numpy as np
+
+# 모션 피크 파라미터 (predict_real.py와 동일)
+THRESH_STD = 1.0    # 피크 임계값: mean + THRESH_STD * std
+MIN_GAP = 3         # 피크 사이 최소 프레임
+MAX_GAP = 8         # 피크 사이 최대 프레임
+
+# 모션 에너지 계산용 랜드마크 가중치 (wrist, index_tip)
+MOTION_WEIGHTS = {0: 0.3, 8: 0.7}
+
+# 시퀀스 모델 재실행 조건
+ENERGY_TRIGGER = 0.15  # 마지막 실행 이후 누적 모션 에너지 (정규화 좌표 기준)
+
+# 전체 게이트 통계 (모든 사용자 합계)
+gate_stats = {'runs': 0, 'skipped': 0}
+
+
+def count_motion_peaks(values, min_gap=MIN_GAP, max_gap=MAX_GAP, thresh_std=THRESH_STD):
+    """모션 에너지 값 목록에서 피크 개수와 위치 반환"""
+    if not values:
+        return 0, []
+    arr = np.array(values, dtype=np.float32)
+    mean = float(np.mean(arr))
+    std = float(np.std(arr))
+    thresh = mean + thresh_std * std
+    peak_idxs = [i for i, v in enumerate(arr) if v >= thresh]
+    # merge consecutive indices into single peaks
+    merged = []
+    for idx in peak_idxs:
+        if not merged or idx - merged[-1] > 1:
+            merged.append(idx)
+    # enforce gap constraints by selecting peaks with proper spacing
+    selected = []
+    for idx in merged:
+        if not selected:
+            selected.append(idx)
+        else:
+            gap = idx - selected[-1]
+            if gap >= min_gap:
+                selected.append(idx)
+    # filter by max_gap pairwise if needed (keep peaks where any adjacent gap <= max_gap)
+    filtered = []
+    for i, idx in enumerate(selected):
+        if i == 0:
+            filtered.append(idx)
+        else:
+            gap = idx - selected[i-1]
+            if gap <= max_gap:
+                filtered.append(idx)
+            else:
+                # if too far, start a new group
+                filtered = [idx]
+    return len(filtered), filtered
+
+
+def motion_energy(deltas):
+    """랜드마크별 이동량 {lm_id: (dx, dy)} → 가중 모션 에너지 (Σ w * (|dx| + |dy|))"""
+    energy = 0.0
+    for lm_id, (dx, dy) in deltas.items():
+        energy += MOTION_WEIGHTS.get(lm_id, 0.5) * (abs(dx) + abs(dy))
+    return energy
+
+
+class MotionGate:
+    """사용자별 시퀀스 버퍼 옆에서 BiLSTM 실행 여부를 결정
+
+    매 폴링(200ms)마다 모델을 돌리는 대신 아래 경우에만 실행하고,
+    그 사이에는 마지막 결과(cached)를 그대로 돌려준다.
+      - 아직 결과가 없을 때
+      - 마지막 실행 이후 누적 모션 에너지가 ENERGY_TRIGGER 이상일 때
+      - 버퍼 안 모션 피크 수가 마지막 실행 때보다 늘었을 때 (쌍자음의 두 번째 동작 등)
+      - 마지막 실행 이후 새 프레임으로 버퍼가 가득 찼을 때
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.reset()
+
+    def reset(self):
+        self.energies = []
+        self.cached = None
+        self.energy_since_run = 0.0
+        self.frames_since_run = 0
+        self.peaks_at_run = 0
+
+    def push(self, energy):
+        self.energies.append(energy)
+        if len(self.energies) > self.capacity:
+            del self.energies[0]
+        self.energy_since_run += energy
+        self.frames_since_run += 1
+
+    def should_run(self):
+        if self.cached is None:
+            return True
+        if self.energy_since_run >= ENERGY_TRIGGER:
+            return True
+        if self.frames_since_run >= self.capacity:
+            return True
+        peaks, _ = count_motion_peaks(self.energies)
+        return peaks > self.peaks_at_run
+
+    def store(self, result):
+        """모델 실행 결과 저장 (다음 트리거 전까지 재사용)"""
+        self.cached = result
+        self.energy_since_run = 0.0
+        self.frames_since_run = 0
+        self.peaks_at_run, _ = count_motion_peaks(self.energies)
+        gate_stats['runs'] += 1
+
+    def reuse(self):
+        gate_stats['skipped'] += 1
+        return self.cached
+
+
+def get_gate_stats():
+    total = gate_stats['runs'] + gate_stats['skipped']
+    return {
+        'runs': gate_stats['runs'],
+        'skipped': gate_stats['skipped'],
+        'skip_ratio': round(gate_stats['skipped'] / total, 3) if total else 0.0
+    }
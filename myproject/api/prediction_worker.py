@@ -0,0 +1,125 @@
+# - 스트림 분류 전용 워커 (최신 입력만 처리)
+# 스트림 루프가 분류(model.predict)를 직접 호출하면 예측하는 동안 프레임 전송이 멈춘다.
+# 스트림은 최신 랜드마크를 번호(seq)와 함께 슬롯에 올려 두기만 하고, 워커 스레드가 꺼내서 분류한다.
+# 워커가 바쁜 동안 새 랜드마크가 오면 대기 중이던 이전 입력은 버리고 덮어쓴다 (큐에 쌓이지 않음).
+# 오버레이는 그 시점에 나와 있는 가장 최근 결과로 그린다.
+import threading
+import time
+from collections import namedtuple
+
+# seq: 입력 번호, output: predict_fn 반환값, timestamp: 완료 시각 (time.time()), elapsed_ms: 예측 시간
+PredictionResult = namedtuple('PredictionResult', ['seq', 'output', 'timestamp', 'elapsed_ms'])
+
+
+class PredictionWorker:
+    """predict_fn(payload)를 전용 스레드에서 실행하는 최신값 덮어쓰기 워커
+
+    on_result(seq, output): 예측이 끝날 때마다 워커 스레드에서 호출 (인식 상태 갱신 등)
+    """
+
+    def __init__(self, name, predict_fn, on_result=None):
+        self.name = name
+        self.predict_fn = predict_fn
+        self.on_result = on_result
+        self._cond = threading.Condition()
+        self._pending = None  # (seq, payload)
+        self._latest = None
+        self._running = False
+        self._thread = None
+        self._stats = {'submitted': 0, 'overwritten': 0, 'completed': 0, 'errors': 0, 'callback_errors': 0,
+                       'predict_ms_total': 0.0, 'predict_ms_max': 0.0}
+
+    def start(self):
+        with self._cond:
+            if self._running:
+                return self
+            self._running = True
+        self._thread = threading.Thread(target=self._run, name=f'predict-{self.name}', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        with self._cond:
+            self._running = False
+            self._pending = None
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+
+    def submit(self, seq, payload):
+        """최신 입력 올리기 (처리 안 된 이전 입력은 덮어씀), 바로 반환"""
+        with self._cond:
+            if self._pending is not None:
+                self._stats['overwritten'] += 1
+            self._pending = (seq, payload)
+            self._stats['submitted'] += 1
+            self._cond.notify()
+
+    def latest(self):
+        """가장 최근 예측 결과 (아직 없으면 None)"""
+        return self._latest
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._pending is not None or not self._running)
+                if not self._running:
+                    return
+                seq, payload = self._pending
+                self._pending = None
+            start = time.perf_counter()
+            try:
+                output = self.predict_fn(payload)
+            except Exception as e:
+                with self._cond:
+                    self._stats['errors'] += 1
+                print(f"❌ 예측 워커 오류 ({self.name}): {e}")
+                continue
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            self._latest = PredictionResult(seq, output, time.time(), elapsed_ms)
+            with self._cond:
+                self._stats['completed'] += 1
+                self._stats['predict_ms_total'] += elapsed_ms
+                self._stats['predict_ms_max'] = max(self._stats['predict_ms_max'], elapsed_ms)
+            if self.on_result is not None:
+                try:
+                    self.on_result(seq, output)
+                except Exception as e:
+                    # 상태 저장 실패 등으로 워커 스레드가 죽으면 스트림 인식이 조용히 멈추므로 기록만 하고 계속
+                    with self._cond:
+                        self._stats['callback_errors'] += 1
+                    print(f"❌ 예측 결과 처리 오류 ({self.name}): {e}")
+
+    def get_stats(self):
+        with self._cond:
+            completed = self._stats['completed']
+            latest = self._latest
+            return {
+                'name': self.name,
+                'running': self._running,
+                'submitted': self._stats['submitted'],
+                'overwritten': self._stats['overwritten'],
+                'completed': completed,
+                'errors': self._stats['errors'],
+                'callback_errors': self._stats['callback_errors'],
+                'avg_predict_ms': round(self._stats['predict_ms_total'] / completed, 3) if completed else 0.0,
+                'max_predict_ms': round(self._stats['predict_ms_max'], 3),
+                'latest_seq': latest.seq if latest else None
+            }
+
+
+_workers = {}
+_workers_lock = threading.Lock()
+
+
+def register_worker(worker):
+    # 같은 이름(카메라)으로 다시 시작하면 최신 워커로 교체
+    with _workers_lock:
+        _workers[worker.name] = worker
+    return worker
+
+
+def get_all_stats():
+    with _workers_lock:
+        workers = list(_workers.values())
+    return [worker.get_stats() for worker in workers]
@@ -5,14 +5,23 @@ from auth.models import db, Recognition
 from datetime import datetime
 import uuid
 import random
-import tensorflow as tf
 import mediapipe as mp
-import cv2
 import numpy as np
 import os
-import base64
-from PIL import Image
-import io
+from urllib.parse import unquote
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from api.model_backends import load_backend
+from api.model_bundle import ModelBundle
+from api.motion_gate import MotionGate, motion_energy, get_gate_stats
+from api.frame_skip import SessionSkippers, get_skip_stats
+from api.hands_pool import HandsPool, SessionTrackers
+from api.sequence_buffer import SequenceRingBuffer, SequenceBuffers
+from api.features import SEQUENCE_LANDMARKS, SEQUENCE_FEATURE_DIM, sequence_features, static_features
+from api.frame_exchange import get_slot
+from api.image_ingest import decode_image_bytes, decode_base64, ImageTooLarge, MAX_IMAGE_BYTES
 
 recognition_bp = Blueprint('recognition', __name__)
 
@@ -32,15 +41,51 @@ DOUBLE_CONSONANT_MAP = {
     'ㅈ': 'ㅉ'
 }
 
+# ==== 추론 배치 설정 ====
+BATCH_WINDOW_MS = float(os.environ.get('KSL_BATCH_WINDOW_MS', '3'))  # 0이면 배치 비활성화
+BATCH_MAX_SIZE = int(os.environ.get('KSL_BATCH_MAX_SIZE', '32'))
+INFERENCE_DEADLINE_MS = float(os.environ.get('KSL_INFERENCE_DEADLINE_MS', '500'))  # 요청당 추론 기한
+
+# ==== 추론 백엔드 설정 ====
+# keras | tflite-fp32 | tflite-fp16 | tflite-int8 | numpy (numpy는 정적 모델만, TensorFlow 불필요)
+STATIC_BACKEND = os.environ.get('KSL_STATIC_BACKEND', 'keras')
+SEQ_BACKEND = os.environ.get('KSL_SEQ_BACKEND', 'keras')  # none이면 시퀀스 모델을 로드하지 않음
+TFLITE_NUM_THREADS = int(os.environ.get('KSL_TFLITE_THREADS', '2'))  # 인터프리터당 스레드 수
+TFLITE_POOL_SIZE = int(os.environ.get('KSL_TFLITE_POOL_SIZE', str(os.cpu_count() or 2)))  # 최대 인터프리터 수
+# KSL_USE_BUNDLE=1일 때만 ksl_bundle.bin 사용 (파일이 있다는 이유만으로 운영 백엔드를 바꾸지 않음)
+USE_BUNDLE = os.environ.get('KSL_USE_BUNDLE', '0') == '1'
+# KSL_STATIC_BACKEND / KSL_SEQ_BACKEND를 직접 지정하면 그 모델은 번들 대신 지정한 백엔드로 로드
+BUNDLE_STATIC = USE_BUNDLE and 'KSL_STATIC_BACKEND' not in os.environ
+BUNDLE_SEQ = USE_BUNDLE and 'KSL_SEQ_BACKEND' not in os.environ
+
+# ==== MediaPipe 설정 ====
+HANDS_POOL_SIZE = int(os.environ.get('KSL_HANDS_POOL_SIZE', str(os.cpu_count() or 2)))  # 모드(image/video)별 최대 인스턴스 수
+MAX_SEQUENCE_TRACKERS = int(os.environ.get('KSL_MAX_TRACKERS', '32'))  # 사용자별 전용 트래커 최대 수
+
+# 시퀀스 버퍼 타임아웃 (초) - 이 시간 동안 프레임이 없으면 버퍼와 전용 트래커를 정리
+SEQUENCE_TIMEOUT = 5.0
+
+# 이미지 없이 analyze-hand를 호출할 때 사용할 카메라 스트림 프레임의 최대 나이 (초)
+STREAM_FRAME_MAX_AGE = 1.0
+
 # ==== AI 모델 초기화 ====
 BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # myproject 폴더
 MODEL_DIR = os.path.join(BASE_DIR, "model")
 
+# 단일 모델 번들 (ksl_model_train/build_bundle.py로 생성)
+KSL_BUNDLE_PATH = os.path.join(MODEL_DIR, "ksl_bundle.bin")
+
 # 정적 모델 (기본 자음/모음)
 KSL_MODEL_PATH = os.path.join(MODEL_DIR, "ksl_model.h5")
 KSL_LABELS_PATH = os.path.join(MODEL_DIR, "ksl_labels.npy")
 KSL_NORM_MEAN_PATH = os.path.join(MODEL_DIR, "ksl_norm_mean.npy")
 KSL_NORM_STD_PATH = os.path.join(MODEL_DIR, "ksl_norm_std.npy")
+KSL_EXPORT_PATHS = {
+    'tflite-fp32': os.path.join(MODEL_DIR, "ksl_model_fp32.tflite"),
+    'tflite-fp16': os.path.join(MODEL_DIR, "ksl_model_fp16.tflite"),
+    'tflite-int8': os.path.join(MODEL_DIR, "ksl_model_int8.tflite"),
+    'numpy': os.path.join(MODEL_DIR, "ksl_model.npz")
+}
 
 # 시퀀스 모델 (쌍자음/복합모음)
 KSL_SEQ_MODEL_PATH = os.path.join(MODEL_DIR, "ksl_model_sequence.h5")
@@ -48,45 +93,298 @@ KSL_SEQ_LABELS_PATH = os.path.join(MODEL_DIR, "ksl_labels_sequence.npy")
 KSL_SEQ_CONFIG_PATH = os.path.join(MODEL_DIR, "ksl_sequence_config.npy")
 KSL_SEQ_NORM_MEAN_PATH = os.path.join(MODEL_DIR, "ksl_seq_norm_mean.npy")
 KSL_SEQ_NORM_STD_PATH = os.path.join(MODEL_DIR, "ksl_seq_norm_std.npy")
+KSL_SEQ_EXPORT_PATHS = {
+    'tflite-fp32': os.path.join(MODEL_DIR, "ksl_sequence_fp32.tflite"),
+    'tflite-fp16': os.path.join(MODEL_DIR, "ksl_sequence_fp16.tflite"),
+    'tflite-int8': os.path.join(MODEL_DIR, "ksl_sequence_int8.tflite")
+}
 
 # 전역 모델 변수
-ksl_model = None  # 정적 모델
+ksl_model = None  # 정적 모델 (Keras 백엔드일 때만)
 labels_ksl = None  # 정적 라벨
 ksl_norm_mean = None  # 정적 모델 정규화 평균
 ksl_norm_std = None  # 정적 모델 정규화 표준편차
-ksl_seq_model = None  # 시퀀스 모델
+ksl_seq_model = None  # 시퀀스 모델 (Keras 백엔드일 때만)
 labels_ksl_seq = None  # 시퀀스 라벨
 seq_max_timesteps = None  # 시퀀스 최대 프레임 수
 seq_norm_mean = None  # 시퀀스 정규화 평균
 seq_norm_std = None  # 시퀀스 정규화 표준편차
 mp_hands = None
-hands = None
+hands_pool = None  # MediaPipe Hands 인스턴스 풀 (image/video 모드)
+sequence_trackers = None  # 시퀀스 버퍼 사용자별 전용 트래커
+# analyze-hand 폴링용 사용자별 프레임 변화 감지 (장면이 그대로면 이전 랜드마크/분류 재사용)
+static_skippers = SessionSkippers('api_static')
+sequence_skippers = SessionSkippers('api_sequence')
+static_engine = None  # 정적 모델 추론 엔진 (InferenceEngine)
+seq_engine = None  # 시퀀스 모델 추론 엔진
+static_batcher = None  # 정적 모델 요청 간 배치 (InferenceBatcher)
+seq_batcher = None  # 시퀀스 모델 요청 간 배치
+model_bundle = None  # 모델 번들 (ModelBundle, 사용할 때만)
 
-# 시퀀스 버퍼 (사용자별)
-from collections import deque
-sequence_buffers = {}  # {user_id: deque}
+# 시퀀스 버퍼 (사용자별 링 버퍼, 오래 안 쓴 것부터 제거)
+sequence_buffers = SequenceBuffers()  # {user_id: {'buffer': SequenceRingBuffer, ...}}
+
+# ==== 추론 엔진 ====
+def landmarks_to_coords(hand_landmarks):
+    """MediaPipe 손 랜드마크 → [x0, y0, x1, y1, ...] (21x2=42) float32 정적 특징 (api/features.py)"""
+    return static_features(landmark_points(hand_landmarks))
+
+def fill_landmark_coords(hand_landmarks, out):
+    """MediaPipe 손 랜드마크 → 미리 만든 float32 배열 out에 정적 특징 [x0, y0, x1, y1, ...] 채우기"""
+    return static_features(landmark_points(hand_landmarks), out=out)
+
+def landmark_points(hand_landmarks):
+    """MediaPipe 손 랜드마크 또는 랜드마크 배열 → (21, 2) float32 배열"""
+    if hasattr(hand_landmarks, 'landmark'):
+        return np.array([(lm.x, lm.y) for lm in hand_landmarks.landmark], dtype=np.float32)
+    return np.asarray(hand_landmarks, dtype=np.float32).reshape(21, 2)
+
+def parse_landmarks(value):
+    """클라이언트가 보낸 랜드마크 → (21, 2) float32 배열 (손이 없으면 빈 배열)
+
+    [[x, y], ...] 21개, [[x, y, z], ...] 21개(z는 무시), 또는 [x0, y0, x1, y1, ...] 42개.
+    좌표는 MediaPipe와 같은 0~1 정규화 이미지 좌표여야 한다. 형식이 맞지 않으면 ValueError.
+    """
+    if value is None:
+        return np.empty((0, 2), dtype=np.float32)
+    try:
+        points = np.asarray(value, dtype=np.float32)
+    except (TypeError, ValueError):
+        raise ValueError('landmarks는 숫자 배열이어야 합니다')
+    if points.ndim == 0:
+        raise ValueError('landmarks는 숫자 배열이어야 합니다')
+    if points.shape == (0,):
+        return np.empty((0, 2), dtype=np.float32)
+    if points.shape == (42,):
+        points = points.reshape(21, 2)
+    elif points.ndim == 2 and points.shape[0] == 21 and points.shape[1] in (2, 3):
+        points = np.ascontiguousarray(points[:, :2])
+    else:
+        raise ValueError(f'landmarks 형식 오류: {list(points.shape)} (21x2, 21x3 또는 42개 필요)')
+    if not np.all(np.isfinite(points)):
+        raise ValueError('landmarks에 NaN/Inf가 있습니다')
+    return points
+
+class InferenceEngine:
+    """모델 추론 엔진 (추론 백엔드 + 라벨 + 정규화 통계)
+
+    model.predict()는 호출마다 데이터 어댑터/배치 루프를 새로 만들기 때문에
+    1x42 입력 한 줄에도 수 ms가 걸린다. 백엔드(model_backends.py)를 직접 호출해서
+    이 오버헤드를 없앤다. Keras 백엔드는 입력 shape을 고정해 한 번만 트레이싱한
+    tf.function, TFLite 백엔드는 인터프리터 풀을 사용한다.
+    정적 모델(42)과 시퀀스 모델(max_timesteps, 10) 모두 같은 방식으로 사용한다.
+    """
+
+    def __init__(self, backend, labels, norm_mean=None, norm_std=None):
+        self.backend = backend
+        self.labels = labels
+        self.norm_mean = norm_mean
+        self.norm_std = norm_std
+        self.input_shape = backend.input_shape
+
+    def prepare(self, landmarks, out=None):
+        """입력 1개를 모델 입력 shape의 float32 배열로 변환 (정규화 전)
+
+        landmarks: MediaPipe 손 랜드마크, 42개 좌표 (x, y 반복), (21, 2) 배열 또는
+        (max_timesteps, 특징 수) 시퀀스 배열
+        out: MediaPipe 랜드마크를 바로 채울 float32 배열 (카메라 스트림처럼 매 프레임 호출할 때 재사용)
+        """
+        if hasattr(landmarks, 'landmark'):
+            if out is not None:
+                return fill_landmark_coords(landmarks, out).reshape(self.input_shape)
+            landmarks = landmarks_to_coords(landmarks)
+        return np.asarray(landmarks, dtype=np.float32).reshape(self.input_shape)
+
+    def new_input_buffer(self):
+        """prepare(out=...)/classify(out=...)에 넘길 입력 배열 (1, *입력 shape)"""
+        return np.zeros((1,) + self.input_shape, dtype=np.float32)
+
+    def predict_batch(self, batch, inplace=False):
+        """(N, *입력 shape) 배열 → (N, 클래스 수) 확률 배열
+
+        inplace=True면 batch(float32)를 그 자리에서 정규화 (호출자 소유의 임시 버퍼일 때만)
+        """
+        batch = np.asarray(batch, dtype=np.float32).reshape((-1,) + self.input_shape)
+        if self.norm_mean is not None and self.norm_std is not None:
+            if inplace:
+                np.subtract(batch, self.norm_mean, out=batch)
+                np.divide(batch, self.norm_std, out=batch)
+            else:
+                batch = ((batch - self.norm_mean) / self.norm_std).astype(np.float32, copy=False)
+        return self.backend.predict(batch)
+
+    def decode(self, probs):
+        """확률 배열 → (라벨, 신뢰도, 확률 배열), 범위를 벗어난 인덱스면 라벨은 None"""
+        idx = int(np.argmax(probs))
+        label = self.labels[idx] if 0 <= idx < len(self.labels) else None
+        return label, float(probs[idx]), probs
+
+    def classify(self, landmarks, out=None):
+        """입력 1개 → (라벨, 신뢰도, 확률 배열), out이 있으면 입력 배열을 재사용 (new_input_buffer)"""
+        return self.decode(self.predict_batch(self.prepare(landmarks, out), inplace=out is not None)[0])
+
+class InferenceFailed(Exception):
+    """모델 추론 실패 (배치 추론 예외 등) - 폴백 점수 대신 503으로 응답"""
+
+class InferenceDeadlineExceeded(InferenceFailed):
+    """배치에 들어가기 전에 요청의 응답 기한이 지난 경우"""
+
+def classify_with(engine, batcher, landmarks, out=None):
+    """배치(있으면) 또는 추론 엔진으로 입력 1개 분류, 실패는 InferenceFailed로 올림
+
+    분석 함수의 except Exception 폴백(무작위 점수)에 섞이지 않도록 추론 오류만 따로 구분한다.
+    """
+    try:
+        return (batcher or engine).classify(landmarks, out=out)
+    except InferenceFailed:
+        raise
+    except Exception as e:
+        raise InferenceFailed(f'모델 추론 실패: {e}') from e
+
+class InferenceBatcher:
+    """요청 간 마이크로 배칭 스케줄러
+
+    여러 클라이언트가 동시에 analyze-hand를 폴링하면 요청마다 1행짜리 추론을
+    따로 실행하게 된다. 첫 입력이 들어온 뒤 window_ms 동안 대기 중인 입력을 모아
+    모델당 한 번의 배치 추론으로 처리하고, 결과를 각 요청에 돌려준다.
+    기한(deadline)이 이미 지난 입력은 계산하지 않고 버린다.
+    """
+
+    def __init__(self, engine, name, window_ms, max_batch, deadline_ms):
+        self.engine = engine
+        self.name = name
+        self.window = window_ms / 1000.0
+        self.max_batch = max_batch
+        self.deadline = deadline_ms / 1000.0
+        self.stats = {'batches': 0, 'items': 0, 'dropped': 0, 'errors': 0, 'max_batch_seen': 0}
+        self._pending = deque()
+        self._cond = threading.Condition()
+        self._worker = threading.Thread(target=self._run, name=f'batcher-{name}', daemon=True)
+        self._worker.start()
+
+    def submit(self, landmarks, deadline=None):
+        """입력 1개를 큐에 넣고 Future 반환 (deadline: time.monotonic() 기준)"""
+        future = Future()
+        if deadline is None:
+            deadline = time.monotonic() + self.deadline
+        item = (self.engine.prepare(landmarks), deadline, future)
+        with self._cond:
+            self._pending.append(item)
+            self._cond.notify()
+        return future
+
+    def classify(self, landmarks, deadline=None, out=None):
+        """InferenceEngine.classify와 같은 형식, 배치 처리 결과를 기다림
+
+        out은 형식을 맞추기 위한 인자 (배치는 입력을 쌓을 때 복사하므로 입력 배열을 바꾸지 않음)
+        """
+        probs = self.submit(landmarks, deadline).result()
+        return self.engine.decode(probs)
+
+    def _collect(self):
+        """첫 입력 도착 후 window 동안(또는 max_batch까지) 입력을 모아 반환"""
+        with self._cond:
+            while not self._pending:
+                self._cond.wait()
+            flush_at = time.monotonic() + self.window
+            while len(self._pending) < self.max_batch:
+                remaining = flush_at - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            count = min(len(self._pending), self.max_batch)
+            return [self._pending.popleft() for _ in range(count)]
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            now = time.monotonic()
+            live = []
+            for x, deadline, future in batch:
+                if deadline < now:
+                    self.stats['dropped'] += 1
+                    future.set_exception(InferenceDeadlineExceeded(f'{self.name} 추론 기한 초과'))
+                elif future.set_running_or_notify_cancel():
+                    live.append((x, future))
+            if not live:
+                continue
+
+            try:
+                probs = self.engine.predict_batch(np.stack([x for x, _ in live]))
+            except Exception as e:
+                self.stats['errors'] += 1
+                print(f"❌ {self.name} 배치 추론 실패: {e}")
+                for _, future in live:
+                    future.set_exception(InferenceFailed(f'{self.name} 배치 추론 실패: {e}'))
+                continue
+
+            self.stats['batches'] += 1
+            self.stats['items'] += len(live)
+            self.stats['max_batch_seen'] = max(self.stats['max_batch_seen'], len(live))
+            for (_, future), p in zip(live, probs):
+                future.set_result(p)
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['pending'] = len(self._pending)
+        stats['avg_batch_size'] = round(stats['items'] / stats['batches'], 2) if stats['batches'] else 0.0
+        stats['window_ms'] = self.window * 1000
+        return stats
 
 def initialize_ai_models():
     """AI 모델 초기화 (하이브리드: 정적 + 시퀀스)"""
-    global ksl_model, labels_ksl, ksl_norm_mean, ksl_norm_std, ksl_seq_model, labels_ksl_seq, seq_max_timesteps, seq_norm_mean, seq_norm_std, mp_hands, hands
+    global ksl_model, labels_ksl, ksl_norm_mean, ksl_norm_std, ksl_seq_model, labels_ksl_seq, seq_max_timesteps, seq_norm_mean, seq_norm_std, mp_hands, hands_pool, sequence_trackers, static_engine, seq_engine, static_batcher, seq_batcher, model_bundle
     
     try:
+        # 0. 모델 번들 (있으면 파일 하나를 mmap으로 열어 정적/시퀀스 모델 모두 사용)
+        if (BUNDLE_STATIC or BUNDLE_SEQ) and os.path.exists(KSL_BUNDLE_PATH):
+            model_bundle = ModelBundle(KSL_BUNDLE_PATH)
+            print(f"📦 모델 번들 사용 (KSL_USE_BUNDLE=1): {KSL_BUNDLE_PATH} (생성: {model_bundle.header.get('created')})")
+            if not BUNDLE_STATIC:
+                print(f"📦 KSL_STATIC_BACKEND={STATIC_BACKEND} 지정 → 정적 모델은 번들 대신 {STATIC_BACKEND} 사용")
+            if not BUNDLE_SEQ:
+                print(f"📦 KSL_SEQ_BACKEND={SEQ_BACKEND} 지정 → 시퀀스 모델은 번들 대신 {SEQ_BACKEND} 사용")
+        elif USE_BUNDLE:
+            print(f"⚠️ KSL_USE_BUNDLE=1이지만 번들 파일 없음: {KSL_BUNDLE_PATH} → {STATIC_BACKEND}/{SEQ_BACKEND} 백엔드 사용")
+        elif os.path.exists(KSL_BUNDLE_PATH):
+            print(f"📦 번들 파일이 있지만 사용하지 않음 (사용하려면 KSL_USE_BUNDLE=1): {KSL_BUNDLE_PATH}")
+        
         # 1. 정적 모델 로딩 (기본 자음/모음)
-        ksl_model = tf.keras.models.load_model(KSL_MODEL_PATH)
-        labels_ksl = np.load(KSL_LABELS_PATH, allow_pickle=True)
-        
-        # 정규화 통계 로드 (정적 모델용)
-        if os.path.exists(KSL_NORM_MEAN_PATH) and os.path.exists(KSL_NORM_STD_PATH):
-            ksl_norm_mean = np.load(KSL_NORM_MEAN_PATH)
-            ksl_norm_std = np.load(KSL_NORM_STD_PATH)
-            print(f"✅ 정적 모델 로드 성공: {len(labels_ksl)}개 라벨 (정규화 적용)")
+        if model_bundle is not None and BUNDLE_STATIC:
+            # 번들은 정규화가 첫 레이어에 합쳐져 있으므로 정규화 통계 불필요
+            static_backend = model_bundle.static_backend()
+            labels_ksl = model_bundle.static_labels
+            print(f"✅ 정적 모델 로드 성공: {len(labels_ksl)}개 라벨 (번들, 정규화 합침)")
         else:
-            print(f"⚠️ 정규화 파일 없음 - 정적 모델 정확도가 낮을 수 있습니다!")
-            print(f"✅ 정적 모델 로드 성공: {len(labels_ksl)}개 라벨 (정규화 없음)")
+            static_backend = load_backend(STATIC_BACKEND, KSL_MODEL_PATH, KSL_EXPORT_PATHS, TFLITE_NUM_THREADS, TFLITE_POOL_SIZE)
+            labels_ksl = np.load(KSL_LABELS_PATH, allow_pickle=True)
+            
+            # 정규화 통계 로드 (정적 모델용)
+            if os.path.exists(KSL_NORM_MEAN_PATH) and os.path.exists(KSL_NORM_STD_PATH):
+                ksl_norm_mean = np.load(KSL_NORM_MEAN_PATH)
+                ksl_norm_std = np.load(KSL_NORM_STD_PATH)
+                print(f"✅ 정적 모델 로드 성공: {len(labels_ksl)}개 라벨 (정규화 적용)")
+            else:
+                print(f"⚠️ 정규화 파일 없음 - 정적 모델 정확도가 낮을 수 있습니다!")
+                print(f"✅ 정적 모델 로드 성공: {len(labels_ksl)}개 라벨 (정규화 없음)")
+        ksl_model = getattr(static_backend, 'model', None)
+        
+        static_engine = InferenceEngine(static_backend, labels_ksl, ksl_norm_mean, ksl_norm_std)
+        print(f"✅ 정적 모델 추론 백엔드: {static_backend.name}")
+        if BATCH_WINDOW_MS > 0:
+            static_batcher = InferenceBatcher(static_engine, 'static', BATCH_WINDOW_MS, BATCH_MAX_SIZE, INFERENCE_DEADLINE_MS)
         
         # 2. 시퀀스 모델 로딩 (쌍자음/복합모음)
-        if os.path.exists(KSL_SEQ_MODEL_PATH):
-            ksl_seq_model = tf.keras.models.load_model(KSL_SEQ_MODEL_PATH)
+        seq_backend = None
+        if SEQ_BACKEND == 'none':
+            print("⚠️ 시퀀스 모델 비활성화 (KSL_SEQ_BACKEND=none) - 쌍자음/복합모음 인식 불가")
+        elif model_bundle is not None and BUNDLE_SEQ and model_bundle.has_sequence:
+            seq_backend = model_bundle.sequence_backend(TFLITE_NUM_THREADS, TFLITE_POOL_SIZE)
+            labels_ksl_seq = model_bundle.sequence_labels
+            seq_max_timesteps = model_bundle.sequence_max_timesteps
+            seq_norm_mean, seq_norm_std = model_bundle.sequence_norm()
+        elif os.path.exists(KSL_SEQ_MODEL_PATH) or os.path.exists(KSL_SEQ_EXPORT_PATHS.get(SEQ_BACKEND, '')):
+            seq_backend = load_backend(SEQ_BACKEND, KSL_SEQ_MODEL_PATH, KSL_SEQ_EXPORT_PATHS, TFLITE_NUM_THREADS, TFLITE_POOL_SIZE)
             labels_ksl_seq = np.load(KSL_SEQ_LABELS_PATH, allow_pickle=True)
             seq_max_timesteps = int(np.load(KSL_SEQ_CONFIG_PATH))
             
@@ -97,19 +395,29 @@ def initialize_ai_models():
                 print(f"✅ 시퀀스 정규화 통계 로드 성공")
             else:
                 print("⚠️ 시퀀스 정규화 통계 없음 - 정규화 없이 진행")
-            
-            print(f"✅ 시퀀스 모델 로드 성공: {len(labels_ksl_seq)}개 라벨 (max_timesteps={seq_max_timesteps})")
         else:
             print("⚠️ 시퀀스 모델 없음 - 쌍자음/복합모음은 규칙 기반으로 처리")
         
-        # 3. MediaPipe 초기화 (양손 지원)
+        if seq_backend is not None:
+            ksl_seq_model = getattr(seq_backend, 'model', None)
+            seq_engine = InferenceEngine(seq_backend, labels_ksl_seq, seq_norm_mean, seq_norm_std)
+            print(f"✅ 시퀀스 모델 추론 백엔드: {seq_backend.name}")
+            if BATCH_WINDOW_MS > 0:
+                seq_batcher = InferenceBatcher(seq_engine, 'sequence', BATCH_WINDOW_MS, BATCH_MAX_SIZE, INFERENCE_DEADLINE_MS)
+            
+            print(f"✅ 시퀀스 모델 로드 성공: {len(labels_ksl_seq)}개 라벨 (max_timesteps={seq_max_timesteps})")
+        
+        # 3. MediaPipe 초기화 (양손 지원, 인스턴스는 요청 시 풀에서 생성)
         mp_hands = mp.solutions.hands
-        hands = mp_hands.Hands(
-            static_image_mode=False,  # 시퀀스 지원을 위해 False
+        hands_pool = HandsPool(
+            mp_hands,
+            HANDS_POOL_SIZE,
             max_num_hands=2,  # 양손 지원
             min_detection_confidence=0.5,
             min_tracking_confidence=0.5
         )
+        sequence_trackers = SessionTrackers(mp_hands, MAX_SEQUENCE_TRACKERS, SEQUENCE_TIMEOUT)
+        print(f"✅ MediaPipe Hands 풀: 모드별 최대 {HANDS_POOL_SIZE}개 (시퀀스 전용 트래커 최대 {MAX_SEQUENCE_TRACKERS}개)")
         
         print("✅ 하이브리드 AI 모델 초기화 성공")
         print(f"   - 정적 모델: {KSL_MODEL_PATH}")
@@ -125,33 +433,28 @@ def initialize_ai_models():
 # 모델 초기화 실행
 model_initialized = initialize_ai_models()
 
-def decode_base64_image(image_data):
-    """Base64 이미지 데이터를 OpenCV 이미지로 변환"""
+def decode_image(image_data):
+    """이미지 입력 → MediaPipe용 RGB 이미지 (긴 변 MAX_IMAGE_SIDE 이하), 실패 시 None
+
+    image_data: Base64 문자열 (data:image/jpeg;base64, 헤더 포함 가능) 또는 이미지 파일 바이트
+    """
     try:
-        # Base64 헤더 제거 (data:image/jpeg;base64, 부분)
-        if ',' in image_data:
-            image_data = image_data.split(',')[1]
-        
-        # Base64 디코딩
-        image_bytes = base64.b64decode(image_data)
-        
-        # PIL Image로 변환
-        pil_image = Image.open(io.BytesIO(image_bytes))
-        
-        # OpenCV 형식으로 변환
-        opencv_image = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+        if isinstance(image_data, (bytes, bytearray, memoryview)):
+            return decode_image_bytes(image_data)
+        return decode_base64(image_data)
         
-        return opencv_image
-        
-    except Exception as e:
+    except ImageTooLarge as e:
         print(f"❌ 이미지 디코딩 실패: {e}")
         return None
 
-def analyze_sign_accuracy(image_data, target_sign, language, user_id=None):
-    """하이브리드 수어 정확도 분석 (정적 + 시퀀스)"""
+def analyze_sign_accuracy(image_data, target_sign, language, user_id=None, landmarks=None):
+    """하이브리드 수어 정확도 분석 (정적 + 시퀀스)
+
+    landmarks: parse_landmarks() 결과를 주면 이미지 디코딩/MediaPipe를 건너뛴다
+    """
     
     # 모델이 초기화되지 않은 경우 폴백
-    if not model_initialized or ksl_model is None:
+    if not model_initialized or static_engine is None:
         print("⚠️ AI 모델이 초기화되지 않음. 폴백 모드 사용")
         return fallback_analysis(target_sign, language)
     
@@ -160,7 +463,7 @@ def analyze_sign_accuracy(image_data, target_sign, language, user_id=None):
         print(f"🔄 시퀀스 사인 감지: {target_sign}")
         
         # 시퀀스 모델이 없으면 에러 반환
-        if ksl_seq_model is None:
+        if seq_engine is None:
             print("❌ 시퀀스 모델 없음 - 학습 필요")
             return {
                 'accuracy': 0.0,
@@ -181,16 +484,32 @@ def analyze_sign_accuracy(image_data, target_sign, language, user_id=None):
                 'error': 'Sequence model not loaded'
             }
         
-        result = analyze_sequence_sign(image_data, target_sign, language, user_id)
+        result = analyze_sequence_sign(image_data, target_sign, language, user_id, landmarks)
         print(f"� 델시퀀스 분석 결과: predicted={result.get('predicted_sign')}, accuracy={result.get('accuracy')}, collecting={result.get('collecting')}")
         return result
     
     # 정적 모델 사용 (기본 자음/모음)
     print(f"📷 정적 모델 사용: {target_sign}")
-    return analyze_static_sign(image_data, target_sign, language)
+    return analyze_static_sign(image_data, target_sign, language, landmarks, user_id=user_id)
+
+def new_sequence_entry(target_sign):
+    """사용자별 시퀀스 버퍼 항목"""
+    return {
+        'buffer': SequenceRingBuffer(seq_max_timesteps, SEQUENCE_FEATURE_DIM),
+        'prev_points': None,  # 직전 프레임 랜드마크 (dx/dy 기준)
+        'gate': MotionGate(seq_max_timesteps),
+        'target': target_sign,
+        'last_update': None,
+        'generation': 0  # 버퍼를 비울 때마다 증가 (락 밖에서 끝난 예측이 비운 뒤의 버퍼에 저장되지 않게)
+    }
+
+def analyze_sequence_sign(image_data, target_sign, language, user_id, landmarks=None):
+    """시퀀스 모델을 사용한 수어 분석 (쌍자음/복합모음)
 
-def analyze_sequence_sign(image_data, target_sign, language, user_id):
-    """시퀀스 모델을 사용한 수어 분석 (쌍자음/복합모음)"""
+    사용자 버퍼 락은 버퍼를 읽고 고치는 동안만 잡는다. 손 랜드마크 추출(MediaPipe)과 모델 추론은 락 밖에서 하고,
+    예측 결과는 짧은 두 번째 트랜잭션으로 저장한다 (같은 락 스트라이프의 다른 사용자, sqlite면 다른 워커가
+    MediaPipe/추론 시간 동안 기다리지 않음).
+    """
     
     print(f"🎬 analyze_sequence_sign 시작: target={target_sign}, user_id={user_id}")
     
@@ -198,231 +517,40 @@ def analyze_sequence_sign(image_data, target_sign, language, user_id):
         if user_id is None:
             user_id = "anonymous"
         
-        # 사용자별 시퀀스 버퍼 초기화
-        if user_id not in sequence_buffers:
-            print(f"🆕 새 버퍼 생성: user_id={user_id}")
-            sequence_buffers[user_id] = {
-                'buffer': deque(maxlen=seq_max_timesteps),
-                'prev_xy': {},
-                'target': target_sign,
-                'last_update': None
-            }
-        
-        user_buffer = sequence_buffers[user_id]
-        
-        # 목표가 바뀌면 버퍼 초기화 (중요!)
-        if user_buffer.get('target') != target_sign:
-            print(f"🔄 목표 변경: {user_buffer.get('target')} → {target_sign}, 버퍼 초기화")
-            user_buffer['buffer'] = deque(maxlen=seq_max_timesteps)  # 새 deque 생성
-            user_buffer['prev_xy'] = {}  # 새 dict 생성
-            user_buffer['target'] = target_sign
-            user_buffer['last_update'] = None
-            print(f"✅ 버퍼 초기화 완료: 크기={len(user_buffer['buffer'])}")
-        
-        # 타임아웃 체크 (5초 동안 업데이트 없으면 버퍼 초기화)
-        import time
-        current_time = time.time()
-        if user_buffer.get('last_update') is not None:
-            time_diff = current_time - user_buffer['last_update']
-            if time_diff > 5.0:
-                print(f"⏰ 타임아웃 ({time_diff:.1f}초) - 버퍼 초기화")
-                user_buffer['buffer'].clear()
-                user_buffer['prev_xy'].clear()
-        
-        user_buffer['last_update'] = current_time
-        # 1. 이미지 디코딩
-        print(f"📸 Step 1: 이미지 디코딩 시작")
-        if not image_data:
-            print("⚠️ image_data 없음")
-            return {
-                'accuracy': 0.0,
-                'confidence': 0.0,
-                'feedback': {
-                    'level': 'error',
-                    'message': '이미지 데이터가 없습니다',
-                    'suggestions': ['카메라를 확인하세요'],
-                    'color': 'red',
-                    'score': 'F'
-                },
-                'hand_detected': False,
-                'target_sign': target_sign,
-                'predicted_sign': None,
-                'is_correct': False,
-                'language': language,
-                'model_type': 'sequence_no_image',
-                'error': 'No image data'
-            }
-        
-        image = decode_base64_image(image_data)
-        if image is None:
-            print("⚠️ 이미지 디코딩 실패")
-            return fallback_analysis(target_sign, language)
-        
-        print(f"✅ 이미지 디코딩 성공: {image.shape}")
-        
-        # 2. 이미지 전처리
-        print(f"🎨 Step 2: 이미지 전처리")
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
-        # 3. MediaPipe로 손 인식
-        print(f"👋 Step 3: MediaPipe 손 인식")
-        results = hands.process(image_rgb)
-        print(f"✅ MediaPipe 처리 완료: 손 감지={results.multi_hand_landmarks is not None}")
-        
-        if not results.multi_hand_landmarks:
-            # 손이 없으면 버퍼 초기화
-            if len(user_buffer['buffer']) > 0:
-                print(f"👋 손 감지 안됨 - 버퍼 초기화 (이전 크기: {len(user_buffer['buffer'])})")
-                user_buffer['buffer'].clear()
-                user_buffer['prev_xy'].clear()
-            return {
-                'accuracy': 0.0,
-                'confidence': 0.0,
-                'feedback': generate_detailed_feedback(0.0, target_sign, language),
-                'hand_detected': False,
-                'target_sign': target_sign,
-                'language': language,
-                'model_type': 'sequence',
-                'buffer_size': 0,
-                'error': '손이 감지되지 않았습니다'
-            }
-        
-        # 4. 손 랜드마크 추출 (wrist, index_tip만 사용)
-        hand_landmarks = results.multi_hand_landmarks[0]
-        lms = hand_landmarks.landmark
-        
-        # 사용할 랜드마크 (capture_sequence.py와 동일)
-        USE_LANDMARKS = {0: "wrist", 8: "index_tip"}
-        
-        frame_features = []
-        spd_sum_total = 0.0
-        
-        # 속도 계산
-        for lm_id in USE_LANDMARKS.keys():
-            lm = lms[lm_id]
-            x, y = float(lm.x), float(lm.y)
-            
-            dx = dy = 0.0
-            if lm_id in user_buffer['prev_xy']:
-                dx = x - user_buffer['prev_xy'][lm_id][0]
-                dy = y - user_buffer['prev_xy'][lm_id][1]
-            
-            spd = abs(dx) + abs(dy)
-            spd_sum_total += spd
-            user_buffer['prev_xy'][lm_id] = (x, y)
-        
-        # 특징 벡터 생성
-        for lm_id in USE_LANDMARKS.keys():
-            lm = lms[lm_id]
-            x, y = float(lm.x), float(lm.y)
-            
-            dx = dy = 0.0
-            if lm_id in user_buffer['prev_xy']:
-                prev_x, prev_y = user_buffer['prev_xy'][lm_id]
-                dx = x - prev_x
-                dy = y - prev_y
-            
-            frame_features.extend([x, y, dx, dy, spd_sum_total])
-        
-        # 버퍼에 추가
-        user_buffer['buffer'].append(frame_features)
-        
-        # 충분한 프레임이 모이면 예측
-        buffer_size = len(user_buffer['buffer'])
-        min_frames = 5  # 최소 5프레임 (더 안정적인 인식)
-        
-        print(f"🔢 버퍼 상태: {buffer_size}/{seq_max_timesteps} 프레임 (최소: {min_frames}, 목표: {target_sign})")
-        
-        if buffer_size < min_frames:
-            # 프레임 수집 중
-            progress_ratio = buffer_size / min_frames
-            collecting_accuracy = 50 + (progress_ratio * 30)  # 50~80%
-            
-            return {
-                'accuracy': collecting_accuracy,
-                'confidence': 0.5,
-                'feedback': {
-                    'level': 'collecting',
-                    'message': f'"{target_sign}" 동작을 수집 중입니다... ({buffer_size}/{min_frames})',
-                    'suggestions': [
-                        '천천히 동작을 계속하세요',
-                        '손을 카메라에 잘 보이게 유지하세요',
-                        f'진행률: {int(progress_ratio * 100)}%'
-                    ],
-                    'color': 'blue',
-                    'score': '-'
-                },
-                'hand_detected': True,
-                'target_sign': target_sign,
-                'predicted_sign': None,
-                'is_correct': False,
-                'language': language,
-                'model_type': 'sequence',
-                'buffer_size': buffer_size,
-                'collecting': True,
-                'progress': int(progress_ratio * 100)
-            }
-        
-        # 5. 시퀀스 패딩 및 정규화
-        feature_dim = len(frame_features)
-        seq_array = np.zeros((1, seq_max_timesteps, feature_dim), dtype=np.float32)
-        seq_len = len(user_buffer['buffer'])
-        seq_array[0, :seq_len, :] = list(user_buffer['buffer'])
-        
-        # 정규화 적용
-        if seq_norm_mean is not None and seq_norm_std is not None:
-            seq_array = (seq_array - seq_norm_mean) / seq_norm_std
-            print(f"✅ 정규화 적용 완료")
-        else:
-            print("⚠️ 정규화 통계 없음 - 정규화 없이 예측")
-        
-        # 6. AI 모델 예측
-        prediction = ksl_seq_model.predict(seq_array, verbose=0)
-        
-        # 7. 결과 분석
-        predicted_idx = np.argmax(prediction)
-        confidence_score = float(np.max(prediction))
-        
-        if 0 <= predicted_idx < len(labels_ksl_seq):
-            predicted_sign = labels_ksl_seq[predicted_idx]
+        # 1~3. 손 랜드마크 (사용자 전용 트래커/프레임 건너뛰기는 각자 락이 있어 버퍼 락 밖에서 처리)
+        reused = False
+        if landmarks is not None:
+            # 클라이언트가 보낸 랜드마크 사용 (이미지 디코딩/MediaPipe 생략)
+            hand_landmarks = landmarks if len(landmarks) else None
         else:
-            predicted_sign = "UNKNOWN"
-        
-        # 8. 정확도 계산
-        is_correct = predicted_sign == target_sign
-        
-        # 정확도 계산 (엄격하게)
-        if is_correct:
-            accuracy = confidence_score * 100
-        else:
-            # 틀렸으면 낮은 점수
-            accuracy = confidence_score * 50
-        
-        # 9. 피드백 생성
-        feedback = generate_detailed_feedback(accuracy, target_sign, language)
-        
-        # 틀렸을 때 메시지
-        if not is_correct:
-            feedback['message'] = f'"{predicted_sign}"이(가) 인식되었습니다. "{target_sign}"을(를) 다시 시도하세요'
-            feedback['suggestions'] = [
-                f'예측: {predicted_sign} ≠ 목표: {target_sign}',
-                '동작을 천천히 정확하게 수행하세요',
-                '참고 영상을 다시 확인하세요'
-            ]
-        
-        return {
-            'accuracy': round(accuracy, 1),
-            'confidence': round(confidence_score, 2),
-            'feedback': feedback,
-            'hand_detected': True,
-            'target_sign': target_sign,
-            'predicted_sign': predicted_sign,
-            'is_correct': is_correct,
-            'language': language,
-            'model_type': 'sequence',
-            'buffer_size': buffer_size
-        }
-        
+            hand_landmarks, reused, error_result = extract_sequence_landmarks(image_data, target_sign, language, user_id)
+            if error_result is not None:
+                return error_result
+        
+        # 4~6. 사용자별 시퀀스 버퍼 갱신 (짧은 트랜잭션, sqlite 상태 백엔드면 끝날 때 저장)
+        with sequence_buffers.transaction(user_id, lambda: new_sequence_entry(target_sign)) as record:
+            if record.created:
+                print(f"🆕 새 버퍼 생성: user_id={user_id}")
+            result, seq_input, generation = update_sequence_buffer(record.value, hand_landmarks, target_sign, language, reused)
+        if seq_input is None:
+            return result
+        
+        # AI 모델 예측 (락 밖에서, 요청 간 배치), 입력은 버퍼 모델 입력의 복사본이라 그 자리에서 정규화
+        predicted_sign, confidence_score, _ = classify_with(seq_engine, seq_batcher, seq_input, out=seq_input)
+        
+        # 예측 결과를 모션 게이트에 저장 (그 사이 버퍼가 비워졌거나 제거됐으면 버림)
+        with sequence_buffers.transaction(user_id) as record:
+            if record.value is not None and record.value.get('generation', 0) == generation:
+                record.value['gate'].store((predicted_sign, confidence_score))
+        
+        # 7~9. 결과 분석, 정확도 계산, 피드백 생성
+        prediction = score_sequence_prediction(predicted_sign, confidence_score, target_sign, language)
+        prediction['buffer_size'] = result['buffer_size']
+        prediction['cached'] = False
+        return prediction
+        
+    except InferenceFailed:
+        raise  # 라우트가 503으로 응답 (무작위 폴백 점수 없음)
     except Exception as e:
         print(f"❌ 시퀀스 분석 중 오류: {e}")
         import traceback
@@ -434,27 +562,286 @@ def analyze_sequence_sign(image_data, target_sign, language, user_id):
         fallback_result['error_type'] = 'sequence_analysis_error'
         return fallback_result
 
-def analyze_static_sign(image_data, target_sign, language):
-    """정적 모델을 사용한 수어 분석 (기본 자음/모음)"""
+def extract_sequence_landmarks(image_data, target_sign, language, user_id):
+    """이미지 → (첫 번째 손 랜드마크 또는 None, 이전 랜드마크 재사용 여부, 오류 응답 또는 None)"""
+    # 1. 이미지 디코딩
+    print(f"📸 Step 1: 이미지 디코딩 시작")
+    if not image_data:
+        print("⚠️ image_data 없음")
+        return None, False, {
+            'accuracy': 0.0,
+            'confidence': 0.0,
+            'feedback': {
+                'level': 'error',
+                'message': '이미지 데이터가 없습니다',
+                'suggestions': ['카메라를 확인하세요'],
+                'color': 'red',
+                'score': 'F'
+            },
+            'hand_detected': False,
+            'target_sign': target_sign,
+            'predicted_sign': None,
+            'is_correct': False,
+            'language': language,
+            'model_type': 'sequence_no_image',
+            'error': 'No image data'
+        }
     
-    try:
-        # 1. 이미지 디코딩
-        if not image_data:
-            print("⚠️ 이미지 데이터 없음")
-            return fallback_analysis(target_sign, language)
-        
-        image = decode_base64_image(image_data)
-        if image is None:
-            print("⚠️ 이미지 디코딩 실패")
-            return fallback_analysis(target_sign, language)
-        
-        # 2. 이미지 전처리
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    image_rgb = decode_image(image_data)  # 2. 전처리 (RGB, 축소) 포함
+    if image_rgb is None:
+        print("⚠️ 이미지 디코딩 실패")
+        return None, False, fallback_analysis(target_sign, language)
+    
+    print(f"✅ 이미지 디코딩 성공: {image_rgb.shape}")
+    
+    # 3. MediaPipe로 손 인식 (직전 프레임과 거의 같으면 이전 랜드마크 재사용)
+    skipper = sequence_skippers.get(user_id)
+    skip_entry = skipper.check(image_rgb)
+    if skip_entry is not None:
+        hand_landmarks = skip_entry['landmarks']
+        print(f"⏭️ 장면 변화 없음 - 이전 랜드마크 재사용 (손 감지={hand_landmarks is not None})")
+    else:
+        print(f"👋 Step 3: MediaPipe 손 인식")
+        results = sequence_trackers.process(user_id, image_rgb)  # 사용자 전용 트래커 (프레임 간 추적)
+        print(f"✅ MediaPipe 처리 완료: 손 감지={results.multi_hand_landmarks is not None}")
+        hand_landmarks = results.multi_hand_landmarks[0] if results.multi_hand_landmarks else None
+        skipper.store({'landmarks': hand_landmarks})
+    return hand_landmarks, skip_entry is not None, None
+
+def clear_sequence_entry(user_buffer):
+    """버퍼/직전 랜드마크/모션 게이트 비우기"""
+    user_buffer['buffer'].clear()
+    user_buffer['prev_points'] = None
+    user_buffer['gate'].reset()
+    user_buffer['generation'] = user_buffer.get('generation', 0) + 1
+
+def update_sequence_buffer(user_buffer, hand_landmarks, target_sign, language, reused=False):
+    """프레임 1개를 사용자 시퀀스 버퍼에 넣기 (analyze_sequence_sign이 사용자 락을 잡고 호출)
+
+    reused: 장면 변화가 없어 직전 랜드마크를 재사용한 프레임 → 같은 랜드마크를 버퍼/모션 게이트에 다시 넣지 않음
+    (dx/dy가 0인 중복 프레임이 시퀀스를 늘리지 않게), 버퍼 상태 그대로 수집 중/이전 결과를 돌려준다.
+    → (응답, 모델 입력 복사본 또는 None, 버퍼 세대). 모델 입력이 None이 아니면 호출자가 락 밖에서 추론한다.
+    """
+    # 목표가 바뀌면 버퍼 초기화 (중요!)
+    if user_buffer.get('target') != target_sign:
+        print(f"🔄 목표 변경: {user_buffer.get('target')} → {target_sign}, 버퍼 초기화")
+        clear_sequence_entry(user_buffer)
+        user_buffer['target'] = target_sign
+        user_buffer['last_update'] = None
+        print(f"✅ 버퍼 초기화 완료: 크기={len(user_buffer['buffer'])}")
+    
+    # 타임아웃 체크 (5초 동안 업데이트 없으면 버퍼 초기화)
+    current_time = time.time()
+    if user_buffer.get('last_update') is not None:
+        time_diff = current_time - user_buffer['last_update']
+        if time_diff > SEQUENCE_TIMEOUT:
+            print(f"⏰ 타임아웃 ({time_diff:.1f}초) - 버퍼 초기화")
+            clear_sequence_entry(user_buffer)
+    
+    user_buffer['last_update'] = current_time
+    
+    if hand_landmarks is None:
+        # 손이 없으면 버퍼 초기화
+        if len(user_buffer['buffer']) > 0:
+            print(f"👋 손 감지 안됨 - 버퍼 초기화 (이전 크기: {len(user_buffer['buffer'])})")
+            clear_sequence_entry(user_buffer)
+        return {
+            'accuracy': 0.0,
+            'confidence': 0.0,
+            'feedback': generate_detailed_feedback(0.0, target_sign, language),
+            'hand_detected': False,
+            'target_sign': target_sign,
+            'language': language,
+            'model_type': 'sequence',
+            'buffer_size': 0,
+            'error': '손이 감지되지 않았습니다'
+        }, None, None
+    
+    # 4. 손 랜드마크 → 시퀀스 특징 (api/features.py, 학습 데이터와 같은 계산), 링 버퍼의 다음 행에 바로 기록
+    if not reused:
+        points = landmark_points(hand_landmarks)
+        frame_features = user_buffer['buffer'].push()
+        sequence_features(points[None], user_buffer.get('prev_points'), out=frame_features[None])
+        user_buffer['prev_points'] = points
+        
+        frame_columns = frame_features.reshape(len(SEQUENCE_LANDMARKS), -1)
+        deltas = {lm_id: (float(dx), float(dy)) for lm_id, (dx, dy) in zip(SEQUENCE_LANDMARKS, frame_columns[:, 2:4])}
+        user_buffer['gate'].push(motion_energy(deltas))
+    
+    # 충분한 프레임이 모이면 예측
+    buffer_size = len(user_buffer['buffer'])
+    min_frames = 5  # 최소 5프레임 (더 안정적인 인식)
+    
+    print(f"🔢 버퍼 상태: {buffer_size}/{seq_max_timesteps} 프레임 (최소: {min_frames}, 목표: {target_sign})")
+    
+    if buffer_size < min_frames:
+        # 프레임 수집 중
+        progress_ratio = buffer_size / min_frames
+        collecting_accuracy = 50 + (progress_ratio * 30)  # 50~80%
         
-        # 3. MediaPipe로 손 인식
-        results = hands.process(image_rgb)
+        return {
+            'accuracy': collecting_accuracy,
+            'confidence': 0.5,
+            'feedback': {
+                'level': 'collecting',
+                'message': f'"{target_sign}" 동작을 수집 중입니다... ({buffer_size}/{min_frames})',
+                'suggestions': [
+                    '천천히 동작을 계속하세요',
+                    '손을 카메라에 잘 보이게 유지하세요',
+                    f'진행률: {int(progress_ratio * 100)}%'
+                ],
+                'color': 'blue',
+                'score': '-'
+            },
+            'hand_detected': True,
+            'target_sign': target_sign,
+            'predicted_sign': None,
+            'is_correct': False,
+            'language': language,
+            'model_type': 'sequence',
+            'buffer_size': buffer_size,
+            'collecting': True,
+            'progress': int(progress_ratio * 100)
+        }, None, None
+    
+    # 5~6. 모션 게이트: 동작이 충분히 쌓였거나 버퍼가 새 프레임으로 찼을 때만 모델 실행
+    gate = user_buffer['gate']
+    if not gate.should_run():
+        predicted_sign, confidence_score = gate.reuse()
+        result = score_sequence_prediction(predicted_sign, confidence_score, target_sign, language)
+        result['buffer_size'] = buffer_size
+        result['cached'] = True
+        return result, None, None
+    
+    # 시퀀스 패딩 (버퍼의 모델 입력 배열을 다시 채움) → 락을 놓은 뒤에도 바뀌지 않게 복사해서 넘김
+    return {'buffer_size': buffer_size}, user_buffer['buffer'].model_input().copy(), user_buffer.get('generation', 0)
+
+def score_sequence_prediction(predicted_sign, confidence_score, target_sign, language):
+    """시퀀스 모델 예측 → 정확도/피드백 응답"""
+    # 7. 결과 분석
+    if predicted_sign is None:
+        predicted_sign = "UNKNOWN"
+    
+    # 8. 정확도 계산
+    is_correct = predicted_sign == target_sign
+    
+    # 정확도 계산 (엄격하게)
+    if is_correct:
+        accuracy = confidence_score * 100
+    else:
+        # 틀렸으면 낮은 점수
+        accuracy = confidence_score * 50
+    
+    # 9. 피드백 생성
+    feedback = generate_detailed_feedback(accuracy, target_sign, language)
+    
+    # 틀렸을 때 메시지
+    if not is_correct:
+        feedback['message'] = f'"{predicted_sign}"이(가) 인식되었습니다. "{target_sign}"을(를) 다시 시도하세요'
+        feedback['suggestions'] = [
+            f'예측: {predicted_sign} ≠ 목표: {target_sign}',
+            '동작을 천천히 정확하게 수행하세요',
+            '참고 영상을 다시 확인하세요'
+        ]
+    
+    return {
+        'accuracy': round(accuracy, 1),
+        'confidence': round(confidence_score, 2),
+        'feedback': feedback,
+        'hand_detected': True,
+        'target_sign': target_sign,
+        'predicted_sign': predicted_sign,
+        'is_correct': is_correct,
+        'language': language,
+        'model_type': 'sequence'
+    }
+
+def parse_landmark_clip(value):
+    """클라이언트가 보낸 랜드마크 시퀀스 → (T, 21, 2) float32 배열
+
+    프레임마다 parse_landmarks() 형식이며, 손이 없는 프레임(빈 배열/null)은 건너뛴다
+    (capture_sequence.py도 손이 없는 프레임은 기록하지 않음).
+    """
+    if not isinstance(value, list):
+        raise ValueError('landmarks는 프레임별 랜드마크 목록이어야 합니다')
+    if not all(frame is None or isinstance(frame, list) for frame in value):
+        raise ValueError('landmarks의 각 프레임은 랜드마크 배열(또는 null)이어야 합니다')
+    frames = [parse_landmarks(frame) for frame in value]
+    frames = [frame for frame in frames if len(frame)]
+    if not frames:
+        return np.empty((0, 21, 2), dtype=np.float32)
+    return np.stack(frames)
+
+def analyze_sequence_clip(points, target_sign, language):
+    """동작 전체(클립)를 한 번에 분석 (사용자별 버퍼 없이 시퀀스 모델 1회 추론)"""
+    min_frames = 5
+    if len(points) < min_frames:
+        return {
+            'accuracy': 0.0,
+            'confidence': 0.0,
+            'feedback': {
+                'level': 'error',
+                'message': f'손이 감지된 프레임이 부족합니다 ({len(points)}/{min_frames})',
+                'suggestions': ['손을 카메라에 잘 보이게 유지하세요', '동작을 조금 더 길게 녹화하세요'],
+                'color': 'red',
+                'score': 'F'
+            },
+            'hand_detected': len(points) > 0,
+            'target_sign': target_sign,
+            'predicted_sign': None,
+            'is_correct': False,
+            'language': language,
+            'model_type': 'sequence_clip',
+            'frame_count': len(points)
+        }
+    
+    # 학습 시퀀스 길이를 넘으면 마지막 프레임들만 사용, 짧으면 뒤를 0으로 패딩
+    points = points[-seq_max_timesteps:]
+    features = sequence_features(points)
+    seq_array = np.zeros((seq_max_timesteps, features.shape[1]), dtype=np.float32)
+    seq_array[:len(features)] = features
+    
+    predicted_sign, confidence_score, _ = classify_with(seq_engine, seq_batcher, seq_array)
+    result = score_sequence_prediction(predicted_sign, confidence_score, target_sign, language)
+    result['model_type'] = 'sequence_clip'
+    result['frame_count'] = len(points)
+    return result
+
+def analyze_static_sign(image_data, target_sign, language, landmarks=None, user_id=None):
+    """정적 모델을 사용한 수어 분석 (기본 자음/모음)
+
+    user_id가 있으면 직전 요청 이미지와 장면이 거의 같을 때 MediaPipe/모델 결과를 재사용한다 (frame_skip)
+    """
+    
+    try:
+        skip_entry = None
+        skipper = None
+        if landmarks is not None:
+            # 클라이언트가 보낸 랜드마크 사용 (이미지 디코딩/MediaPipe 생략)
+            hand_landmarks = landmarks if len(landmarks) else None
+        else:
+            # 1. 이미지 디코딩
+            if not image_data:
+                print("⚠️ 이미지 데이터 없음")
+                return fallback_analysis(target_sign, language)
+            
+            image_rgb = decode_image(image_data)  # 2. 전처리 (RGB, 축소) 포함
+            if image_rgb is None:
+                print("⚠️ 이미지 디코딩 실패")
+                return fallback_analysis(target_sign, language)
+            
+            # 3. MediaPipe로 손 인식 (직전 요청과 장면이 거의 같으면 이전 결과 재사용)
+            skipper = static_skippers.get(user_id) if user_id is not None else None
+            skip_entry = skipper.check(image_rgb) if skipper else None
+            if skip_entry is not None:
+                hand_landmarks = skip_entry['landmarks']
+            else:
+                results = hands_pool.process(image_rgb, 'image')
+                hand_landmarks = results.multi_hand_landmarks[0] if results.multi_hand_landmarks else None
+                if hand_landmarks is None and skipper:
+                    skipper.store({'landmarks': None, 'prediction': None})
         
-        if not results.multi_hand_landmarks:
+        if hand_landmarks is None:
             return {
                 'accuracy': 0.0,
                 'confidence': 0.0,
@@ -465,27 +852,16 @@ def analyze_static_sign(image_data, target_sign, language):
                 'error': '손이 감지되지 않았습니다'
             }
         
-        # 4. 손 랜드마크 추출
-        hand_landmarks = results.multi_hand_landmarks[0]
-        coords = []
-        for landmark in hand_landmarks.landmark:
-            coords.extend([landmark.x, landmark.y])
-        
-        # 5. 정규화 적용 (학습 시와 동일하게)
-        input_data = np.array(coords, dtype=np.float32).reshape(1, -1)
-        if ksl_norm_mean is not None and ksl_norm_std is not None:
-            input_data = (input_data - ksl_norm_mean) / ksl_norm_std
-        
-        # 6. AI 모델 예측 (H5 모델)
-        prediction = ksl_model.predict(input_data, verbose=0)
+        if skip_entry is not None:
+            predicted_sign, confidence_score = skip_entry['prediction']
+        else:
+            # 4. 손 랜드마크 → 5. 정규화 → 6. AI 모델 예측 (추론 엔진, 요청 간 배치)
+            predicted_sign, confidence_score, _ = classify_with(static_engine, static_batcher, hand_landmarks)
+            if landmarks is None and skipper:
+                skipper.store({'landmarks': hand_landmarks, 'prediction': (predicted_sign, confidence_score)})
         
         # 7. 결과 분석
-        predicted_idx = np.argmax(prediction)
-        confidence_score = float(np.max(prediction))
-        
-        if 0 <= predicted_idx < len(labels_ksl):
-            predicted_sign = labels_ksl[predicted_idx]
-        else:
+        if predicted_sign is None:
             predicted_sign = "UNKNOWN"
         
         # 8. 쌍자음 처리 로직
@@ -545,6 +921,8 @@ def analyze_static_sign(image_data, target_sign, language):
             'language': language
         }
         
+    except InferenceFailed:
+        raise  # 라우트가 503으로 응답 (무작위 폴백 점수 없음)
     except Exception as e:
         print(f"❌ AI 분석 중 오류: {e}")
         return fallback_analysis(target_sign, language)
@@ -638,31 +1016,84 @@ def generate_detailed_feedback(accuracy, target_sign, language):
             'score': 'C'
         }
 
+# ===== 요청 본문 파싱 =====
+# 이미지 API는 세 가지 형식을 받는다.
+#   - application/json: {"image_data": "<Base64>", "target_sign": ..., "language": ...} (기존 클라이언트)
+#   - multipart/form-data: image 파일 필드 + target_sign, language 폼 필드
+#   - image/jpeg 등 이미지 본문: 메타데이터는 X-Target-Sign, X-Language 헤더(URL 인코딩) 또는 쿼리 파라미터
+# 바이너리 형식은 Base64(+33%)와 JSON 파싱 없이 바이트를 그대로 디코더에 넘긴다.
+META_HEADERS = {'target_sign': 'X-Target-Sign', 'language': 'X-Language'}
+# multipart 본문에서 이미지 외 부분(경계 문자열, 파트 헤더, 폼 필드)에 허용하는 크기
+MULTIPART_OVERHEAD = 64 * 1024
+
+class RequestTooLarge(Exception):
+    """이미지 본문이 MAX_IMAGE_BYTES를 넘는 경우 (413)"""
+
+class BadImageRequest(Exception):
+    """요청 본문 형식 오류 (JSON 객체가 아님 등, 400)"""
+
+def read_image_request():
+    """현재 요청 → (메타데이터 dict, 이미지 입력: Base64 문자열 또는 이미지 바이트)"""
+    if request.mimetype == 'multipart/form-data':
+        # 폼 파싱(임시 파일 기록) 전에 본문 크기 확인
+        if request.content_length is not None and request.content_length > MAX_IMAGE_BYTES + MULTIPART_OVERHEAD:
+            raise RequestTooLarge()
+        data = request.form.to_dict()
+        file = request.files.get('image')
+        image_data = file.read(MAX_IMAGE_BYTES + 1) if file else data.get('image_data', '')
+    elif request.mimetype.startswith('image/') or request.mimetype == 'application/octet-stream':
+        if request.content_length is not None and request.content_length > MAX_IMAGE_BYTES:
+            raise RequestTooLarge()
+        data = request.args.to_dict()
+        for field, header in META_HEADERS.items():
+            if request.headers.get(header):
+                data[field] = unquote(request.headers[header])
+        image_data = request.get_data(cache=False)
+    else:
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            raise BadImageRequest('JSON 객체 본문이 필요합니다.')
+        image_data = data.get('image_data') or ''
+        if not isinstance(image_data, str):
+            raise BadImageRequest('image_data는 Base64 문자열이어야 합니다.')
+        return data, image_data
+    if len(image_data) > MAX_IMAGE_BYTES:
+        raise RequestTooLarge()
+    return data, image_data
+
+def inference_failed_response(e):
+    """추론 기한 초과/실패 → 503 (부하로 버려진 요청에 폴백 점수를 주지 않음)"""
+    return jsonify({
+        'error': str(e),
+        'error_type': 'inference_deadline' if isinstance(e, InferenceDeadlineExceeded) else 'inference_error',
+        'model_available': True
+    }), 503
+
 # ===== 실시간 수어 인식 API =====
 
 @recognition_bp.route('/api/recognition/real-time', methods=['POST'])
 @jwt_required()
 def real_time_recognition():
-    """실시간 수어 인식 (단일 이미지)"""
+    """실시간 수어 인식 (단일 이미지: JSON, multipart 또는 이미지 본문)"""
     try:
         user_id = get_jwt_identity()
-        data = request.get_json()
+        data, image_data = read_image_request()
         
         # 필수 데이터 확인
-        if not data.get('image_data'):
+        if not image_data:
             return jsonify({'error': '이미지 데이터가 필요합니다.'}), 400
         
         language = data.get('language', 'ksl')
         
         # 모델이 초기화되지 않은 경우
-        if not model_initialized or ksl_model is None:
+        if not model_initialized or static_engine is None:
             return jsonify({
                 'error': 'AI 모델이 초기화되지 않았습니다.',
                 'model_available': False
             }), 503
         
         # 이미지 처리 및 인식
-        result = recognize_sign_from_image(data['image_data'], language)
+        result = recognize_sign_from_image(image_data, language)
         
         return jsonify({
             'recognition_result': result,
@@ -670,29 +1101,36 @@ def real_time_recognition():
             'model_available': True
         }), 200
         
+    except InferenceFailed as e:
+        return inference_failed_response(e)
+    except RequestTooLarge:
+        return jsonify({'error': f'이미지가 너무 큽니다. (최대 {MAX_IMAGE_BYTES} bytes)'}), 413
+    except BadImageRequest as e:
+        return jsonify({'error': str(e)}), 400
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-def recognize_sign_from_image(image_data, language):
-    """이미지에서 수어 인식"""
+def recognize_sign_from_image(image_data, language, landmarks=None):
+    """이미지에서 수어 인식 (landmarks를 주면 이미지 대신 사용)"""
     try:
-        # 1. 이미지 디코딩
-        image = decode_base64_image(image_data)
-        if image is None:
-            return {
-                'recognized_sign': None,
-                'confidence': 0.0,
-                'hand_detected': False,
-                'error': '이미지 디코딩 실패'
-            }
-        
-        # 2. 이미지 전처리
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
-        # 3. MediaPipe로 손 인식
-        results = hands.process(image_rgb)
+        if landmarks is not None:
+            hand_landmarks = landmarks if len(landmarks) else None
+        else:
+            # 1. 이미지 디코딩
+            image_rgb = decode_image(image_data)  # 2. 전처리 (RGB, 축소) 포함
+            if image_rgb is None:
+                return {
+                    'recognized_sign': None,
+                    'confidence': 0.0,
+                    'hand_detected': False,
+                    'error': '이미지 디코딩 실패'
+                }
+            
+            # 3. MediaPipe로 손 인식
+            results = hands_pool.process(image_rgb, 'image')
+            hand_landmarks = results.multi_hand_landmarks[0] if results.multi_hand_landmarks else None
         
-        if not results.multi_hand_landmarks:
+        if hand_landmarks is None:
             return {
                 'recognized_sign': None,
                 'confidence': 0.0,
@@ -700,37 +1138,24 @@ def recognize_sign_from_image(image_data, language):
                 'error': '손이 감지되지 않음'
             }
         
-        # 4. 손 랜드마크 추출
-        hand_landmarks = results.multi_hand_landmarks[0]
-        coords = []
-        for landmark in hand_landmarks.landmark:
-            coords.extend([landmark.x, landmark.y])
-        
-        # 5. 정규화 적용 (학습 시와 동일하게)
-        input_data = np.array(coords, dtype=np.float32).reshape(1, -1)
-        if ksl_norm_mean is not None and ksl_norm_std is not None:
-            input_data = (input_data - ksl_norm_mean) / ksl_norm_std
-        
-        # 6. AI 모델 예측 (H5 모델)
-        prediction = ksl_model.predict(input_data, verbose=0)
+        # 4. 손 랜드마크 → 5. 정규화 → 6. AI 모델 예측 (추론 엔진, 요청 간 배치)
+        recognized_sign, confidence_score, probs = classify_with(static_engine, static_batcher, hand_landmarks)
         
         # 7. 결과 분석
-        predicted_idx = np.argmax(prediction)
-        confidence_score = float(np.max(prediction))
-        
-        if 0 <= predicted_idx < len(labels_ksl):
-            recognized_sign = labels_ksl[predicted_idx]
-        else:
+        predicted_idx = int(np.argmax(probs))
+        if recognized_sign is None:
             recognized_sign = "UNKNOWN"
         
         return {
             'recognized_sign': recognized_sign,
             'confidence': round(confidence_score, 3),
             'hand_detected': True,
-            'prediction_index': int(predicted_idx),
-            'all_predictions': prediction.tolist()
+            'prediction_index': predicted_idx,
+            'all_predictions': [probs.tolist()]
         }
         
+    except InferenceFailed:
+        raise
     except Exception as e:
         return {
             'recognized_sign': None,
@@ -744,10 +1169,10 @@ def recognize_sign_from_image(image_data, language):
 @recognition_bp.route('/api/recognition/analyze-hand', methods=['POST'])
 @jwt_required()
 def analyze_hand_shape():
-    """손모양 분석 및 정확도 측정 (하이브리드)"""
+    """손모양 분석 및 정확도 측정 (하이브리드, JSON/multipart/이미지 본문)"""
     try:
         user_id = get_jwt_identity()
-        data = request.get_json()
+        data, image_data = read_image_request()
         
         # 필수 데이터 확인
         required_fields = ['target_sign', 'language']
@@ -758,36 +1183,29 @@ def analyze_hand_shape():
         target_sign = data['target_sign']
         language = data['language']
         
-        # 이미지 데이터 가져오기 (프론트엔드에서 보내거나, 캐시에서 가져오기)
-        image_data = data.get('image_data', '')
-        
-        # 이미지 데이터가 없으면 파일에서 프레임 로드
+        # 이미지 데이터: 프론트엔드에서 보내거나, 없으면 카메라 스트림의 최신 프레임 사용
+        landmarks = None
+        snapshot = None
         if not image_data:
-            import tempfile
-            import base64
-            
-            frame_path = os.path.join(tempfile.gettempdir(), f'ksl_frame_{language}.jpg')
-            
-            if os.path.exists(frame_path):
-                # 파일에서 이미지 읽기
-                frame = cv2.imread(frame_path)
-                if frame is not None:
-                    # Base64로 인코딩
-                    _, buffer = cv2.imencode('.jpg', frame)
-                    image_data = 'data:image/jpeg;base64,' + base64.b64encode(buffer).decode('utf-8')
-                    print(f"📸 파일에서 프레임 로드: {frame.shape}")
-                else:
-                    print(f"⚠️ 프레임 파일 읽기 실패: {frame_path}")
+            snapshot = get_slot(language).latest(max_age=STREAM_FRAME_MAX_AGE)
+            if snapshot is not None:
+                # 스트림이 이미 추출한 랜드마크 사용 (디코딩/MediaPipe 재실행 없음)
+                landmarks = snapshot.landmarks if snapshot.landmarks is not None else np.empty((0, 2), dtype=np.float32)
+                print(f"📸 스트림 프레임 사용: #{snapshot.seq} (손 감지={snapshot.landmarks is not None})")
             else:
-                print(f"⚠️ 프레임 파일 없음: {frame_path}")
+                print(f"⚠️ 스트림 프레임 없음: {language}")
         
         # 손모양 분석 수행 (하이브리드)
         analysis_result = analyze_sign_accuracy(
             image_data,
             target_sign,
             language,
-            user_id=user_id
+            user_id=user_id,
+            landmarks=landmarks
         )
+        if snapshot is not None:
+            analysis_result['frame_seq'] = snapshot.seq
+            analysis_result['frame_age_ms'] = round((time.time() - snapshot.timestamp) * 1000, 1)
         
         # 모델 타입 결정
         model_type = 'sequence' if target_sign in SEQUENCE_SIGNS else 'static'
@@ -799,6 +1217,173 @@ def analyze_hand_shape():
             'is_sequence_sign': target_sign in SEQUENCE_SIGNS
         }), 200
         
+    except InferenceFailed as e:
+        return inference_failed_response(e)
+    except RequestTooLarge:
+        return jsonify({'error': f'이미지가 너무 큽니다. (최대 {MAX_IMAGE_BYTES} bytes)'}), 413
+    except BadImageRequest as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+# ===== 랜드마크 입력 API =====
+# 클라이언트(모바일 온디바이스 MediaPipe 등)가 뽑은 손 랜드마크 21x(x, y)를 직접 받는다.
+# 이미지 디코딩/MediaPipe를 건너뛰고 이미지 API와 같은 정규화, 정적/시퀀스 분기, 피드백을 사용한다.
+# 손이 감지되지 않았으면 landmarks를 빈 배열(또는 null)로 보낸다.
+
+@recognition_bp.route('/api/recognition/landmarks/real-time', methods=['POST'])
+@jwt_required()
+def real_time_recognition_landmarks():
+    """실시간 수어 인식 (랜드마크 입력)"""
+    try:
+        data = request.get_json()
+        
+        if 'landmarks' not in data:
+            return jsonify({'error': 'landmarks가 필요합니다.'}), 400
+        
+        try:
+            landmarks = parse_landmarks(data['landmarks'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        language = data.get('language', 'ksl')
+        
+        # 모델이 초기화되지 않은 경우
+        if not model_initialized or static_engine is None:
+            return jsonify({
+                'error': 'AI 모델이 초기화되지 않았습니다.',
+                'model_available': False
+            }), 503
+        
+        result = recognize_sign_from_image(None, language, landmarks=landmarks)
+        
+        return jsonify({
+            'recognition_result': result,
+            'timestamp': datetime.utcnow().isoformat(),
+            'model_available': True
+        }), 200
+        
+    except InferenceFailed as e:
+        return inference_failed_response(e)
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+@recognition_bp.route('/api/recognition/landmarks/analyze-hand', methods=['POST'])
+@jwt_required()
+def analyze_hand_shape_landmarks():
+    """손모양 분석 및 정확도 측정 (랜드마크 입력, 하이브리드)"""
+    try:
+        user_id = get_jwt_identity()
+        data = request.get_json()
+        
+        # 필수 데이터 확인
+        required_fields = ['target_sign', 'language']
+        for field in required_fields:
+            if not data.get(field):
+                return jsonify({'error': f'{field}는 필수입니다.'}), 400
+        if 'landmarks' not in data:
+            return jsonify({'error': 'landmarks가 필요합니다.'}), 400
+        
+        try:
+            landmarks = parse_landmarks(data['landmarks'])
+        except ValueError as e:
+            return jsonify({'error': str(e)}), 400
+        
+        target_sign = data['target_sign']
+        
+        analysis_result = analyze_sign_accuracy(
+            None,
+            target_sign,
+            data['language'],
+            user_id=user_id,
+            landmarks=landmarks
+        )
+        
+        return jsonify({
+            'analysis': analysis_result,
+            'message': '손모양 분석이 완료되었습니다.',
+            'model_type': 'sequence' if target_sign in SEQUENCE_SIGNS else 'static',
+            'is_sequence_sign': target_sign in SEQUENCE_SIGNS
+        }), 200
+        
+    except InferenceFailed as e:
+        return inference_failed_response(e)
+    except Exception as e:
+        import traceback
+        traceback.print_exc()
+        return jsonify({'error': str(e)}), 500
+
+# ===== 시퀀스 클립 API =====
+# 쌍자음/복합모음 동작 전체를 요청 한 번으로 보낸다 (200ms마다 프레임 1장씩 보내는 대신).
+# 특징 추출은 클립 전체를 한 번에 계산하고 시퀀스 모델은 1회만 실행하며,
+# 서버의 사용자별 시퀀스 버퍼(sequence_buffers)는 사용하지 않는다.
+MAX_CLIP_FRAMES = 64
+
+@recognition_bp.route('/api/recognition/analyze-clip', methods=['POST'])
+@jwt_required()
+def analyze_clip():
+    """시퀀스 수어 클립 분석 (frames: Base64 이미지 목록 또는 landmarks: 프레임별 랜드마크)"""
+    try:
+        data = request.get_json()
+        
+        # 필수 데이터 확인
+        required_fields = ['target_sign', 'language']
+        for field in required_fields:
+            if not data.get(field):
+                return jsonify({'error': f'{field}는 필수입니다.'}), 400
+        
+        target_sign = data['target_sign']
+        language = data['language']
+        if target_sign not in SEQUENCE_SIGNS:
+            return jsonify({'error': f'시퀀스 수어만 지원합니다: {", ".join(SEQUENCE_SIGNS)}'}), 400
+        
+        clip = data.get('landmarks', data.get('frames'))
+        if not isinstance(clip, list) or not clip:
+            return jsonify({'error': 'frames 또는 landmarks 목록이 필요합니다.'}), 400
+        if len(clip) > MAX_CLIP_FRAMES:
+            return jsonify({'error': f'프레임은 최대 {MAX_CLIP_FRAMES}개까지 보낼 수 있습니다.'}), 400
+        
+        # 입력 형식 확인 (모델 상태와 관계없이 잘못된 요청은 400)
+        points = None
+        if 'landmarks' in data:
+            try:
+                points = parse_landmark_clip(clip)
+            except ValueError as e:
+                return jsonify({'error': str(e)}), 400
+        elif not all(isinstance(frame, str) for frame in clip):
+            return jsonify({'error': 'frames는 Base64 이미지 문자열 목록이어야 합니다.'}), 400
+        
+        if not model_initialized or seq_engine is None:
+            return jsonify({
+                'error': '시퀀스 모델이 초기화되지 않았습니다.',
+                'model_available': False
+            }), 503
+        
+        if points is None:
+            # 프레임마다 손 랜드마크 추출 (손이 없거나 디코딩 실패한 프레임은 건너뜀)
+            points = []
+            for image_data in clip:
+                image_rgb = decode_image(image_data)
+                if image_rgb is None:
+                    continue
+                results = hands_pool.process(image_rgb, 'image')
+                if results.multi_hand_landmarks:
+                    points.append(landmark_points(results.multi_hand_landmarks[0]))
+            points = np.stack(points) if points else np.empty((0, 21, 2), dtype=np.float32)
+        
+        analysis_result = analyze_sequence_clip(points, target_sign, language)
+        
+        return jsonify({
+            'analysis': analysis_result,
+            'message': '손모양 분석이 완료되었습니다.',
+            'model_type': 'sequence',
+            'is_sequence_sign': True
+        }), 200
+        
+    except InferenceFailed as e:
+        return inference_failed_response(e)
     except Exception as e:
         import traceback
         traceback.print_exc()
@@ -816,39 +1401,62 @@ def get_model_status():
             'ksl_labels.npy': os.path.exists(KSL_LABELS_PATH),
             'ksl_model_sequence.h5': os.path.exists(KSL_SEQ_MODEL_PATH),
             'ksl_labels_sequence.npy': os.path.exists(KSL_SEQ_LABELS_PATH),
-            'ksl_sequence_config.npy': os.path.exists(KSL_SEQ_CONFIG_PATH)
+            'ksl_sequence_config.npy': os.path.exists(KSL_SEQ_CONFIG_PATH),
+            'ksl_bundle.bin': os.path.exists(KSL_BUNDLE_PATH)
         }
+        for backend, path in KSL_EXPORT_PATHS.items():
+            files_exist[os.path.basename(path)] = os.path.exists(path)
+        for backend, path in KSL_SEQ_EXPORT_PATHS.items():
+            files_exist[os.path.basename(path)] = os.path.exists(path)
         
         status = {
             'model_initialized': model_initialized,
             'hybrid_mode': True,
-            'mediapipe_available': hands is not None,
+            'mediapipe_available': hands_pool is not None,
+            'hands_pool': hands_pool.get_stats() if hands_pool else None,
+            'sequence_trackers': sequence_trackers.get_stats() if sequence_trackers else None,
+            'frame_skip': get_skip_stats(),
+            'sequence_buffers': sequence_buffers.get_stats(),
             'files_exist': files_exist,
+            'use_bundle': USE_BUNDLE,
+            'bundle': model_bundle.get_info() if model_bundle else None,
             
             # 정적 모델
             'static_model': {
-                'available': ksl_model is not None,
+                'available': static_engine is not None,
                 'path': KSL_MODEL_PATH,
+                'source': 'bundle' if model_bundle is not None and BUNDLE_STATIC else STATIC_BACKEND,
+                'backend': static_engine.backend.get_stats() if static_engine else None,
                 'labels_count': len(labels_ksl) if labels_ksl is not None else 0,
                 'labels': labels_ksl.tolist() if labels_ksl is not None else []
             },
             
             # 시퀀스 모델
             'sequence_model': {
-                'available': ksl_seq_model is not None,
+                'available': seq_engine is not None,
                 'path': KSL_SEQ_MODEL_PATH,
+                'source': 'bundle' if model_bundle is not None and BUNDLE_SEQ and model_bundle.has_sequence else SEQ_BACKEND,
+                'backend': seq_engine.backend.get_stats() if seq_engine else None,
                 'labels_count': len(labels_ksl_seq) if labels_ksl_seq is not None else 0,
                 'labels': labels_ksl_seq.tolist() if labels_ksl_seq is not None else [],
-                'max_timesteps': seq_max_timesteps
+                'max_timesteps': seq_max_timesteps,
+                'motion_gate': get_gate_stats()
             },
             
             'sequence_signs': SEQUENCE_SIGNS,
             
+            # 요청 간 배치 통계
+            'batching': {
+                'enabled': BATCH_WINDOW_MS > 0,
+                'static': static_batcher.get_stats() if static_batcher else None,
+                'sequence': seq_batcher.get_stats() if seq_batcher else None
+            },
+            
             # 디버깅 정보
             'debug': {
                 'base_dir': BASE_DIR,
                 'model_dir': MODEL_DIR,
-                'seq_model_loaded': ksl_seq_model is not None,
+                'seq_model_loaded': seq_engine is not None,
                 'seq_labels_loaded': labels_ksl_seq is not None,
                 'seq_config_loaded': seq_max_timesteps is not None
             }
@@ -870,9 +1478,10 @@ def clear_sequence_buffer():
     try:
         user_id = get_jwt_identity()
         
-        if user_id in sequence_buffers:
-            sequence_buffers[user_id]['buffer'].clear()
-            sequence_buffers[user_id]['prev_xy'].clear()
+        # 항목을 지우면 다음 요청에서 빈 버퍼로 다시 생성됨
+        if sequence_buffers.discard(user_id):
+            if sequence_trackers:
+                sequence_trackers.discard(user_id)
             return jsonify({
                 'message': '시퀀스 버퍼가 초기화되었습니다.',
                 'user_id': user_id
@@ -0,0 +1,136 @@
+# - 실시간 인식 결과 푸시 (SSE) + 조건부 폴링
+# latest_char / recognized_string이 바뀔 때만 버전을 올리고 기다리는 구독자를 깨운다.
+# 채널 키는 언어 (세션별 상태를 쓰면 "<세션 키>/<언어>"), 버전은 프로세스 내에서 단조 증가 (키 구분 없이 하나의 카운터),
+# 폴링은 ?since=<버전> (또는 If-None-Match)으로 변경이 없으면 304를 받는다.
+# 채널 항목은 세션 저장소와 같은 TTL로 지우고 개수도 제한한다 (구독자가 있는 채널은 유지).
+import json
+import threading
+import time
+from collections import namedtuple, OrderedDict
+from api.session_state import SESSION_TTL, MAX_SESSIONS
+
+# 구독자가 변경을 기다리다 keep-alive 주석을 보내는 간격 (초)
+KEEPALIVE_INTERVAL = 15.0
+# 최대 채널 수 (세션당 언어 2개 기준), 넘으면 오래 안 쓴 채널부터 제거
+MAX_CHANNELS = MAX_SESSIONS * 2
+
+# version: 단조 증가 버전, current: 현재 인식 문자, accumulated: 누적 문자열, timestamp: time.time()
+RecognitionState = namedtuple('RecognitionState', ['version', 'current', 'accumulated', 'timestamp'])
+
+
+class RecognitionChannel:
+    """언어별 최신 인식 결과 + 버전 (값이 바뀔 때만 버전 증가)
+
+    ttl초 동안 publish가 없거나 max_channels를 넘으면 오래 안 쓴 채널부터 제거 (SSE 구독 중인 채널은 제외)
+    """
+
+    def __init__(self, ttl=SESSION_TTL, max_channels=MAX_CHANNELS):
+        self._cond = threading.Condition()
+        # 시작 시각(ms)에서 출발: 서버 재시작 후에도 클라이언트가 들고 있던 since보다 커서 304에 갇히지 않음
+        self._version = int(time.time() * 1000)
+        self.ttl = ttl
+        self.max_channels = max(1, max_channels)
+        self._states = {}
+        self._touched = OrderedDict()  # {채널 키: 마지막 publish 시각 (monotonic)}, 오래 안 쓴 순
+        self._watchers = {}  # {채널 키: SSE 구독자 수}
+        self._stats = {'publishes': 0, 'changes': 0, 'subscribers': 0, 'evicted': 0}
+
+    def publish(self, lang, current, accumulated):
+        """현재 값 반영, 바뀌었으면 버전을 올리고 구독자를 깨움 → 현재 버전"""
+        with self._cond:
+            self._stats['publishes'] += 1
+            now = time.monotonic()
+            self._touched[lang] = now
+            self._touched.move_to_end(lang)
+            state = self._states.get(lang)
+            if state is not None and state.current == current and state.accumulated == accumulated:
+                return state.version
+            self._version += 1
+            self._states[lang] = RecognitionState(self._version, current, accumulated, time.time())
+            self._stats['changes'] += 1
+            if state is None:
+                self._evict_locked(lang, now)
+            self._cond.notify_all()
+            return self._version
+
+    def _evict_locked(self, keep, now):
+        """만료 채널 + 상한을 넘는 채널 제거 (오래 안 쓴 것부터)"""
+        for key, touched in list(self._touched.items()):
+            if len(self._touched) <= self.max_channels and now - touched <= self.ttl:
+                break
+            if key == keep or self._watchers.get(key):
+                continue
+            del self._touched[key]
+            del self._states[key]
+            self._stats['evicted'] += 1
+
+    def snapshot(self, lang):
+        """언어의 최신 상태 (아직 publish 전이면 버전 0의 빈 상태)"""
+        with self._cond:
+            return self._states.get(lang) or RecognitionState(0, '', '', time.time())
+
+    def wait_newer(self, lang, since, timeout=None):
+        """since보다 새 버전이 나올 때까지 대기 (timeout이면 None)"""
+        with self._cond:
+            if not self._cond.wait_for(lambda: lang in self._states and self._states[lang].version > since, timeout):
+                return None
+            return self._states[lang]
+
+    def events(self, lang, since=0, label=None):
+        """SSE 구독자 1명용 생성기 (text/event-stream 청크)
+
+        lang: 채널 키 (세션별이면 "<세션>/<언어>"), label: 이벤트의 language 필드 (없으면 lang)
+        """
+        with self._cond:
+            self._stats['subscribers'] += 1
+            self._watchers[lang] = self._watchers.get(lang, 0) + 1
+        try:
+            # 접속 직후 현재 상태를 한 번 보내서 클라이언트가 바로 화면을 맞추게 함
+            state = self.snapshot(lang)
+            if state.version > since or since == 0 or state.version == 0:
+                yield format_event(label or lang, state)
+                since = state.version
+            while True:
+                state = self.wait_newer(lang, since, KEEPALIVE_INTERVAL)
+                if state is None:
+                    yield ': keep-alive\n\n'
+                    continue
+                since = state.version
+                yield format_event(label or lang, state)
+        finally:
+            with self._cond:
+                self._stats['subscribers'] -= 1
+                self._watchers[lang] -= 1
+                if not self._watchers[lang]:
+                    del self._watchers[lang]
+
+    def get_stats(self):
+        with self._cond:
+            return dict(self._stats, version=self._version, channels=len(self._states),
+                        max_channels=self.max_channels, ttl=self.ttl)
+
+
+def state_payload(lang, state):
+    """폴링 응답/SSE 이벤트 공통 JSON (기존 /api/recognition/current 형식 + version)"""
+    return {
+        # 새 API 형식
+        'current_character': state.current,
+        'accumulated_string': state.accumulated,
+        # 기존 API 형식 (하위 호환성)
+        'current': state.current,
+        'string': state.accumulated,
+        # 추가 정보
+        'version': state.version,
+        'timestamp': state.timestamp,
+        'language': lang,
+        'has_current': bool(state.current and state.current.strip())
+    }
+
+
+def format_event(lang, state):
+    """SSE 이벤트 문자열 (id = 버전이라 재접속 시 Last-Event-ID로 이어받기 가능)"""
+    data = json.dumps(state_payload(lang, state), ensure_ascii=False)
+    return f"id: {state.version}\nevent: recognition\ndata: {data}\n\n"
+
+
+recognition_channel = RecognitionChannel()
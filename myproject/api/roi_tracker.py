@@ -0,0 +1,167 @@
+# - 카메라 스트림용 손 ROI 추적
+# 매 프레임 640x480 전체를 MediaPipe에 넣는 대신, 직전 프레임에서 찾은 손 bbox 주변을 여유 있게 잘라
+# 그 영역만 처리하고 랜드마크를 전체 프레임 정규화 좌표로 되돌린다.
+# 손을 놓치면 (또는 redetect_interval 프레임마다 새 손을 찾기 위해) 축소한 전체 프레임으로 검출한다.
+#
+# video 모드 Hands의 프레임 간 추적이 끊기지 않도록 ROI는 손이 안쪽 여백을 벗어나거나
+# 크기가 크게 바뀔 때만 다시 잡는다 (매 프레임 ROI가 흔들리면 추적 좌표가 어긋남).
+import os
+import threading
+import time
+import cv2
+import numpy as np
+
+# 손 bbox 한 변 대비 사방 여유 비율
+ROI_PADDING = float(os.environ.get('KSL_ROI_PADDING', '0.5'))
+# 손을 놓쳤을 때 전체 프레임을 줄이는 긴 변 크기 (MediaPipe 입력은 어차피 내부에서 축소됨)
+FALLBACK_MAX_SIDE = int(os.environ.get('KSL_ROI_FALLBACK_SIDE', '320'))
+# 새로 들어온 손을 찾기 위해 전체 프레임 검출을 강제하는 주기 (프레임, 0이면 사용 안 함)
+REDETECT_INTERVAL = int(os.environ.get('KSL_ROI_REDETECT_INTERVAL', '30'))
+# ROI 최소 한 변 (픽셀)
+MIN_ROI_SIDE = 96
+
+roi_stats = {
+    'frames': 0, 'crop_attempts': 0, 'crop_hits': 0, 'fallback_frames': 0,
+    'landmark_ms_total': 0.0, 'crop_ms_total': 0.0, 'fallback_ms_total': 0.0, 'last_landmark_ms': 0.0
+}
+_stats_lock = threading.Lock()
+
+
+def hands_bbox(multi_hand_landmarks, width, height):
+    """감지된 모든 손을 감싸는 픽셀 bbox (x0, y0, x1, y1)"""
+    xs = np.array([lm.x for hand in multi_hand_landmarks for lm in hand.landmark], dtype=np.float32) * width
+    ys = np.array([lm.y for hand in multi_hand_landmarks for lm in hand.landmark], dtype=np.float32) * height
+    return float(xs.min()), float(ys.min()), float(xs.max()), float(ys.max())
+
+
+class HandROITracker:
+    """Hands 인스턴스 하나를 감싸서 ROI 잘라내기 → 실패 시 축소 전체 프레임으로 처리"""
+
+    def __init__(self, hands, padding=ROI_PADDING, fallback_max_side=FALLBACK_MAX_SIDE,
+                 redetect_interval=REDETECT_INTERVAL):
+        self.hands = hands
+        self.padding = padding
+        self.fallback_max_side = fallback_max_side
+        self.redetect_interval = redetect_interval
+        self.box = None  # 현재 ROI (x0, y0, x1, y1) 픽셀, 없으면 전체 프레임
+        self._crop_frames = 0  # 마지막 전체 검출 이후 ROI로 처리한 프레임 수
+        # ROI가 유지되는 동안 크기가 같으므로 잘라낸 영상/축소 영상 버퍼를 재사용
+        self._crop_buffer = None
+        self._small_buffer = None
+
+    def reset(self):
+        self.box = None
+        self._crop_frames = 0
+
+    def _fit_box(self, bbox, width, height):
+        """손 bbox → 여유를 둔 정사각형 ROI (프레임 밖은 잘림)"""
+        x0, y0, x1, y1 = bbox
+        side = max(x1 - x0, y1 - y0) * (1 + 2 * self.padding)
+        side = min(max(side, MIN_ROI_SIDE), max(width, height))
+        cx, cy = (x0 + x1) / 2, (y0 + y1) / 2
+        return (max(0, int(cx - side / 2)), max(0, int(cy - side / 2)),
+                min(width, int(cx + side / 2)), min(height, int(cy + side / 2)))
+
+    def _update_box(self, bbox, width, height):
+        """손이 ROI 안쪽 여백 안에 있고 크기도 비슷하면 ROI 유지 (추적 안정성)"""
+        if self.box is not None:
+            bx0, by0, bx1, by1 = self.box
+            x0, y0, x1, y1 = bbox
+            margin = min(bx1 - bx0, by1 - by0) * self.padding / (2 * (1 + 2 * self.padding))
+            inside = x0 >= bx0 + margin and y0 >= by0 + margin and x1 <= bx1 - margin and y1 <= by1 - margin
+            wanted = self._fit_box(bbox, width, height)
+            ratio = max(wanted[2] - wanted[0], 1) / max(bx1 - bx0, 1)
+            if inside and 0.7 <= ratio <= 1.3:
+                return
+        self.box = self._fit_box(bbox, width, height)
+
+    def _process_crop(self, image_rgb):
+        width, height = image_rgb.shape[1], image_rgb.shape[0]
+        x0, y0, x1, y1 = self.box
+        crop = image_rgb[y0:y1, x0:x1]
+        if self._crop_buffer is None or self._crop_buffer.shape != crop.shape:
+            self._crop_buffer = np.empty(crop.shape, dtype=crop.dtype)
+        np.copyto(self._crop_buffer, crop)  # MediaPipe는 연속 메모리 입력 필요
+        result = self.hands.process(self._crop_buffer)
+        if not result.multi_hand_landmarks:
+            return None
+        # ROI 정규화 좌표 → 전체 프레임 정규화 좌표 (z는 x와 같은 스케일)
+        sx, sy = (x1 - x0) / width, (y1 - y0) / height
+        ox, oy = x0 / width, y0 / height
+        for hand_landmarks in result.multi_hand_landmarks:
+            for lm in hand_landmarks.landmark:
+                lm.x = ox + lm.x * sx
+                lm.y = oy + lm.y * sy
+                lm.z = lm.z * sx
+        return result
+
+    def _process_full(self, image_rgb):
+        # 비율을 유지해서 줄이면 정규화 좌표는 그대로
+        height, width = image_rgb.shape[:2]
+        scale = self.fallback_max_side / max(height, width) if self.fallback_max_side else 1.0
+        if scale < 1.0:
+            shape = (round(height * scale), round(width * scale), image_rgb.shape[2])
+            if self._small_buffer is None or self._small_buffer.shape != shape:
+                self._small_buffer = np.empty(shape, dtype=image_rgb.dtype)
+            image_rgb = cv2.resize(image_rgb, (shape[1], shape[0]), dst=self._small_buffer, interpolation=cv2.INTER_AREA)
+        return self.hands.process(image_rgb)
+
+    def process(self, image_rgb):
+        """hands.process()와 같은 결과 객체 (랜드마크는 전체 프레임 정규화 좌표)"""
+        height, width = image_rgb.shape[:2]
+        start = time.perf_counter()
+        result = None
+        used_crop = False
+
+        redetect = self.redetect_interval and self._crop_frames >= self.redetect_interval
+        if self.box is not None and not redetect:
+            used_crop = True
+            result = self._process_crop(image_rgb)
+            crop_ms = (time.perf_counter() - start) * 1000
+            if result is None:
+                self.box = None  # 손을 놓침 → 전체 프레임으로
+        if result is None:
+            fallback_start = time.perf_counter()
+            result = self._process_full(image_rgb)
+            fallback_ms = (time.perf_counter() - fallback_start) * 1000
+            self._crop_frames = 0
+        else:
+            self._crop_frames += 1
+
+        if result.multi_hand_landmarks:
+            self._update_box(hands_bbox(result.multi_hand_landmarks, width, height), width, height)
+        else:
+            self.box = None
+
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        with _stats_lock:
+            roi_stats['frames'] += 1
+            roi_stats['landmark_ms_total'] += elapsed_ms
+            roi_stats['last_landmark_ms'] = elapsed_ms
+            if used_crop:
+                roi_stats['crop_attempts'] += 1
+                roi_stats['crop_ms_total'] += crop_ms
+                if self._crop_frames:
+                    roi_stats['crop_hits'] += 1
+            if not self._crop_frames:
+                roi_stats['fallback_frames'] += 1
+                roi_stats['fallback_ms_total'] += fallback_ms
+        return result
+
+
+def get_roi_stats():
+    with _stats_lock:
+        frames = roi_stats['frames']
+        attempts = roi_stats['crop_attempts']
+        fallbacks = roi_stats['fallback_frames']
+        return {
+            'frames': frames,
+            'crop_attempts': attempts,
+            'crop_hits': roi_stats['crop_hits'],
+            'crop_hit_rate': round(roi_stats['crop_hits'] / attempts, 3) if attempts else 0.0,
+            'fallback_frames': fallbacks,
+            'avg_landmark_ms': round(roi_stats['landmark_ms_total'] / frames, 3) if frames else 0.0,
+            'avg_crop_ms': round(roi_stats['crop_ms_total'] / attempts, 3) if attempts else 0.0,
+            'avg_fallback_ms': round(roi_stats['fallback_ms_total'] / fallbacks, 3) if fallbacks else 0.0,
+            'last_landmark_ms': round(roi_stats['last_landmark_ms'], 3)
+        }
@@ -0,0 +1,88 @@
+# - 사용자별 시퀀스 프레임 링 버퍼 (미리 할당한 float32 배열)
+# 기존 sequence_buffers[user_id]['buffer']는 10개 float 리스트의 deque라서 예측할 때마다
+# list(deque) → 새 (max_timesteps, 10) 배열 → 정규화된 새 배열을 만들었다.
+# 사용자마다 (T, F) 배열 하나와 head 인덱스를 두고 새 프레임은 가장 오래된 행 자리에 바로 쓴다.
+# 모델 입력 (1, T, F)도 미리 만든 배열에 시간 순서대로 복사 + 뒤를 0으로 패딩하고,
+# 정규화는 추론 엔진이 그 배열 안에서 한다 (InferenceEngine.classify(out=...)).
+# 사용자 버퍼 dict는 TTL/최대 개수로 제한한다 (기존에는 지우지 않아 사용자 수만큼 계속 늘어남).
+import os
+import numpy as np
+from api.state_backend import get_state_backend
+
+# 사용자별 시퀀스 버퍼 최대 수 (오래 안 쓴 것부터 제거)
+MAX_SEQUENCE_BUFFERS = int(os.environ.get('KSL_MAX_SEQUENCE_BUFFERS', '256'))
+# 마지막 사용 후 버퍼 항목을 유지하는 시간 (초), 내용은 SEQUENCE_TIMEOUT(5초)이 지나면 어차피 비워짐
+SEQUENCE_BUFFER_TTL = float(os.environ.get('KSL_SEQUENCE_BUFFER_TTL', '300'))
+
+
+class SequenceRingBuffer:
+    """고정 크기 (timesteps, feature_dim) float32 링 버퍼 + 모델 입력 배열 (1, timesteps, feature_dim)"""
+
+    def __init__(self, timesteps, feature_dim):
+        self.timesteps = timesteps
+        self.feature_dim = feature_dim
+        self._frames = np.zeros((timesteps, feature_dim), dtype=np.float32)
+        self._input = np.zeros((1, timesteps, feature_dim), dtype=np.float32)
+        self._head = 0  # 다음 프레임을 쓸 행
+        self._count = 0
+
+    def __len__(self):
+        return self._count
+
+    def clear(self):
+        self._head = 0
+        self._count = 0
+
+    def push(self):
+        """다음 프레임 행 (가장 오래된 프레임 자리, 꽉 찼으면 덮어씀) → 호출자가 feature_dim개 값을 채움"""
+        row = self._frames[self._head]
+        self._head = (self._head + 1) % self.timesteps
+        self._count = min(self._count + 1, self.timesteps)
+        return row
+
+    def append(self, features):
+        self.push()[:] = features
+
+    def model_input(self):
+        """오래된 순서로 정렬 + 뒤를 0으로 패딩한 모델 입력 (1, T, F), 매번 같은 배열을 다시 채움"""
+        out = self._input[0]
+        count = self._count
+        start = (self._head - count) % self.timesteps
+        first = min(count, self.timesteps - start)
+        out[:first] = self._frames[start:start + first]
+        out[first:count] = self._frames[:count - first]
+        out[count:] = 0.0
+        return self._input
+
+    @property
+    def nbytes(self):
+        return self._frames.nbytes + self._input.nbytes
+
+
+def entry_nbytes(entry):
+    return entry['buffer'].nbytes
+
+
+class SequenceBuffers:
+    """사용자 ID → 시퀀스 버퍼 항목 ('buffer'에 SequenceRingBuffer가 있는 dict)
+
+    공유 상태 백엔드의 'sequence_buffer' 네임스페이스에 저장한다. ttl초 동안 안 쓰거나
+    max_sessions를 넘으면 오래 안 쓴 것부터 제거. sqlite 백엔드면 요청마다 불러와서 끝날 때 저장하므로
+    같은 사용자의 폴링이 다른 워커로 가도 버퍼가 이어진다.
+    """
+
+    def __init__(self, backend=None, max_sessions=MAX_SEQUENCE_BUFFERS, ttl=SEQUENCE_BUFFER_TTL):
+        backend = backend or get_state_backend()
+        self._entries = backend.namespace('sequence_buffer', ttl=ttl, max_entries=max(1, max_sessions),
+                                          sizeof=entry_nbytes)
+
+    def transaction(self, user_id, factory=None):
+        """사용자 락을 잡고 Record 건네주기 (record.value: 항목, 없으면 factory()로 생성, factory가 없으면 None)"""
+        return self._entries.transaction(user_id, factory)
+
+    def discard(self, user_id):
+        """버퍼 삭제 → 있었는지"""
+        return self._entries.delete(user_id)
+
+    def get_stats(self):
+        return self._entries.get_stats()
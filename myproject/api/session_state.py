@@ -0,0 +1,87 @@
+# - 세션별 인식 상태 저장소 (현재 문자 / 누적 문자열 / 쌍자음 대기 정보)
+# app.py의 전역 dict(recognized_string, latest_char, ...)는 "ksl" 키 하나라 모든 사용자가 누적 문자열을 공유하고
+# add_char/remove_char/clear_string이 스트림 스레드와 경쟁했다.
+# 상태를 세션 키(JWT 사용자 "user:<id>" 또는 카메라 스트림 "stream:<id>")별로 나누고,
+# 세션마다 락을 따로 둬서 다른 세션끼리는 서로 기다리지 않는다.
+# 오래 안 쓴 세션은 TTL로 지우고, 세션 수/메모리 상한을 넘으면 가장 오래 안 쓴 세션부터 지운다.
+# 저장은 공유 상태 백엔드 (api/state_backend.py)에 해서 KSL_STATE_BACKEND=sqlite면 워커 간에 공유된다.
+import os
+import sys
+from contextlib import contextmanager
+from api.state_backend import get_state_backend
+
+# 마지막 사용 후 세션을 유지하는 시간 (초)
+SESSION_TTL = float(os.environ.get('KSL_SESSION_TTL', '1800'))
+# 최대 세션 수
+MAX_SESSIONS = int(os.environ.get('KSL_MAX_SESSIONS', '1000'))
+# 전체 세션 상태 메모리 상한 (바이트, 추정치)
+MAX_SESSION_BYTES = int(os.environ.get('KSL_SESSION_MEMORY', str(4 * 1024 * 1024)))
+# 누적 문자열 최대 길이 (넘으면 앞부분을 잘라냄)
+MAX_ACCUMULATED = 1000
+
+
+class LanguageState:
+    """세션 안의 언어별 인식 상태"""
+
+    __slots__ = ('current', 'accumulated', 'last_char', 'last_time')
+
+    def __init__(self):
+        self.current = ''       # 현재 인식 문자 (기존 latest_char)
+        self.accumulated = ''   # 누적 문자열 (기존 recognized_string)
+        self.last_char = ''     # 쌍자음 판단용 이전 인식 문자 (기존 last_recognized_char)
+        self.last_time = 0.0    # 쌍자음 판단용 이전 인식 시각 (기존 last_recognized_time)
+
+    def append(self, text):
+        self.accumulated = (self.accumulated + text)[-MAX_ACCUMULATED:]
+
+    def nbytes(self):
+        return (sys.getsizeof(self) + sys.getsizeof(self.current) + sys.getsizeof(self.accumulated)
+                + sys.getsizeof(self.last_char))
+
+
+def session_nbytes(languages):
+    """세션({언어: LanguageState}) 메모리 추정치"""
+    return sys.getsizeof(languages) + sum(sys.getsizeof(lang) + state.nbytes() for lang, state in languages.items())
+
+
+class SessionStore:
+    """세션 키 → {언어: LanguageState} (공유 상태 백엔드의 'recognition_session' 네임스페이스)
+
+    TTL + 세션 수/메모리 상한, 오래 안 쓴 것부터 제거. 상태 변경은 세션 키 락 안에서 하고
+    (state()), sqlite 백엔드면 with 블록이 끝날 때 저장되어 다른 워커에서도 보인다.
+    """
+
+    def __init__(self, backend=None, ttl=SESSION_TTL, max_sessions=MAX_SESSIONS, max_bytes=MAX_SESSION_BYTES):
+        backend = backend or get_state_backend()
+        self._sessions = backend.namespace('recognition_session', ttl=ttl, max_entries=max(1, max_sessions),
+                                           max_bytes=max_bytes, sizeof=session_nbytes)
+
+    @contextmanager
+    def state(self, key, lang):
+        """세션 락을 잡은 채로 언어 상태를 빌려줌 (with 블록 안에서 읽기/쓰기)"""
+        with self._sessions.transaction(key, dict) as record:
+            state = record.value.get(lang)
+            if state is None:
+                state = record.value[lang] = LanguageState()
+            yield state
+
+    def snapshot(self, key, lang):
+        """(현재 문자, 누적 문자열) - 락 없이 읽음, 세션이 없으면 빈 문자열"""
+        languages = self._sessions.get(key)
+        state = languages.get(lang) if languages else None
+        if state is None:
+            return '', ''
+        return state.current, state.accumulated
+
+    def discard(self, key):
+        return self._sessions.delete(key)
+
+    def get_stats(self):
+        keys = self._sessions.keys()
+        stats = self._sessions.get_stats()
+        return dict(
+            stats,
+            active_sessions=len(keys),
+            user_sessions=sum(1 for key in keys if key.startswith('user:')),
+            stream_sessions=sum(1 for key in keys if key.startswith('stream:'))
+        )
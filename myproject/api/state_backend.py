@@ -0,0 +1,406 @@
+# - 공유 상태 백엔드 (세션 인식 상태 / 시퀀스 버퍼 / 토큰 블랙리스트)
+# 지금까지 이 상태들은 전부 파이썬 프로세스 하나의 dict/set에 있어서 서버를 워커 1개로만 띄울 수 있었다.
+# 네임스페이스별 키-값 저장소 인터페이스를 두고 구현을 고른다 (KSL_STATE_BACKEND).
+#   memory: 프로세스 내 메모리 (기본값, 기존 동작과 같음, 값 객체를 그대로 보관)
+#   sqlite: 같은 호스트의 여러 워커가 공유하는 SQLite 파일 (WAL 모드, 값은 pickle)
+#           → gunicorn -w 4 처럼 포트 하나 뒤에 워커 여러 개를 띄울 수 있다
+# 키 단위 읽기-수정-쓰기는 transaction()으로 한다. 키를 해시한 스트라이프 락
+# (memory: threading 락, sqlite: 락 파일 byte-range 락 → 프로세스 간에도 유효)을 잡은 채로
+# 값을 읽어 건네주고, with 블록이 정상 종료되면 다시 저장한다. DB 쓰기 락은 저장하는 순간에만 잡는다.
+# 네임스페이스마다 TTL(마지막 저장 후 유지 시간)과 항목 수/바이트 상한을 두고, 넘으면 오래된 것부터 지운다.
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import zlib
+from collections import OrderedDict
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: sqlite 백엔드 사용 불가 (memory만)
+    fcntl = None
+
+BASE_DIR = os.path.dirname(os.path.dirname(__file__))  # myproject 폴더
+
+# memory | sqlite
+STATE_BACKEND = os.environ.get('KSL_STATE_BACKEND', 'memory')
+# sqlite 백엔드 DB 파일 (같은 호스트의 모든 워커가 같은 경로를 써야 함)
+STATE_DB_PATH = os.environ.get('KSL_STATE_DB', os.path.join(BASE_DIR, 'instance', 'ksl_state.db'))
+# 키 락 스트라이프 수 (서로 다른 키가 같은 스트라이프면 함께 기다림)
+LOCK_STRIPES = 64
+# sqlite 만료/상한 정리 최소 간격 (초, 프로세스별)
+MAINTENANCE_INTERVAL = 1.0
+
+
+class Record:
+    """transaction()이 건네주는 값 상자 (value를 바꾸거나 None으로 두면 삭제)"""
+
+    __slots__ = ('value', 'created')
+
+    def __init__(self, value, created):
+        self.value = value
+        self.created = created  # factory()로 새로 만든 값인지
+
+
+class StateNamespace:
+    """네임스페이스 하나의 키-값 저장소 인터페이스
+
+    ttl: 마지막 저장 후 유지 시간 (초, None이면 무제한)
+    max_entries / max_bytes: 넘으면 가장 오래 저장 안 한 항목부터 삭제
+    sizeof: 항목 크기 추정 함수 (memory 백엔드용, sqlite는 pickle 길이를 사용)
+    """
+
+    def __init__(self, name, ttl=None, max_entries=None, max_bytes=None, sizeof=None):
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.track_size = max_bytes is not None or sizeof is not None  # memory 백엔드는 이때만 크기 계산
+        self.sizeof = sizeof or (lambda value: len(pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+        self._stats = {'created': 0, 'expired': 0, 'evicted': 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name, n=1):
+        if n:
+            with self._stats_lock:
+                self._stats[name] += n
+
+    def get(self, key, default=None):
+        """값 읽기 (락 없음, TTL 갱신 안 함). memory 백엔드는 보관 중인 객체를 그대로 주므로 읽기만 할 것"""
+        raise NotImplementedError
+
+    def set(self, key, value):
+        raise NotImplementedError
+
+    def delete(self, key):
+        """삭제 → 있었는지"""
+        raise NotImplementedError
+
+    def keys(self):
+        raise NotImplementedError
+
+    def transaction(self, key, factory=None):
+        """키 락을 잡고 Record 건네주기 (값이 없으면 factory()로 생성), 정상 종료 시 저장"""
+        raise NotImplementedError
+
+    def _usage(self):
+        """(항목 수, 바이트 추정치)"""
+        raise NotImplementedError
+
+    def get_stats(self):
+        entries, nbytes = self._usage()
+        with self._stats_lock:
+            return dict(self._stats, entries=entries, approx_bytes=nbytes, ttl=self.ttl,
+                        max_entries=self.max_entries, max_bytes=self.max_bytes)
+
+
+class MemoryNamespace(StateNamespace):
+    """프로세스 내 메모리 네임스페이스 (값 객체를 복사/직렬화 없이 보관)"""
+
+    def __init__(self, name, **limits):
+        super().__init__(name, **limits)
+        self._entries = OrderedDict()  # {key: [value, 저장 시각, 크기]}, 오래 저장 안 한 순
+        self._lock = threading.Lock()
+        self._total_bytes = 0
+        self._key_locks = [threading.RLock() for _ in range(LOCK_STRIPES)]
+
+    def _expired(self, item, now):
+        return self.ttl is not None and now - item[1] > self.ttl
+
+    def _pop_locked(self, key):
+        item = self._entries.pop(key)
+        self._total_bytes -= item[2]
+
+    def _evict_locked(self, keep, now):
+        expired = evicted = 0
+        while self._entries:
+            key, item = next(iter(self._entries.items()))
+            if key == keep or not self._expired(item, now):
+                break
+            self._pop_locked(key)
+            expired += 1
+        while len(self._entries) > 1 and (
+                (self.max_entries is not None and len(self._entries) > self.max_entries)
+                or (self.max_bytes is not None and self._total_bytes > self.max_bytes)):
+            key = next(iter(self._entries))
+            if key == keep:
+                self._entries.move_to_end(key)
+                key = next(iter(self._entries))
+            self._pop_locked(key)
+            evicted += 1
+        self._count('expired', expired)
+        self._count('evicted', evicted)
+
+    def get(self, key, default=None):
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None or self._expired(item, time.monotonic()):
+                return default
+            return item[0]
+
+    def set(self, key, value):
+        size = self.sizeof(value) if self.track_size else 0
+        now = time.monotonic()
+        with self._lock:
+            if key in self._entries:
+                self._pop_locked(key)
+            self._entries[key] = [value, now, size]
+            self._total_bytes += size
+            self._evict_locked(key, now)
+
+    def delete(self, key):
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._pop_locked(key)
+            return True
+
+    def keys(self):
+        now = time.monotonic()
+        with self._lock:
+            return [key for key, item in self._entries.items() if not self._expired(item, now)]
+
+    @contextmanager
+    def transaction(self, key, factory=None):
+        with self._key_locks[hash(key) % LOCK_STRIPES]:
+            value = self.get(key)
+            created = value is None and factory is not None
+            if created:
+                value = factory()
+                self._count('created')
+            record = Record(value, created)
+            yield record
+            if record.value is None:
+                self.delete(key)
+            else:
+                self.set(key, record.value)
+
+    def _usage(self):
+        with self._lock:
+            return len(self._entries), self._total_bytes
+
+
+class _StripeLocks:
+    """프로세스 간 키 스트라이프 락 (락 파일의 byte-range 락 + 같은 프로세스 스레드용 RLock)
+
+    byte-range 락은 프로세스 단위라 같은 프로세스의 스레드끼리는 막지 못하므로 RLock을 먼저 잡고,
+    같은 스레드가 다시 잡을 때는 파일 락을 건드리지 않는다 (깊이 카운트).
+    """
+
+    def __init__(self, path):
+        if fcntl is None:
+            raise RuntimeError('sqlite 상태 백엔드는 fcntl이 있는 OS(Linux/macOS)에서만 사용할 수 있습니다')
+        self.path = path
+        self._fd = None
+        self._pid = None
+        self._file_lock = threading.Lock()
+        self._locks = [threading.RLock() for _ in range(LOCK_STRIPES)]
+        self._depth = [0] * LOCK_STRIPES
+
+    def _file(self):
+        with self._file_lock:
+            if self._pid != os.getpid():  # fork 뒤에는 다시 열기
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+                self._pid = os.getpid()
+            return self._fd
+
+    @contextmanager
+    def hold(self, key):
+        stripe = zlib.crc32(key.encode('utf-8')) % LOCK_STRIPES  # hash()는 프로세스마다 달라서 쓰면 안 됨
+        with self._locks[stripe]:
+            if self._depth[stripe] == 0:
+                fcntl.lockf(self._file(), fcntl.LOCK_EX, 1, stripe)
+            self._depth[stripe] += 1
+            try:
+                yield
+            finally:
+                self._depth[stripe] -= 1
+                if self._depth[stripe] == 0:
+                    fcntl.lockf(self._file(), fcntl.LOCK_UN, 1, stripe)
+
+
+class SQLiteNamespace(StateNamespace):
+    """SQLite(WAL) 네임스페이스 - 같은 DB 파일을 여는 모든 프로세스가 공유
+
+    저장 시각은 time.time() (프로세스 간 비교), 값은 pickle (서버 워커끼리만 쓰는 파일), 키는 문자열로 저장
+    """
+
+    def __init__(self, name, backend, **limits):
+        super().__init__(name, **limits)
+        self._backend = backend
+        self._next_maintenance = 0.0
+        self._maintenance_lock = threading.Lock()
+
+    def _expired(self, touched, now):
+        return self.ttl is not None and now - touched > self.ttl
+
+    def get(self, key, default=None):
+        key = str(key)
+        row = self._backend.connection().execute(
+            'SELECT value, touched FROM state WHERE namespace = ? AND key = ?', (self.name, key)).fetchone()
+        if row is None or self._expired(row[1], time.time()):
+            return default
+        return pickle.loads(row[0])
+
+    def set(self, key, value):
+        key = str(key)
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        conn = self._backend.connection()
+        with conn:
+            conn.execute('INSERT OR REPLACE INTO state (namespace, key, value, size, touched) VALUES (?, ?, ?, ?, ?)',
+                         (self.name, key, blob, len(blob), time.time()))
+        self._maintain(key)
+
+    def delete(self, key):
+        key = str(key)
+        conn = self._backend.connection()
+        with conn:
+            cursor = conn.execute('DELETE FROM state WHERE namespace = ? AND key = ?', (self.name, key))
+        return cursor.rowcount > 0
+
+    def keys(self):
+        rows = self._backend.connection().execute(
+            'SELECT key, touched FROM state WHERE namespace = ?', (self.name,)).fetchall()
+        now = time.time()
+        return [key for key, touched in rows if not self._expired(touched, now)]
+
+    @contextmanager
+    def transaction(self, key, factory=None):
+        key = str(key)
+        with self._backend.locks.hold(f'{self.name}/{key}'):
+            value = self.get(key)
+            created = value is None and factory is not None
+            if created:
+                value = factory()
+                self._count('created')
+            record = Record(value, created)
+            yield record
+            if record.value is None:
+                self.delete(key)
+            else:
+                self.set(key, record.value)
+
+    def _maintain(self, keep):
+        """만료 항목 삭제 + 항목 수/바이트 상한 (프로세스별로 MAINTENANCE_INTERVAL마다 한 번)"""
+        now = time.time()
+        with self._maintenance_lock:
+            if now < self._next_maintenance:
+                return
+            self._next_maintenance = now + MAINTENANCE_INTERVAL
+        conn = self._backend.connection()
+        with conn:
+            if self.ttl is not None:
+                cursor = conn.execute('DELETE FROM state WHERE namespace = ? AND touched < ? AND key != ?',
+                                      (self.name, now - self.ttl, keep))
+                self._count('expired', cursor.rowcount)
+            if self.max_entries is None and self.max_bytes is None:
+                return
+            rows = conn.execute('SELECT key, size FROM state WHERE namespace = ? ORDER BY touched DESC',
+                                (self.name,)).fetchall()
+            kept, total, victims = 0, 0, []
+            for key, size in rows:
+                if key != keep and kept >= 1 and (
+                        (self.max_entries is not None and kept >= self.max_entries)
+                        or (self.max_bytes is not None and total + size > self.max_bytes)):
+                    victims.append((self.name, key))
+                    continue
+                kept += 1
+                total += size
+            if victims:
+                conn.executemany('DELETE FROM state WHERE namespace = ? AND key = ?', victims)
+                self._count('evicted', len(victims))
+
+    def _usage(self):
+        row = self._backend.connection().execute(
+            'SELECT COUNT(*), COALESCE(SUM(size), 0) FROM state WHERE namespace = ?', (self.name,)).fetchone()
+        return row[0], row[1]
+
+
+class StateBackend:
+    """네임스페이스 모음 (같은 이름은 같은 네임스페이스 객체)"""
+
+    kind = None
+
+    def __init__(self):
+        self._namespaces = {}
+        self._lock = threading.Lock()
+
+    def _create(self, name, **limits):
+        raise NotImplementedError
+
+    def namespace(self, name, ttl=None, max_entries=None, max_bytes=None, sizeof=None):
+        with self._lock:
+            ns = self._namespaces.get(name)
+            if ns is None:
+                ns = self._namespaces[name] = self._create(name, ttl=ttl, max_entries=max_entries,
+                                                           max_bytes=max_bytes, sizeof=sizeof)
+            return ns
+
+    def get_stats(self):
+        with self._lock:
+            namespaces = list(self._namespaces.values())
+        return {'backend': self.kind, 'namespaces': {ns.name: ns.get_stats() for ns in namespaces}}
+
+
+class MemoryStateBackend(StateBackend):
+    kind = 'memory'
+
+    def _create(self, name, **limits):
+        return MemoryNamespace(name, **limits)
+
+
+class SQLiteStateBackend(StateBackend):
+    """같은 호스트 워커 간 공유 (WAL: 읽기는 쓰기를 기다리지 않음)"""
+
+    kind = 'sqlite'
+
+    def __init__(self, path=STATE_DB_PATH):
+        super().__init__()
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.locks = _StripeLocks(path + '.lock')
+        self._local = threading.local()
+        conn = self.connection()
+        with conn:
+            conn.execute('CREATE TABLE IF NOT EXISTS state ('
+                         'namespace TEXT NOT NULL, key TEXT NOT NULL, value BLOB NOT NULL, '
+                         'size INTEGER NOT NULL, touched REAL NOT NULL, PRIMARY KEY (namespace, key))')
+            conn.execute('CREATE INDEX IF NOT EXISTS state_touched ON state (namespace, touched)')
+
+    def connection(self):
+        """스레드별 연결 (fork 뒤에는 새로 연결)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10.0)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def _create(self, name, **limits):
+        return SQLiteNamespace(name, self, **limits)
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def create_state_backend(kind=STATE_BACKEND, path=STATE_DB_PATH):
+    if kind == 'memory':
+        return MemoryStateBackend()
+    if kind == 'sqlite':
+        return SQLiteStateBackend(path)
+    raise ValueError(f'알 수 없는 상태 백엔드: {kind} (memory | sqlite)')
+
+
+def get_state_backend():
+    """프로세스 공용 상태 백엔드 (처음 호출할 때 KSL_STATE_BACKEND로 생성)"""
+    global _backend
+    with _backend_lock:
+        if _backend is None:
+            _backend = create_state_backend()
+            print(f"✅ 상태 백엔드: {_backend.kind}" + (f" ({_backend.path})" if _backend.kind == 'sqlite' else ''))
+        return _backend
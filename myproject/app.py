@@ -5,21 +5,29 @@ import os
 sys.dont_write_bytecode = True
 os.environ['PYTHONDONTWRITEBYTECODE'] = '1'
 
-from flask import Flask, Response, jsonify, request
+from flask import Flask, Response, jsonify, request, abort, make_response
 import cv2
 import mediapipe as mp
-import numpy as np
 import time
-import tensorflow as tf
 from datetime import datetime
 from flask_cors import CORS
-from flask_jwt_extended import JWTManager
+from flask_jwt_extended import JWTManager, verify_jwt_in_request, get_jwt_identity
 from config import Config
 from auth.models import db
 from auth.routes import auth_bp, bcrypt
 from api.progress import progress_bp
 from api.learning import learning_bp
-from api.recognition import recognition_bp, ksl_model, labels_ksl, hands, mp_hands
+from api.recognition import recognition_bp, static_engine, static_batcher, hands_pool, mp_hands, landmark_points
+from api.frame_exchange import get_slot
+from api.camera_stream import get_broadcaster, get_all_stats as get_stream_stats, parse_profile, DEFAULT_PROFILE
+from api.image_ingest import decode_image_bytes, ImageTooLarge
+from api.recognition_events import recognition_channel, state_payload
+from api.roi_tracker import HandROITracker, get_roi_stats
+from api.frame_skip import FrameSkipper, get_skip_stats
+from api.frame_pipeline import FramePipeline, Stage, BufferRing, ring_size, get_all_stats as get_pipeline_stats
+from api.prediction_worker import PredictionWorker, register_worker, get_all_stats as get_worker_stats
+from api.session_state import SessionStore, SESSION_TTL
+from api.state_backend import get_state_backend
 from api.quiz import quiz_bp
 from api.jamo_decompose import jamo_decompose_bp
 from api.jamo_compose import jamo_compose_bp
@@ -59,11 +67,75 @@ app.register_blueprint(jamo_compose_bp)
 # MediaPipe 그리기 유틸리티
 mp_draw = mp.solutions.drawing_utils
 
-# ==== 인식 결과 저장 ====
-recognized_string = {"ksl": ""}
-latest_char = {"ksl": ""}
-last_recognized_char = {"ksl": ""}  # 이전 인식 문자
-last_recognized_time = {"ksl": 0}  # 이전 인식 시간
+# ==== 인식 결과 저장 (세션별) ====
+# 세션 키: 카메라 스트림은 "stream:<카메라 번호>", 로그인 사용자는 "user:<JWT identity>"
+# 세션마다 언어별 현재 문자 / 누적 문자열 / 쌍자음 대기 정보를 따로 가짐 (api/session_state.py)
+session_store = SessionStore()
+DEFAULT_STREAM_ID = '0'  # video_feed_ksl 기본 카메라
+# ?stream=으로 접근할 수 있는 카메라 스트림 ID (이 서버가 여는 카메라만, 쉼표 구분, 그 외는 403)
+STREAM_IDS = tuple(s.strip() for s in os.environ.get('KSL_STREAM_IDS', DEFAULT_STREAM_ID).split(',') if s.strip())
+# 로그인 사용자 → 보고 있는 카메라 스트림 ID (video_feed_ksl 또는 ?stream=으로 연결, 세션 TTL 동안 유지)
+stream_viewers = get_state_backend().namespace('stream_viewer', ttl=SESSION_TTL)
+
+
+def stream_session_key(camera_device):
+    return f'stream:{camera_device}'
+
+
+def request_identity():
+    """JWT 사용자 (토큰이 없거나 만료/잘못됐으면 None → 익명)"""
+    try:
+        verify_jwt_in_request(optional=True)
+        return get_jwt_identity()
+    except Exception:
+        return None
+
+
+def watch_stream(identity, stream_id):
+    """로그인 사용자를 보고 있는 스트림에 연결 (이후 stream 없이 호출해도 그 카메라의 인식 결과 사용)"""
+    stream_viewers.set(identity, str(stream_id))
+
+
+def resolve_session_key():
+    """요청의 세션 키: ?stream=<id> (또는 X-Stream-Id) > 로그인 사용자가 보고 있는 스트림 > 로그인 사용자 > 기본 카메라 스트림
+
+    stream은 STREAM_IDS(KSL_STREAM_IDS)에 있는 카메라만 허용 (다른 값은 403).
+    카메라 루프는 스트림 세션에만 쓰므로, 로그인 사용자가 카메라 화면을 보는 동안에는 그 스트림 세션을 읽고 쓴다.
+    로그인 없이 호출하는 기존 클라이언트는 기본 카메라 스트림 세션을 그대로 사용한다
+    """
+    identity = request_identity()
+    stream_id = request.args.get('stream') or request.headers.get('X-Stream-Id')
+    if stream_id:
+        if stream_id not in STREAM_IDS:
+            abort(make_response(jsonify({'error': f'알 수 없는 스트림입니다: {stream_id}'}), 403))
+        if identity is not None:
+            watch_stream(identity, stream_id)
+        return stream_session_key(stream_id)
+    if identity is not None:
+        watched = stream_viewers.get(identity)
+        if watched is not None:
+            return stream_session_key(watched)
+        return f'user:{identity}'
+    return stream_session_key(DEFAULT_STREAM_ID)
+
+
+# 세션 상태/푸시 채널을 만드는 <lang> 경로는 지원 언어만 받음 (그 외는 404, 임의 값으로 채널이 늘어나지 않게)
+SUPPORTED_LANGUAGES = ('asl', 'ksl')  # api/progress.py와 같은 목록
+LANG = f"<any({', '.join(SUPPORTED_LANGUAGES)}):lang>"
+
+
+def channel_key(session_key, lang):
+    """푸시 채널 키 (세션 + 언어)"""
+    return f'{session_key}/{lang}'
+
+
+def publish_recognition(session_key, lang):
+    """인식 결과를 푸시 채널에 반영 (값이 바뀐 경우에만 버전 증가 + SSE 이벤트)"""
+    current, accumulated = session_store.snapshot(session_key, lang)
+    return recognition_channel.publish(channel_key(session_key, lang), current, accumulated)
+
+# ==== 카메라 스트리밍 설정 ====
+STREAM_GRACE_PERIOD = float(os.environ.get('KSL_STREAM_GRACE_SEC', '5'))  # 마지막 시청자가 나간 뒤 카메라 유지 시간
 
 # ==== 쌍자음 매핑 ====
 DOUBLE_CONSONANT_MAP = {
@@ -76,13 +148,16 @@ DOUBLE_CONSONANT_MAP = {
 
 
 
-# ==== 현재 프레임 저장용 (파일 기반) ====
-import tempfile
-FRAME_CACHE_DIR = tempfile.gettempdir()  # /tmp 또는 시스템 임시 폴더
-
 # ==== 공통 영상 스트리밍 (H5 모델용) ====
-def generate_frames(model, labels, lang_key, camera_device=0):
-    global current_frame_cache
+MJPEG_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n'
+
+def capture_frames(engine, lang_key, camera_device=0):
+    """카메라 프레임 → 손 인식/추론 → 오버레이된 BGR 프레임 (카메라당 캡처 스레드 하나에서 실행)
+
+    내부는 캡처 → 랜드마크 → 렌더 단계별 스레드 파이프라인 (api/frame_pipeline.py) + 분류 전용 예측 워커
+    (api/prediction_worker.py)이고,
+    JPEG 인코딩은 시청자 프로필별로 camera_stream.ProfileEncoder가 담당
+    """
     # 카메라 열기 (macOS 호환성 개선)
     print(f"📷 카메라 {camera_device}번 열기 시도...")
     cap = cv2.VideoCapture(camera_device)
@@ -107,129 +182,213 @@ def generate_frames(model, labels, lang_key, camera_device=0):
     
     print(f"📷 카메라 설정 완료: {actual_width}x{actual_height} @ {actual_fps}fps")
 
-    last_prediction_time = 0
     prediction_interval = 0.15  # 0.15초마다 인식 (빠른 응답)
-    prev_idx = -1
-    consecutive_same = 0  # 연속 같은 결과 카운트
-    last_predicted_char = ""
     confidence_threshold = 0.6  # 신뢰도 임계값 상향
+    # seq: 랜드마크 단계 프레임 번호, cleared_seq: 손이 사라져 결과를 지운 프레임 번호
+    # (cleared_seq는 세션 락 안에서만 읽고 씀 - 예측 워커와 랜드마크 단계 사이)
+    classify_state = {'last_submit_time': 0, 'seq': 0, 'cleared_seq': 0}
+    session_key = stream_session_key(camera_device)
+    # 분류 입력 배열 (랜드마크를 바로 채워서 재사용, 예측 워커 스레드 전용)
+    input_buffer = engine.new_input_buffer()
     
-    # MediaPipe 항상 활성화 (성능 최적화)
-    print("🚀 MediaPipe 항상 활성화 모드")
+    frame_slot = get_slot(lang_key)
 
-    try:
+    # MediaPipe 항상 활성화 (성능 최적화)
+    # 스트림이 끝날 때까지 video 모드 인스턴스 하나를 전용으로 사용 (프레임 간 추적 유지)
+    hands = hands_pool.acquire('video')
+    # 직전 손 주변 ROI만 처리, 놓치면 축소한 전체 프레임으로 다시 검출
+    roi_tracker = HandROITracker(hands)
+    # 직전에 처리한 프레임과 장면이 거의 같으면 MediaPipe/분류를 건너뛰고 이전 결과 재사용
+    frame_skipper = FrameSkipper('stream')
+    print("🚀 MediaPipe 항상 활성화 모드 (손 ROI 추적)")
+
+    # 프레임 버퍼 링: 캡처/좌우 반전/RGB 변환 결과를 매 프레임 새로 만들지 않고 돌려 씀
+    # 링 버퍼는 파이프라인 안에서만 쓰고 (큐가 가장 오래된 프레임을 버리므로 살아 있는 프레임 수가 정해짐),
+    # 밖으로 나갈 때는 복사한다: 프레임 슬롯은 publish()에서, 시청자 프레임은 CameraBroadcaster에서
+    stage_count = 2  # 랜드마크 / 렌더 (분류는 예측 워커)
+    raw_ring = BufferRing(ring_size(1))
+    bgr_ring = BufferRing(ring_size(stage_count))
+    rgb_ring = BufferRing(ring_size(stage_count))
+    frame_shape = (actual_height, actual_width, 3)
+
+    # ---- 단계 1: 캡처 ----
+    def read_frames():
         while True:
-            ret, frame = cap.read()
+            ret, frame = cap.read(raw_ring.next(frame_shape))
             if not ret:
-                break
-
-            if len(frame.shape) == 2 or frame.shape[2] == 1:
-                frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
-
-            # 이미지 전처리 최적화
-            image = cv2.flip(frame, 1)  # 좌우 반전
-            rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-            current_time = time.time()
-            
-            # 현재 프레임을 파일로 저장 (API에서 사용)
-            frame_path = os.path.join(FRAME_CACHE_DIR, f'ksl_frame_{lang_key}.jpg')
-            cv2.imwrite(frame_path, image)
-
-            # MediaPipe 항상 활성화
-            result = hands.process(rgb_image)
-
-            if result.multi_hand_landmarks:
-                for hand_landmarks in result.multi_hand_landmarks:
-                    # 손 랜드마크 그리기
-                    mp_draw.draw_landmarks(image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
-
-                    if current_time - last_prediction_time >= prediction_interval:
-                        coords = [v for lm in hand_landmarks.landmark for v in (lm.x, lm.y)]
-                        input_data = np.array(coords, dtype=np.float32).reshape(1, -1)
-                        
-                        # 정규화 적용 (recognition.py와 동일)
-                        from api.recognition import ksl_norm_mean, ksl_norm_std
-                        if ksl_norm_mean is not None and ksl_norm_std is not None:
-                            input_data = (input_data - ksl_norm_mean) / ksl_norm_std
-                        
-                        prediction = model.predict(input_data, verbose=0)
-                        idx = np.argmax(prediction)
-                        confidence = float(np.max(prediction))
-
-                        # 신뢰도 임계값
-                        if 0 <= idx < len(labels) and confidence > confidence_threshold:
-                            predicted_char = labels[idx]
-                            
-                            # 즉시 업데이트 (빠른 응답)
-                            latest_char[lang_key] = predicted_char
-                            current_time_sec = time.time()
-                            time_diff = current_time_sec - last_recognized_time.get(lang_key, 0)
-                            
-                            # 쌍자음 처리 로직
-                            if (predicted_char in DOUBLE_CONSONANT_MAP and 
-                                predicted_char == last_recognized_char.get(lang_key, '') and 
-                                0.5 < time_diff < 3.0):
-                                
-                                # 쌍자음으로 변환
-                                double_char = DOUBLE_CONSONANT_MAP[predicted_char]
-                                latest_char[lang_key] = double_char
-                                print(f"🎯🎯 쌍자음: {predicted_char} + {predicted_char} → {double_char}")
-                                
-                                # 초기화
-                                last_recognized_char[lang_key] = ""
-                                last_recognized_time[lang_key] = 0
-                            else:
-                                # 일반 인식
-                                print(f"🎯 {predicted_char} 인식 (신뢰도: {confidence:.3f})")
-                                
-                                # 쌍자음 대기 정보 저장
-                                last_recognized_char[lang_key] = predicted_char
-                                last_recognized_time[lang_key] = current_time_sec
-                        else:
-                            latest_char[lang_key] = ""
-                            consecutive_same = 0
-                            last_predicted_char = ""
-
-                        prev_idx = idx
-                        last_prediction_time = current_time
+                return
+            yield frame
+
+    # ---- 단계 2: 전처리 + 랜드마크 ----
+    def landmark_stage(frame):
+        if len(frame.shape) == 2 or frame.shape[2] == 1:
+            frame = cv2.cvtColor(frame, cv2.COLOR_GRAY2BGR)
+
+        # 이미지 전처리 최적화 (미리 만든 버퍼에 바로 쓰기)
+        shape = frame.shape[:2] + (3,)
+        image = cv2.flip(frame, 1, dst=bgr_ring.next(shape))  # 좌우 반전
+        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb_ring.next(shape))
+        current_time = time.time()
+        
+        # MediaPipe 항상 활성화 (랜드마크는 전체 프레임 정규화 좌표로 반환됨)
+        landmark_start = time.perf_counter()
+        result = frame_skipper.check(rgb_image)
+        reused = result is not None
+        if not reused:
+            result = frame_skipper.store(roi_tracker.process(rgb_image))
+        landmark_ms = (time.perf_counter() - landmark_start) * 1000
+
+        # 현재 프레임과 랜드마크를 인식 API에 전달 (메모리 슬롯, 디스크 저장 없음)
+        frame_slot.publish(
+            rgb_image,
+            landmark_points(result.multi_hand_landmarks[0]) if result.multi_hand_landmarks else None,
+            current_time
+        )
+        packet = {'image': image, 'result': result, 'time': current_time, 'reused': reused,
+                  'landmark_ms': landmark_ms, 'roi': roi_tracker.box is not None}
+        post_prediction(packet)
+        return packet
+
+    # ---- 분류: 전용 워커 (최신 랜드마크만 처리, 스트림은 기다리지 않음) ----
+    def predict(hand_landmarks):
+        # 정규화 + 추론 (recognition.py의 추론 엔진 공유)
+        return engine.classify(hand_landmarks, out=input_buffer)
+
+    def apply_prediction(seq, output):
+        """예측 결과 → 인식 상태 갱신 (워커 스레드)"""
+        predicted_char, confidence, _ = output
+        with session_store.state(session_key, lang_key) as state:
+            if seq <= classify_state['cleared_seq']:
+                return  # 손이 사라진 뒤에 끝난 이전 프레임 결과는 버림
+
+            # 신뢰도 임계값
+            if predicted_char is not None and confidence > confidence_threshold:
+                
+                # 즉시 업데이트 (빠른 응답)
+                state.current = predicted_char
+                current_time_sec = time.time()
+                time_diff = current_time_sec - state.last_time
+                
+                # 쌍자음 처리 로직
+                if (predicted_char in DOUBLE_CONSONANT_MAP and 
+                    predicted_char == state.last_char and 
+                    0.5 < time_diff < 3.0):
+                    
+                    # 쌍자음으로 변환
+                    double_char = DOUBLE_CONSONANT_MAP[predicted_char]
+                    state.current = double_char
+                    print(f"🎯🎯 쌍자음: {predicted_char} + {predicted_char} → {double_char}")
+                    
+                    # 초기화
+                    state.last_char = ""
+                    state.last_time = 0
+                else:
+                    # 일반 인식
+                    print(f"🎯 {predicted_char} 인식 (신뢰도: {confidence:.3f})")
+                    
+                    # 쌍자음 대기 정보 저장
+                    state.last_char = predicted_char
+                    state.last_time = current_time_sec
             else:
-                # 손이 감지되지 않으면 초기화
-                latest_char[lang_key] = ""
-                consecutive_same = 0
-                last_predicted_char = ""
+                state.current = ""
+        publish_recognition(session_key, lang_key)
+
+    prediction_worker = register_worker(PredictionWorker(f'{lang_key}:{camera_device}', predict, apply_prediction))
+
+    def post_prediction(packet):
+        """랜드마크 단계 끝: prediction_interval마다 최신 랜드마크를 워커에 올림 (대기 중인 이전 입력은 덮어씀)"""
+        result = packet['result']
+        current_time = packet['time']
+        classify_state['seq'] += 1
+        seq = classify_state['seq']
+        if packet['reused']:
+            # 장면 변화 없음 → 이전 분류 결과 유지
+            return
+        if result.multi_hand_landmarks:
+            if current_time - classify_state['last_submit_time'] >= prediction_interval:
+                prediction_worker.submit(seq, result.multi_hand_landmarks[0])
+                classify_state['last_submit_time'] = current_time
+        else:
+            # 손이 감지되지 않으면 초기화
+            with session_store.state(session_key, lang_key) as state:
+                classify_state['cleared_seq'] = seq
+                state.current = ""
                 # 쌍자음 타이머는 유지 (손을 떼도 3초 이내면 쌍자음 가능)
+            publish_recognition(session_key, lang_key)
+
+    # ---- 단계 3: 렌더 (랜드마크/오버레이 그리기, JPEG 인코딩은 시청자 프로필별) ----
+    def render_stage(packet):
+        image = packet['image']
+        result = packet['result']
+        if result.multi_hand_landmarks:
+            for hand_landmarks in result.multi_hand_landmarks:
+                # 손 랜드마크 그리기
+                mp_draw.draw_landmarks(image, hand_landmarks, mp_hands.HAND_CONNECTIONS)
+
+        # 디버깅 정보 표시
+        hands_detected = "YES" if result.multi_hand_landmarks else "NO"
+        # 그 시점에 나와 있는 가장 최근 분류 결과로 그림
+        current_char, accumulated = session_store.snapshot(session_key, lang_key)
+        current_char = current_char if current_char else "None"
+        
+        # 상단: 현재 인식 결과
+        cv2.putText(image, f"Current: {current_char}", (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+        
+        # 중간: 손 감지 상태
+        landmark_mode = 'SKIP' if packet['reused'] else ('ROI' if packet['roi'] else 'FULL')
+        cv2.putText(image, f"Hands: {hands_detected} ({landmark_mode} {packet['landmark_ms']:.1f}ms)", (10, 60),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 0), 2)
+        
+        # 하단: 누적 문자열
+        accumulated = accumulated[:10]  # 처음 10글자만
+        cv2.putText(image, f"Text: {accumulated}", (10, 90),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
+        return image
+
+    # 단계마다 스레드 하나, 사이는 가장 오래된 프레임을 버리는 작은 큐
+    pipeline = FramePipeline(f'{lang_key}:{camera_device}', read_frames(), [
+        Stage('landmark', landmark_stage),
+        Stage('render', render_stage)
+    ])
+    frames = iter(pipeline)
+    prediction_worker.start()
 
-            # 디버깅 정보 표시
-            hands_detected = "YES" if result.multi_hand_landmarks else "NO"
-            current_char = latest_char[lang_key] if latest_char[lang_key] else "None"
-            
-            # 상단: 현재 인식 결과
-            cv2.putText(image, f"Current: {current_char}", (10, 30),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
-            
-            # 중간: 손 감지 상태
-            cv2.putText(image, f"Hands: {hands_detected}", (10, 60),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (255, 0, 0), 2)
-            
-            # 하단: 누적 문자열
-            accumulated = recognized_string[lang_key][:10]  # 처음 10글자만
-            cv2.putText(image, f"Text: {accumulated}", (10, 90),
-                        cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 0, 255), 2)
-
-            # JPEG 압축 최적화 (전송 속도 향상, 인식 정확도는 유지)
-            encode_param = [int(cv2.IMWRITE_JPEG_QUALITY), 75]
-            ret, buffer = cv2.imencode('.jpg', image, encode_param)
-            frame = buffer.tobytes()
-
-            yield (b'--frame\r\n'
-                   b'Content-Type: image/jpeg\r\n\r\n' + frame + b'\r\n')
+    try:
+        for image in frames:
+            yield image
 
     except GeneratorExit:
-        print("🛑 스트리밍 중단 감지: 클라이언트 연결 종료됨")
+        print("🛑 캡처 중단: 시청자 없음")
     finally:
+        # 파이프라인/예측 워커 스레드를 먼저 멈춘 뒤 카메라/Hands 반납
+        frames.close()
+        prediction_worker.stop()
         cap.release()
+        hands_pool.release('video', hands)
         print("✅ 카메라 자원 해제 완료")
 
+def generate_frames(engine, lang_key, camera_device=0, profile=DEFAULT_PROFILE):
+    """MJPEG 시청자 1명용 생성기
+
+    카메라는 (카메라 번호, 언어)마다 캡처 스레드 하나만 열고, 시청자는 그 스레드가 만든
+    최신 프레임만 받는다 (느린 시청자는 밀린 프레임 건너뜀).
+    JPEG는 프로필(width/quality/fps)마다 프레임당 한 번만 인코딩해서 같은 프로필 시청자와 공유한다.
+    """
+    broadcaster = get_broadcaster(
+        f'{lang_key}:{camera_device}',
+        lambda: capture_frames(engine, lang_key, camera_device),
+        STREAM_GRACE_PERIOD
+    )
+    try:
+        for frame in broadcaster.encoded_frames(profile):
+            # 헤더/JPEG/줄바꿈을 따로 보내서 프레임 바이트를 이어 붙이는 복사를 없앰 (JPEG는 같은 프로필 시청자와 공유)
+            yield MJPEG_PART_HEADER % len(frame)
+            yield frame
+            yield b'\r\n'
+    except GeneratorExit:
+        print("🛑 스트리밍 중단 감지: 클라이언트 연결 종료됨")
+
 # ==== 라우팅 ====
 @app.route('/')
 def index():
@@ -248,7 +407,7 @@ def index():
 
 @app.route('/video_feed_ksl')
 def video_feed_ksl():
-    if ksl_model is None:
+    if static_engine is None or hands_pool is None:
         return jsonify({'error': 'KSL 모델이 로드되지 않았습니다.'}), 503
     
     # 클라이언트 정보 확인 (에뮬레이터 vs 실제 기기)
@@ -285,34 +444,75 @@ def video_feed_ksl():
         camera_device = 0  # 실제 기기 전면 카메라
         print("✅ 실제 기기 감지 → 기기 전면 카메라 (0번) 사용")
     
-    print(f"📷 최종 선택된 카메라: {camera_device}번")
+    # 인코딩 프로필 (?width=320&quality=50&fps=10, 정해진 단계 중 가까운 값으로 맞춤)
+    profile = parse_profile(request.args)
+    
+    print(f"📷 최종 선택된 카메라: {camera_device}번 (프로필: {profile})")
     print("="*60)
     
-    return Response(generate_frames(ksl_model, labels_ksl, "ksl", camera_device),
+    # 토큰과 함께 열었으면 이 사용자의 인식 결과 조회를 이 카메라 스트림 세션에 연결
+    identity = request_identity()
+    if identity is not None:
+        watch_stream(identity, camera_device)
+    
+    return Response(generate_frames(static_engine, "ksl", camera_device, profile),
                     mimetype='multipart/x-mixed-replace; boundary=frame')
 
-@app.route('/api/recognition/current/<lang>')
-@app.route('/get_string/<lang>')  # 하위 호환성
+@app.route('/api/stream/status')
+def stream_status():
+    """카메라 캡처 스레드/시청자 상태 + 파이프라인 단계별 지연/큐 깊이 + 랜드마크 추출 시간/ROI 적중률 + 프레임 건너뛰기"""
+    return jsonify({'streams': get_stream_stats(), 'pipelines': get_pipeline_stats(), 'landmarks': get_roi_stats(),
+                    'frame_skip': get_skip_stats(), 'prediction_workers': get_worker_stats()})
+
+@app.route(f'/api/recognition/current/{LANG}')
+@app.route(f'/get_string/{LANG}')  # 하위 호환성
 def get_current_recognition(lang):
-    """현재 인식 결과 반환 (통합 API)"""
-    current_char = latest_char.get(lang, '')
-    accumulated_string = recognized_string.get(lang, '')
+    """현재 인식 결과 반환 (통합 API)
+
+    ?since=<version> (또는 If-None-Match)이 현재 버전 이상이면 본문 없이 304
+    """
+    session_key = resolve_session_key()
+    publish_recognition(session_key, lang)  # 다른 워커가 바꾼 상태도 반영 (값이 같으면 버전 그대로)
+    state = recognition_channel.snapshot(channel_key(session_key, lang))
+    etag = str(state.version)
+    since = request.args.get('since', type=int)
+    if (since is not None and since >= state.version) or etag in request.if_none_match:
+        response = Response(status=304)
+        response.set_etag(etag)
+        return response
     
-    # 디버깅 정보
-    print(f"📱 인식 결과 요청: {lang} - Current: '{current_char}', String: '{accumulated_string}'")
+    # 디버깅 정보 (변경이 있을 때만)
+    print(f"📱 인식 결과 요청: {lang} - Current: '{state.current}', String: '{state.accumulated}' (v{state.version})")
     
-    return jsonify({
-        # 새 API 형식
-        'current_character': current_char,
-        'accumulated_string': accumulated_string,
-        # 기존 API 형식 (하위 호환성)
-        'current': current_char,
-        'string': accumulated_string,
-        # 추가 정보
-        'timestamp': time.time(),
-        'language': lang,
-        'has_current': bool(current_char and current_char.strip())
-    })
+    response = jsonify(state_payload(lang, state))
+    response.set_etag(etag)
+    return response
+
+@app.route(f'/api/recognition/events/{LANG}')
+def recognition_events(lang):
+    """인식 결과 푸시 (Server-Sent Events) - latest_char/recognized_string이 바뀔 때만 이벤트
+
+    재접속 시 Last-Event-ID (또는 ?since=)부터 이어받음
+    """
+    since = request.args.get('since', type=int)
+    if since is None:
+        last_event_id = request.headers.get('Last-Event-ID', '')
+        since = int(last_event_id) if last_event_id.isdigit() else 0
+    session_key = resolve_session_key()
+    publish_recognition(session_key, lang)
+    key = channel_key(session_key, lang)
+    return Response(recognition_channel.events(key, since, label=lang), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/api/recognition/sessions/status')
+def recognition_sessions_status():
+    """세션별 인식 상태 저장소 (활성 세션 수, 추정 메모리, TTL/상한 제거 수) + 공유 상태 백엔드"""
+    return jsonify(dict(session_store.get_stats(), backend=get_state_backend().get_stats()))
+
+@app.route('/api/recognition/events/status')
+def recognition_events_status():
+    """푸시 채널 상태 (현재 버전, 구독자 수, 변경 횟수)"""
+    return jsonify(recognition_channel.get_stats())
 
 @app.route('/camera_info')
 def camera_info():
@@ -353,33 +553,50 @@ def health_check():
         'timestamp': datetime.utcnow().isoformat()
     }), 200
 
-@app.route('/add_char/<lang>')
+@app.route(f'/add_char/{LANG}')
 def add_char(lang):
-    if latest_char[lang] and latest_char[lang] not in ["ERR:IDX", "ERR:DIM", ""]:
-        recognized_string[lang] += latest_char[lang]
-        print(f"✅ 문자 추가: {latest_char[lang]} → {recognized_string[lang]}")
+    session_key = resolve_session_key()
+    with session_store.state(session_key, lang) as state:
+        added = state.current and state.current not in ["ERR:IDX", "ERR:DIM", ""]
+        if added:
+            state.append(state.current)
+            print(f"✅ 문자 추가 ({session_key}): {state.current} → {state.accumulated}")
+        current, accumulated = state.current, state.accumulated
+    if added:
+        publish_recognition(session_key, lang)
     return jsonify({
         'success': True, 
-        'current': latest_char[lang],
-        'accumulated': recognized_string[lang]
+        'current': current,
+        'accumulated': accumulated
     })
 
 
 
-@app.route('/remove_char/<lang>')
+@app.route(f'/remove_char/{LANG}')
 def remove_char(lang):
-    if recognized_string[lang]:
-        recognized_string[lang] = recognized_string[lang][:-1]
+    session_key = resolve_session_key()
+    with session_store.state(session_key, lang) as state:
+        removed = bool(state.accumulated)
+        if removed:
+            state.accumulated = state.accumulated[:-1]
+    if removed:
+        publish_recognition(session_key, lang)
     return jsonify({'success': True})
 
-@app.route('/clear_string/<lang>')
+@app.route(f'/clear_string/{LANG}')
 def clear_string(lang):
-    recognized_string[lang] = ""
+    session_key = resolve_session_key()
+    with session_store.state(session_key, lang) as state:
+        state.accumulated = ""
+    publish_recognition(session_key, lang)
     return jsonify({'success': True})
 
-@app.route('/upload_image/<lang>', methods=['POST'])
+UPLOAD_MAX_SIDE = 320  # 업로드 이미지 긴 변 (기존 320x240 리사이즈와 같은 수준)
+
+@app.route(f'/upload_image/{LANG}', methods=['POST'])
 def upload_image(lang):
     """디바이스 카메라에서 촬영한 이미지를 받아서 수어 인식 처리"""
+    session_key = resolve_session_key()  # 허용되지 않은 stream이면 403 (아래 except에 잡히지 않게 먼저)
     try:
         if 'image' not in request.files:
             return jsonify({'error': 'No image file provided'}), 400
@@ -388,23 +605,16 @@ def upload_image(lang):
         if file.filename == '':
             return jsonify({'error': 'No image file selected'}), 400
         
-        # 이미지 파일을 numpy 배열로 변환
-        import numpy as np
-        from PIL import Image
-        import io
-        
-        # 파일을 메모리에서 읽기
-        image_bytes = file.read()
-        image = Image.open(io.BytesIO(image_bytes))
-        
-        # OpenCV 형식으로 변환
-        image_array = np.array(image)
-        if len(image_array.shape) == 3 and image_array.shape[2] == 3:
-            # RGB to BGR 변환 (OpenCV는 BGR 사용)
-            image_array = cv2.cvtColor(image_array, cv2.COLOR_RGB2BGR)
+        # 파일을 메모리에서 읽어 RGB로 바로 디코딩 (큰 사진은 디코딩 단계에서 축소)
+        try:
+            image_rgb = decode_image_bytes(file.read(), max_side=UPLOAD_MAX_SIDE)
+        except ImageTooLarge as e:
+            return jsonify({'error': str(e)}), 413
+        if image_rgb is None:
+            return jsonify({'error': 'Invalid image file'}), 400
         
         # 수어 인식 처리
-        result = process_uploaded_image(image_array, lang)
+        result = process_uploaded_image(image_rgb, lang, session_key)
         
         return jsonify({
             'success': True,
@@ -416,48 +626,32 @@ def upload_image(lang):
         print(f"❌ 이미지 업로드 처리 실패: {e}")
         return jsonify({'error': str(e)}), 500
 
-def process_uploaded_image(image, lang):
-    """업로드된 이미지에서 수어 인식 처리"""
+def process_uploaded_image(image_rgb, lang, session_key):
+    """업로드된 이미지(RGB)에서 수어 인식 처리 (결과는 session_key 세션의 현재 문자로 저장)"""
     try:
-        # 언어별 모델 선택
+        # 언어별 추론 엔진 선택
         if lang == 'ksl':
-            model = ksl_model
-            labels = labels_ksl
+            engine = static_batcher or static_engine  # 업로드 요청은 요청 간 배치 사용
         else:
             # ASL 모델이 있다면 여기서 처리
             return {'character': '', 'confidence': 0.0}
         
-        if model is None:
+        if engine is None:
             return {'character': '', 'confidence': 0.0}
         
-        # 이미지 크기 조정
-        image = cv2.resize(image, (320, 240))
-        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
-        # MediaPipe로 손 랜드마크 추출
-        result = hands.process(rgb_image)
+        # MediaPipe로 손 랜드마크 추출 (크기 조정은 디코딩 단계에서 처리)
+        result = hands_pool.process(image_rgb, 'image')
         
         if result.multi_hand_landmarks:
             for hand_landmarks in result.multi_hand_landmarks:
-                # 좌표 추출
-                coords = [v for lm in hand_landmarks.landmark for v in (lm.x, lm.y)]
-                input_data = np.array(coords, dtype=np.float32).reshape(1, -1)
-                
-                # 정규화 적용
-                from api.recognition import ksl_norm_mean, ksl_norm_std
-                if ksl_norm_mean is not None and ksl_norm_std is not None:
-                    input_data = (input_data - ksl_norm_mean) / ksl_norm_std
-                
-                # 모델 추론 (H5 모델)
-                prediction = model.predict(input_data, verbose=0)
-                
-                idx = np.argmax(prediction)
-                confidence = float(np.max(prediction))
+                # 좌표 추출 + 정규화 + 모델 추론 (추론 엔진)
+                character, confidence, _ = engine.classify(hand_landmarks)
                 
-                if 0 <= idx < len(labels):
-                    character = labels[idx]
+                if character is not None:
                     # 전역 변수 업데이트
-                    latest_char[lang] = character
+                    with session_store.state(session_key, lang) as state:
+                        state.current = character
+                    publish_recognition(session_key, lang)
                     return {'character': character, 'confidence': confidence}
         
         return {'character': '', 'confidence': 0.0}
@@ -470,5 +664,7 @@ def process_uploaded_image(image, lang):
 
 if __name__ == '__main__':
     # 실제 기기에서 접근 가능하도록 0.0.0.0으로 바인딩
-    # debug=False: 프로세스 1개만 실행 (캐시 공유 문제 해결)
+    # debug=False: 리로더 프로세스 없이 1개만 실행
+    # 여러 워커로 실행하려면 KSL_STATE_BACKEND=sqlite로 상태를 공유하고 WSGI 서버 사용 (예: gunicorn -w 4 -b 0.0.0.0:5002 app:app)
+    # 카메라 스트림/이미지 없는 analyze-hand의 최신 프레임, SSE 푸시는 워커(프로세스)별이다
     app.run(debug=False, host='0.0.0.0', port=5002)
\ No newline at end of file
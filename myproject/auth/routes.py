@@ -3,6 +3,8 @@ from flask import Blueprint, request, jsonify
 from flask_bcrypt import Bcrypt
 from flask_jwt_extended import create_access_token, jwt_required, get_jwt_identity
 from .models import db, User, Progress
+from config import Config
+from api.state_backend import get_state_backend
 from datetime import datetime
 import re
 
@@ -231,8 +233,20 @@ def login():
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
-# JWT 블랙리스트 (메모리 기반 - 실제 운영에서는 Redis 등 사용 권장)
-blacklisted_tokens = set()
+# JWT 블랙리스트 (공유 상태 백엔드 - KSL_STATE_BACKEND=sqlite면 모든 워커가 같은 목록을 봄)
+class TokenBlocklist:
+    """로그아웃한 토큰 jti 목록 (set처럼 add / in 사용), 토큰 만료 시간이 지나면 자동으로 빠짐"""
+
+    def __init__(self, backend, ttl):
+        self._tokens = backend.namespace('token_blocklist', ttl=ttl)
+
+    def add(self, jti):
+        self._tokens.set(jti, True)
+
+    def __contains__(self, jti):
+        return self._tokens.get(jti) is not None
+
+blacklisted_tokens = TokenBlocklist(get_state_backend(), Config.JWT_ACCESS_TOKEN_EXPIRES.total_seconds())
 
 @auth_bp.route('/api/auth/change-password', methods=['POST'])
 @jwt_required()
@@ -8,3 +8,5 @@ class Config:
     SQLALCHEMY_TRACK_MODIFICATIONS = False
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY') or 'jwt-secret-string'
     JWT_ACCESS_TOKEN_EXPIRES = timedelta(hours=24)
+    # 요청 본문 최대 크기 (초과 시 413), 이미지 1장 제한은 api/image_ingest.py의 KSL_MAX_IMAGE_BYTES
+    MAX_CONTENT_LENGTH = int(os.environ.get('MAX_CONTENT_LENGTH', str(32 * 1024 * 1024)))
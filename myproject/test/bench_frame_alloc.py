@@ -0,0 +1,111 @@
+"""
+카메라 스트림 프레임 경로 메모리 할당 벤치마크 (tracemalloc)
+기존 경로: cv2.flip/cvtColor 새 배열 → 42개 좌표 리스트 → np.asarray → 정규화 새 배열 → multipart 이어 붙이기
+새 경로:   BufferRing 버퍼에 flip/cvtColor(dst) → 미리 만든 입력 배열에 랜드마크 채우기 + 제자리 정규화
+           → multipart 헤더/JPEG 따로 전송
+
+카메라/MediaPipe 없이 640x480 합성 프레임과 가짜 랜드마크로 측정한다
+(MediaPipe/JPEG 인코딩 내부 할당은 양쪽이 같으므로 제외).
+실행: python test/bench_frame_alloc.py [프레임 수]
+"""
+import sys
+import os
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+# 상위 디렉토리(myproject)를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+from api.recognition import InferenceEngine
+from api.model_backends import NumpyMLPBackend
+from api.frame_pipeline import BufferRing, ring_size
+
+MJPEG_PART_HEADER = b'--frame\r\nContent-Type: image/jpeg\r\nContent-Length: %d\r\n\r\n'
+
+
+def make_engine(rng):
+    """정적 모델과 같은 입력(42) 구조의 임의 가중치 엔진 (모델 파일 없이 측정)"""
+    sizes = [42, 256, 128, 64, 32, 31]
+    weights = [rng.standard_normal((a, b)).astype(np.float32) * 0.1 for a, b in zip(sizes, sizes[1:])]
+    biases = [np.zeros(b, dtype=np.float32) for b in sizes[1:]]
+    activations = ['relu'] * (len(weights) - 1) + ['softmax']
+    labels = [str(i) for i in range(sizes[-1])]
+    return InferenceEngine(NumpyMLPBackend(weights, biases, activations), labels,
+                           rng.random(42).astype(np.float32), rng.random(42).astype(np.float32) + 0.5)
+
+
+def make_hand(rng):
+    """MediaPipe 손 랜드마크와 같은 모양 (landmark[i].x/.y)"""
+    return SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y)) for x, y in rng.random((21, 2))])
+
+
+def old_path(frame, hand, engine, jpeg):
+    image = cv2.flip(frame, 1)
+    rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
+    engine.classify(hand)
+    return rgb_image, b'--frame\r\nContent-Type: image/jpeg\r\n\r\n' + jpeg + b'\r\n'
+
+
+def make_new_path(engine):
+    bgr_ring = BufferRing(ring_size(3))
+    rgb_ring = BufferRing(ring_size(3))
+    input_buffer = engine.new_input_buffer()
+
+    def new_path(frame, hand, engine, jpeg):
+        image = cv2.flip(frame, 1, dst=bgr_ring.next(frame.shape))
+        rgb_image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=rgb_ring.next(frame.shape))
+        engine.classify(hand, out=input_buffer)
+        return rgb_image, (MJPEG_PART_HEADER % len(jpeg), jpeg, b'\r\n')
+    return new_path
+
+
+def measure(path, frames, hand, engine, jpeg):
+    """프레임마다 (새로 할당된 최대 바이트, 새로 생긴 1KB 이상 블록 수), 전체 시간"""
+    # 워밍업 (링 버퍼/지연 초기화는 첫 바퀴에만)
+    for frame in frames:
+        path(frame, hand, engine, jpeg)
+
+    peaks, blocks = [], []
+    tracemalloc.start()
+    start = time.perf_counter()
+    for frame in frames:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        keep = path(frame, hand, engine, jpeg)
+        peaks.append(tracemalloc.get_traced_memory()[1] - base)
+        after = tracemalloc.take_snapshot()
+        blocks.append(sum(stat.count_diff for stat in after.compare_to(before, 'traceback')
+                          if stat.size_diff >= 1024 and stat.count_diff > 0))
+        del keep
+    elapsed = (time.perf_counter() - start) * 1000 / len(frames)
+    tracemalloc.stop()
+    return np.array(peaks), np.array(blocks), elapsed
+
+
+def run_benchmark(count=30):
+    rng = np.random.default_rng(0)
+    engine = make_engine(rng)
+    hand = make_hand(rng)
+    frames = [rng.integers(0, 255, (480, 640, 3), dtype=np.uint8) for _ in range(count)]
+    _, buffer = cv2.imencode('.jpg', frames[0], [int(cv2.IMWRITE_JPEG_QUALITY), 75])
+    jpeg = buffer.tobytes()
+
+    print(f"\n=== 프레임 경로 할당 벤치마크 (640x480, {count}프레임, JPEG {len(jpeg) / 1024:.0f} KB) ===")
+    results = {
+        '기존 경로': measure(old_path, frames, hand, engine, jpeg),
+        '새 경로 (버퍼 재사용)': measure(make_new_path(engine), frames, hand, engine, jpeg)
+    }
+    for name, (peaks, blocks, elapsed) in results.items():
+        print(f"{name:<22} 프레임당 할당 최대 {peaks.mean() / 1024:9.1f} KB | "
+              f"새 1KB+ 블록 {blocks.mean():5.1f}개 | (tracemalloc 포함) {elapsed:6.2f} ms")
+
+    old_peak, new_peak = results['기존 경로'][0].mean(), results['새 경로 (버퍼 재사용)'][0].mean()
+    print(f"\n⚡ 프레임당 할당 {old_peak / max(new_peak, 1):.0f}배 감소")
+
+
+if __name__ == '__main__':
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 30)
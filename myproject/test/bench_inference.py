@@ -0,0 +1,69 @@
+"""
+정적 모델 추론 마이크로벤치마크
+model.predict() vs InferenceEngine.classify() 호출당 지연 시간 비교
+
+실행: python test/bench_inference.py [반복 횟수]
+백엔드 비교: KSL_STATIC_BACKEND=tflite-int8 python test/bench_inference.py
+"""
+import sys
+import os
+import time
+
+# 상위 디렉토리(myproject)를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from api import recognition
+
+
+def measure(fn, iterations):
+    """fn을 iterations번 호출하고 호출당 지연 시간(ms) 목록 반환"""
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.array(timings)
+
+
+def report(name, timings):
+    print(f"{name:<28} 평균 {timings.mean():8.3f} ms | "
+          f"p50 {np.percentile(timings, 50):8.3f} ms | "
+          f"p99 {np.percentile(timings, 99):8.3f} ms")
+
+
+def run_benchmark(iterations=500):
+    engine = recognition.static_engine
+    if engine is None:
+        print("❌ 정적 모델이 로드되지 않았습니다. model/ 폴더를 확인하세요.")
+        return
+
+    import tensorflow as tf
+    model = tf.keras.models.load_model(recognition.KSL_MODEL_PATH)
+
+    rng = np.random.default_rng(0)
+    coords = rng.random(engine.input_shape, dtype=np.float32)
+
+    def keras_predict():
+        input_data = coords.reshape(1, -1)
+        if engine.norm_mean is not None and engine.norm_std is not None:
+            input_data = (input_data - engine.norm_mean) / engine.norm_std
+        model.predict(input_data, verbose=0)
+
+    def engine_classify():
+        engine.classify(coords)
+
+    # 워밍업
+    measure(keras_predict, 10)
+    measure(engine_classify, 10)
+
+    print(f"\n=== 정적 모델 추론 벤치마크 ({iterations}회, 백엔드: {engine.backend.name}) ===")
+    predict_ms = measure(keras_predict, iterations)
+    classify_ms = measure(engine_classify, iterations)
+    report("model.predict()", predict_ms)
+    report("InferenceEngine.classify()", classify_ms)
+    print(f"\n⚡ 호출당 평균 {predict_ms.mean() / classify_ms.mean():.1f}배 빠름")
+
+
+if __name__ == '__main__':
+    run_benchmark(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
@@ -0,0 +1,90 @@
+"""
+이미지 입력 디코딩 + 손 랜드마크 벤치마크 (12MP 업로드 기준)
+기존 경로: PIL 디코딩 → NumPy → RGB→BGR → BGR→RGB → MediaPipe (원본 해상도)
+새 경로:   api/image_ingest.py (cv2 축소 디코딩 → RGB) → MediaPipe
+
+실행: python test/bench_ingest.py [JPEG 경로] [반복 횟수]
+JPEG 경로를 주지 않으면 4000x3000 합성 이미지를 사용 (실제 손 사진을 쓰면 랜드마크 단계까지 의미 있게 비교됨)
+"""
+import sys
+import os
+import io
+import time
+
+# 상위 디렉토리(myproject)를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+from PIL import Image
+from api.image_ingest import decode_image_bytes, MAX_IMAGE_SIDE
+
+
+def load_jpeg(path=None):
+    """벤치마크용 JPEG 바이트 (경로가 없으면 4000x3000 합성 이미지)"""
+    if path:
+        with open(path, 'rb') as f:
+            return f.read()
+    rng = np.random.default_rng(0)
+    image = cv2.GaussianBlur(rng.integers(0, 255, (3000, 4000, 3), dtype=np.uint8), (0, 0), 3)
+    _, buffer = cv2.imencode('.jpg', image, [int(cv2.IMWRITE_JPEG_QUALITY), 90])
+    return buffer.tobytes()
+
+
+def old_decode(data):
+    """기존 decode_base64_image + 호출부의 BGR→RGB 변환"""
+    pil_image = Image.open(io.BytesIO(data))
+    bgr = cv2.cvtColor(np.array(pil_image), cv2.COLOR_RGB2BGR)
+    return cv2.cvtColor(bgr, cv2.COLOR_BGR2RGB)
+
+
+def measure(fn, iterations):
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter()
+        fn()
+        timings.append((time.perf_counter() - start) * 1000)
+    return np.array(timings)
+
+
+def report(name, timings):
+    print(f"{name:<32} 평균 {timings.mean():8.2f} ms | "
+          f"p50 {np.percentile(timings, 50):8.2f} ms | "
+          f"p99 {np.percentile(timings, 99):8.2f} ms")
+
+
+def run_benchmark(path=None, iterations=20):
+    data = load_jpeg(path)
+    width, height = Image.open(io.BytesIO(data)).size
+    print(f"\n=== 이미지 입력 벤치마크 ({width}x{height}, {len(data) / 1024 / 1024:.1f} MB, {iterations}회) ===")
+
+    old_rgb = old_decode(data)
+    new_rgb = decode_image_bytes(data)
+    print(f"디코딩 결과: 기존 {old_rgb.shape[1]}x{old_rgb.shape[0]} → 새 경로 {new_rgb.shape[1]}x{new_rgb.shape[0]} (최대 변 {MAX_IMAGE_SIDE})")
+
+    old_ms = measure(lambda: old_decode(data), iterations)
+    new_ms = measure(lambda: decode_image_bytes(data), iterations)
+    report("디코딩 (기존 PIL)", old_ms)
+    report("디코딩 (image_ingest)", new_ms)
+
+    # MediaPipe가 설치돼 있으면 랜드마크까지 포함해서 측정 (static_image_mode, 매번 새로 검출)
+    try:
+        import mediapipe as mp
+    except ImportError:
+        print("\n⚠️ mediapipe 없음 - 디코딩만 비교")
+        print(f"\n⚡ 디코딩 평균 {old_ms.mean() / new_ms.mean():.1f}배 빠름")
+        return
+
+    with mp.solutions.hands.Hands(static_image_mode=True, max_num_hands=2) as hands:
+        hands.process(new_rgb)  # 워밍업
+        old_total = measure(lambda: hands.process(old_decode(data)), iterations)
+        new_total = measure(lambda: hands.process(decode_image_bytes(data)), iterations)
+    report("디코딩+랜드마크 (기존)", old_total)
+    report("디코딩+랜드마크 (image_ingest)", new_total)
+    print(f"\n⚡ 디코딩+랜드마크 평균 {old_total.mean() / new_total.mean():.1f}배 빠름")
+
+
+if __name__ == '__main__':
+    jpeg_path = sys.argv[1] if len(sys.argv) > 1 and not sys.argv[1].isdigit() else None
+    count = next((int(a) for a in sys.argv[1:] if a.isdigit()), 20)
+    run_benchmark(jpeg_path, count)
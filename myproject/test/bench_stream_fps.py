@@ -0,0 +1,132 @@
+"""
+스트림 FPS 벤치마크: 분류를 스트림 루프 안에서 직접 호출 vs 예측 워커 (api/prediction_worker.py)
+녹화된 영상을 카메라 대신 재생해서 손이 보일 때/안 보일 때의 FPS와 프레임 시간 p99를 비교한다.
+
+실행: python test/bench_stream_fps.py [영상 경로]
+  영상 + MediaPipe + 정적 모델이 있으면 실제 손 인식/분류로 측정
+  영상이 없으면 합성 재생: 2초마다 손 있음/없음이 바뀌고, 랜드마크/분류 시간은
+  KSL_BENCH_LANDMARK_MS / KSL_BENCH_MODEL_MS (기본 8ms / 30ms, Keras predict 수준)로 흉내 낸다
+"""
+import sys
+import os
+import time
+from types import SimpleNamespace
+
+# 상위 디렉토리(myproject)를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import cv2
+import numpy as np
+from api.prediction_worker import PredictionWorker
+
+PREDICTION_INTERVAL = 0.15  # app.py 스트림과 같은 분류 간격
+SIM_LANDMARK_MS = float(os.environ.get('KSL_BENCH_LANDMARK_MS', '8'))
+SIM_MODEL_MS = float(os.environ.get('KSL_BENCH_MODEL_MS', '30'))
+
+
+def replay_video(path):
+    """영상 파일 프레임 (카메라처럼 좌우 반전 전 BGR)"""
+    cap = cv2.VideoCapture(path)
+    frames = []
+    while True:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def real_pipeline(frames):
+    """MediaPipe video 모드 + 정적 모델 (전체 환경에서만)"""
+    import mediapipe as mp
+    from api import recognition
+    engine = recognition.static_engine
+    if engine is None:
+        raise RuntimeError("정적 모델이 로드되지 않았습니다")
+    hands = mp.solutions.hands.Hands(static_image_mode=False, max_num_hands=1)
+
+    def detect(frame):
+        result = hands.process(cv2.cvtColor(cv2.flip(frame, 1), cv2.COLOR_BGR2RGB))
+        return result.multi_hand_landmarks[0] if result.multi_hand_landmarks else None
+
+    return detect, engine.classify
+
+
+def simulated_pipeline(fps=30):
+    """합성 재생: 2초 간격으로 손 있음/없음, 랜드마크/분류 시간은 sleep으로 흉내"""
+    rng = np.random.default_rng(0)
+    hand = SimpleNamespace(landmark=[SimpleNamespace(x=float(x), y=float(y)) for x, y in rng.random((21, 2))])
+    state = {'frame': 0}
+
+    def detect(frame):
+        state['frame'] += 1
+        time.sleep(SIM_LANDMARK_MS / 1000)
+        return hand if (state['frame'] // (2 * fps)) % 2 else None
+
+    def classify(landmarks):
+        time.sleep(SIM_MODEL_MS / 1000)
+        return 'ㄱ', 0.9, None
+
+    return detect, classify
+
+
+def run_stream(frames, detect, classify, use_worker):
+    """스트림 루프 1회 재생 → (프레임 시간 ms 배열, 손 있음 여부 배열)"""
+    latest = {'char': ''}
+
+    def apply(seq, output):
+        latest['char'] = output[0] or ''
+
+    worker = PredictionWorker('bench', classify, apply).start() if use_worker else None
+    last_prediction = 0.0
+    timings, has_hand = [], []
+    try:
+        for seq, frame in enumerate(frames, 1):
+            start = time.perf_counter()
+            hand_landmarks = detect(frame)
+            now = time.time()
+            if hand_landmarks is not None and now - last_prediction >= PREDICTION_INTERVAL:
+                if worker:
+                    worker.submit(seq, hand_landmarks)
+                else:
+                    apply(seq, classify(hand_landmarks))
+                last_prediction = now
+            image = frame.copy()
+            cv2.putText(image, f"Current: {latest['char']}", (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 0.7, (0, 255, 0), 2)
+            timings.append((time.perf_counter() - start) * 1000)
+            has_hand.append(hand_landmarks is not None)
+    finally:
+        if worker:
+            worker.stop()
+    return np.array(timings), np.array(has_hand)
+
+
+def report(name, timings, has_hand):
+    for label, mask in (('손 있음', has_hand), ('손 없음', ~has_hand)):
+        if not mask.any():
+            continue
+        t = timings[mask]
+        print(f"{name:<14} {label}: {1000 / t.mean():6.1f} fps | 평균 {t.mean():6.2f} ms | "
+              f"p99 {np.percentile(t, 99):6.2f} ms | 최대 {t.max():6.2f} ms ({mask.sum()}프레임)")
+
+
+def run_benchmark(path=None):
+    if path:
+        frames = replay_video(path)
+        detect, classify = real_pipeline(frames)
+        print(f"\n=== 스트림 FPS 벤치마크 (영상 재생: {path}, {len(frames)}프레임) ===")
+    else:
+        frames = [np.zeros((480, 640, 3), dtype=np.uint8)] * 240
+        detect, classify = simulated_pipeline()
+        print(f"\n=== 스트림 FPS 벤치마크 (합성 재생 {len(frames)}프레임, 랜드마크 {SIM_LANDMARK_MS:g}ms / 분류 {SIM_MODEL_MS:g}ms) ===")
+
+    for name, use_worker in (('직접 호출', False), ('예측 워커', True)):
+        if not path:
+            detect, classify = simulated_pipeline()
+        timings, has_hand = run_stream(frames, detect, classify, use_worker)
+        report(name, timings, has_hand)
+
+
+if __name__ == '__main__':
+    run_benchmark(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,223 @@
+"""
+학습/서버 특징 일치 테스트 (api/features.py)
+수집(capture_sequence.py) → CSV → 학습 로더(read_sequence_csv)로 읽은 시퀀스 특징과
+서버 코드(api/recognition.py의 analyze_sequence_clip / update_sequence_buffer, 정적 모델 입력 변환)가
+같은 랜드마크로 만든 모델 입력이 비트 단위로 같은지 확인한다. 모델 대신 입력을 기록하는 가짜 엔진을 넣는다.
+서버 없이 실행: python test/test_features_parity.py (서버 패키지 + pandas 필요, 모델 파일은 필요 없음)
+"""
+import sys
+import os
+import csv
+import tempfile
+
+# 상위 디렉토리(myproject)를 Python 경로에 추가
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from api.features import (SEQUENCE_LANDMARKS, SEQUENCE_LANDMARK_NAMES, STATIC_FEATURE_DIM,
+                          sequence_features, read_sequence_csv)
+from api import recognition
+
+CSV_FIELDS = ["frame", "landmark_id", "name", "x", "y", "visibility", "dx", "dy", "spd_sum"]
+
+
+def make_clip(rng, frames=16, miss_every=5):
+    """MediaPipe처럼 float32 정밀도의 (21, 2) 랜드마크 프레임들 (miss_every마다 손 없음)"""
+    base = rng.random((21, 2)).astype(np.float32)
+    clip = []
+    for fi in range(frames):
+        if miss_every and fi % miss_every == miss_every - 1:
+            clip.append((fi, None))
+            continue
+        points = (base + rng.normal(0, 0.02, (21, 2))).astype(np.float32)
+        clip.append((fi, points))
+    return clip
+
+
+def legacy_capture_rows(clip):
+    """기존 capture_sequence.py의 행 단위 계산 (파이썬 float, 랜드마크별 prev_xy)"""
+    rows, prev_xy = [], {}
+    for fi, points in clip:
+        if points is None:
+            continue
+        cur_frame_rows, spd_sum_total = [], 0.0
+        for lm_id, lm_name in SEQUENCE_LANDMARK_NAMES.items():
+            x, y = float(points[lm_id][0]), float(points[lm_id][1])
+            dx = dy = 0.0
+            if lm_id in prev_xy:
+                dx = x - prev_xy[lm_id][0]
+                dy = y - prev_xy[lm_id][1]
+            spd_sum_total += abs(dx) + abs(dy)
+            cur_frame_rows.append({"frame": fi, "landmark_id": lm_id, "name": lm_name, "x": x, "y": y,
+                                   "visibility": 1.0, "dx": dx, "dy": dy, "spd_sum": None})
+            prev_xy[lm_id] = (x, y)
+        for r in cur_frame_rows:
+            r["spd_sum"] = spd_sum_total
+        rows.extend(cur_frame_rows)
+    return rows
+
+
+def capture_rows(clip):
+    """현재 capture_sequence.py: 클립 전체를 sequence_features(dtype=float64)로 계산"""
+    frames = [(fi, points) for fi, points in clip if points is not None]
+    features = sequence_features(np.stack([p for _, p in frames]), dtype=np.float64)
+    features = features.reshape(len(frames), len(SEQUENCE_LANDMARKS), -1)
+    rows = []
+    for (fi, _), frame_features in zip(frames, features):
+        for lm_id, (x, y, dx, dy, spd_sum) in zip(SEQUENCE_LANDMARKS, frame_features.tolist()):
+            rows.append({"frame": fi, "landmark_id": lm_id, "name": SEQUENCE_LANDMARK_NAMES[lm_id], "x": x, "y": y,
+                         "visibility": 1.0, "dx": dx, "dy": dy, "spd_sum": spd_sum})
+    return rows
+
+
+def train_features(rows):
+    """CSV로 쓰고 학습 로더(read_sequence_csv)로 다시 읽기"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "clip.csv")
+        with open(path, "w", newline="", encoding="utf-8") as wf:
+            writer = csv.DictWriter(wf, fieldnames=CSV_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+        return read_sequence_csv(path)
+
+
+class RecordingEngine:
+    """모델 대신 입력을 기록하는 추론 엔진 (classify_with가 호출)"""
+
+    def __init__(self):
+        self.inputs = []
+
+    def classify(self, landmarks, out=None):
+        self.inputs.append(np.array(landmarks, dtype=np.float32))
+        return "ㄲ", 1.0, None
+
+
+def use_engine(max_timesteps):
+    """서버 시퀀스 모델 전역을 가짜 엔진으로 교체 (배치 없음)"""
+    engine = RecordingEngine()
+    recognition.seq_engine = engine
+    recognition.seq_batcher = None
+    recognition.seq_max_timesteps = max_timesteps
+    return engine
+
+
+def hand_points(clip):
+    return [points for _, points in clip if points is not None]
+
+
+def serve_clip_features(clip, max_timesteps=None):
+    """서버 analyze_sequence_clip이 모델에 넘기는 입력 (max_timesteps, 10)"""
+    points = hand_points(clip)
+    engine = use_engine(max_timesteps or len(points))
+    recognition.analyze_sequence_clip(points, "ㄲ", "ksl")
+    assert len(engine.inputs) == 1, "클립 분석은 추론 1회"
+    return engine.inputs[0]
+
+
+def serve_stream_features(clip, max_timesteps=None):
+    """서버 update_sequence_buffer(분석 폴링)에 프레임을 하나씩 넣고, 마지막 프레임의 모델 입력 (max_timesteps, 10)
+
+    손이 없는 프레임은 넣지 않는다 (서버는 손이 없으면 버퍼를 비우고, 학습 CSV도 손이 없는 프레임을 기록하지 않음).
+    """
+    points = hand_points(clip)
+    use_engine(max_timesteps or len(points))
+    entry = recognition.new_sequence_entry("ㄲ")
+    seq_input = None
+    for frame in points:
+        _, seq_input, _ = recognition.update_sequence_buffer(entry, frame, "ㄲ", "ksl")
+    assert seq_input is not None, "마지막 프레임에서 모델 입력이 나와야 함"
+    return seq_input[0]
+
+
+def padded(features, max_timesteps):
+    """학습(train_sequence_model.py)처럼 뒤를 0으로 채움"""
+    out = np.zeros((max_timesteps, features.shape[1]), dtype=np.float32)
+    out[:len(features)] = features
+    return out
+
+
+def assert_bit_equal(name, a, b):
+    assert a.dtype == b.dtype == np.float32, f"{name}: dtype {a.dtype} / {b.dtype}"
+    assert a.shape == b.shape, f"{name}: shape {a.shape} / {b.shape}"
+    assert a.tobytes() == b.tobytes(), f"{name}: 최대 차이 {np.max(np.abs(a - b))}"
+    print(f"✅ {name}: {a.shape} 비트 단위 일치")
+
+
+def test_sequence_parity(seeds=20):
+    print("\n=== 시퀀스 특징: 학습 vs 서버 ===")
+    for seed in range(seeds):
+        clip = make_clip(np.random.default_rng(seed))
+        trained = train_features(capture_rows(clip))
+        if seed == 0:
+            assert_bit_equal("기존 수집 코드 CSV = 새 수집 코드 CSV", train_features(legacy_capture_rows(clip)), trained)
+            assert_bit_equal("학습 = 서버 (클립)", trained, serve_clip_features(clip))
+            assert_bit_equal("학습 = 서버 (프레임별 링 버퍼)", trained, serve_stream_features(clip))
+        else:
+            assert train_features(legacy_capture_rows(clip)).tobytes() == trained.tobytes()
+            assert trained.tobytes() == serve_clip_features(clip).tobytes()
+            assert trained.tobytes() == serve_stream_features(clip).tobytes()
+    print(f"✅ 무작위 클립 {seeds}개 모두 일치")
+
+
+def test_sequence_window():
+    print("\n=== 시퀀스 길이: 패딩 / 잘라내기 ===")
+    clip = make_clip(np.random.default_rng(1), frames=24, miss_every=0)
+    trained = train_features(capture_rows(clip))
+    # 학습 길이보다 짧으면 뒤를 0으로 패딩
+    assert_bit_equal("클립 패딩 = 학습 패딩", padded(trained, 32), serve_clip_features(clip, 32))
+    assert_bit_equal("링 버퍼 패딩 = 학습 패딩", padded(trained, 32), serve_stream_features(clip, 32))
+    # 길면 클립은 마지막 프레임들을 새 시퀀스로 (첫 프레임 dx/dy 0), 링 버퍼는 이어지는 창 (직전 프레임 기준 dx/dy)
+    assert_bit_equal("클립 잘라내기 = 마지막 16프레임 학습", train_features(capture_rows(clip[-16:])),
+                     serve_clip_features(clip, 16))
+    assert_bit_equal("링 버퍼 창 = 학습 마지막 16행", trained[-16:], serve_stream_features(clip, 16))
+
+
+def test_stream_deltas_not_zero():
+    """프레임별 계산에서 dx/dy가 0으로 기록되던 문제 (이전 analyze_sequence_sign)"""
+    clip = make_clip(np.random.default_rng(0), miss_every=0)
+    features = serve_stream_features(clip).reshape(len(clip), len(SEQUENCE_LANDMARKS), -1)
+    assert np.all(features[0, :, 2:4] == 0), "첫 프레임 dx/dy는 0"
+    assert np.any(features[1:, :, 2:4] != 0), "두 번째 프레임부터 dx/dy가 있어야 함"
+    print("✅ 프레임별 dx/dy 기록 확인")
+
+
+class Landmark:
+    def __init__(self, x, y):
+        self.x, self.y, self.z = x, y, 0.0
+
+
+class HandLandmarks:
+    """MediaPipe multi_hand_landmarks[i]와 같은 모양 (.landmark[j].x/.y)"""
+
+    def __init__(self, points):
+        self.landmark = [Landmark(x, y) for x, y in points.tolist()]
+
+
+class StaticBackend:
+    input_shape = (STATIC_FEATURE_DIM,)
+
+
+def test_static_parity():
+    print("\n=== 정적 특징: hand_capture.py 좌표 순서 ===")
+    points = np.random.default_rng(0).random((21, 2)).astype(np.float32)
+    hand = HandLandmarks(points)
+    coords = []
+    for lm in hand.landmark:
+        coords.extend([lm.x, lm.y])  # hand_capture.py: [lm.x, lm.y] * 21
+    coords = np.array(coords, dtype=np.float32)
+    # 서버 정적 모델 입력 변환 (InferenceEngine.prepare), 백엔드는 입력 shape만 사용
+    engine = recognition.InferenceEngine(StaticBackend(), labels=["ㄱ"])
+    assert_bit_equal("hand_capture 좌표 = 서버 (MediaPipe 랜드마크)", coords, engine.prepare(hand))
+    out = np.full((1, len(coords)), np.nan, dtype=np.float32)
+    assert_bit_equal("hand_capture 좌표 = 서버 (카메라 스트림 입력 버퍼)", coords, engine.prepare(hand, out))
+    client = recognition.parse_landmarks(points.tolist())  # 클라이언트가 보낸 [[x, y], ...]
+    assert_bit_equal("hand_capture 좌표 = 서버 (클라이언트 랜드마크)", coords, engine.prepare(client))
+
+
+if __name__ == "__main__":
+    print("🚀 특징 일치 테스트 시작")
+    test_sequence_parity()
+    test_sequence_window()
+    test_stream_deltas_not_zero()
+    test_static_parity()
+    print("\n✅ 모든 테스트 완료!")
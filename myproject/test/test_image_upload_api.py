@@ -0,0 +1,145 @@
+"""
+이미지 API 입력 형식 테스트 (JSON Base64 / multipart/form-data / image/jpeg 본문)
+서버 실행 후: python test/test_image_upload_api.py [손 사진 JPEG 경로]
+"""
+import sys
+import base64
+from urllib.parse import quote
+import requests
+import cv2
+import numpy as np
+
+BASE_URL = "http://localhost:5002"
+
+def get_auth_token():
+    """로그인해서 토큰 받기"""
+    print("=== 로그인 시도 ===")
+    url = f"{BASE_URL}/api/auth/login"
+    data = {
+        "username": "testuser",
+        "password": "password123"
+    }
+    
+    try:
+        response = requests.post(url, json=data)
+        if response.status_code == 200:
+            token = response.json().get('access_token')
+            print(f"✅ 토큰 받음: {token[:50]}...")
+            return token
+        else:
+            print(f"❌ 로그인 실패: {response.json()}")
+            return None
+    except Exception as e:
+        print(f"❌ 연결 오류: {e}")
+        return None
+
+def load_jpeg(path=None):
+    """테스트용 JPEG 바이트 (경로가 없으면 단색 이미지)"""
+    if path:
+        with open(path, 'rb') as f:
+            return f.read()
+    image = np.full((480, 640, 3), 200, dtype=np.uint8)
+    _, buffer = cv2.imencode('.jpg', image)
+    return buffer.tobytes()
+
+def print_analysis(response):
+    print(f"Status Code: {response.status_code}")
+    if response.status_code == 200:
+        analysis = response.json()['analysis']
+        print(f"정확도: {analysis.get('accuracy')}%, 손 감지: {analysis.get('hand_detected')}, 예측: {analysis.get('predicted_sign')}")
+    else:
+        print(f"Response: {response.text[:200]}")
+
+def test_json_base64(token, jpeg):
+    """기존 JSON + Base64 형식"""
+    print("\n=== 1. analyze-hand (JSON Base64) ===")
+    url = f"{BASE_URL}/api/recognition/analyze-hand"
+    headers = {"Authorization": f"Bearer {token}"}
+    data = {
+        "target_sign": "ㄱ",
+        "language": "ksl",
+        "image_data": "data:image/jpeg;base64," + base64.b64encode(jpeg).decode('utf-8')
+    }
+    
+    try:
+        print_analysis(requests.post(url, json=data, headers=headers))
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
+def test_multipart(token, jpeg):
+    """multipart/form-data (image 파일 + 폼 필드)"""
+    print("\n=== 2. analyze-hand (multipart/form-data) ===")
+    url = f"{BASE_URL}/api/recognition/analyze-hand"
+    headers = {"Authorization": f"Bearer {token}"}
+    files = {"image": ("frame.jpg", jpeg, "image/jpeg")}
+    data = {"target_sign": "ㄱ", "language": "ksl"}
+    
+    try:
+        print_analysis(requests.post(url, files=files, data=data, headers=headers))
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
+def test_raw_jpeg(token, jpeg):
+    """image/jpeg 본문 + 메타데이터 헤더 (한글은 URL 인코딩)"""
+    print("\n=== 3. analyze-hand (image/jpeg 본문) ===")
+    url = f"{BASE_URL}/api/recognition/analyze-hand"
+    headers = {
+        "Authorization": f"Bearer {token}",
+        "Content-Type": "image/jpeg",
+        "X-Target-Sign": quote("ㄱ"),
+        "X-Language": "ksl"
+    }
+    
+    try:
+        print_analysis(requests.post(url, data=jpeg, headers=headers))
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
+def test_realtime_raw_jpeg(token, jpeg):
+    """real-time (image/jpeg 본문, 언어는 쿼리 파라미터)"""
+    print("\n=== 4. real-time (image/jpeg 본문) ===")
+    url = f"{BASE_URL}/api/recognition/real-time?language=ksl"
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "image/jpeg"}
+    
+    try:
+        response = requests.post(url, data=jpeg, headers=headers)
+        print(f"Status Code: {response.status_code}")
+        print(f"Response: {response.json().get('recognition_result')}")
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
+def test_bad_json(token):
+    """JSON 객체가 아닌 본문 / 문자열이 아닌 image_data → 400 (500이 아니어야 함)"""
+    print("\n=== 5. analyze-hand (잘못된 JSON 본문) ===")
+    url = f"{BASE_URL}/api/recognition/analyze-hand"
+    headers = {"Authorization": f"Bearer {token}", "Content-Type": "application/json"}
+    cases = {
+        "배열 본문": "[1, 2, 3]",
+        "깨진 JSON": "{\"target_sign\": ",
+        "image_data 숫자": "{\"target_sign\": \"ㄱ\", \"image_data\": 5}"
+    }
+    
+    for name, body in cases.items():
+        try:
+            response = requests.post(url, data=body.encode('utf-8'), headers=headers)
+            mark = "✅" if response.status_code == 400 else "❌"
+            print(f"{mark} {name}: {response.status_code} {response.text[:100]}")
+        except Exception as e:
+            print(f"❌ 오류: {e}")
+
+if __name__ == "__main__":
+    print("🎯 이미지 API 입력 형식 테스트 시작\n")
+    
+    token = get_auth_token()
+    if not token:
+        print("❌ 로그인 실패 - Flask 앱이 실행 중인지 확인하세요!")
+        exit()
+    
+    jpeg = load_jpeg(sys.argv[1] if len(sys.argv) > 1 else None)
+    test_json_base64(token, jpeg)
+    test_multipart(token, jpeg)
+    test_raw_jpeg(token, jpeg)
+    test_realtime_raw_jpeg(token, jpeg)
+    test_bad_json(token)
+    
+    print("\n🎉 이미지 API 입력 형식 테스트 완료!")
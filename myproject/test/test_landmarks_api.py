@@ -0,0 +1,172 @@
+"""
+랜드마크 입력 API 테스트 (이미지 대신 손 랜드마크 21x(x, y)를 직접 전송)
+서버 실행 후: python test/test_landmarks_api.py
+"""
+import requests
+import random
+
+BASE_URL = "http://localhost:5002"
+
+def get_auth_token():
+    """로그인해서 토큰 받기"""
+    print("=== 로그인 시도 ===")
+    url = f"{BASE_URL}/api/auth/login"
+    data = {
+        "username": "testuser",
+        "password": "password123"
+    }
+    
+    try:
+        response = requests.post(url, json=data)
+        if response.status_code == 200:
+            token = response.json().get('access_token')
+            print(f"✅ 토큰 받음: {token[:50]}...")
+            return token
+        else:
+            print(f"❌ 로그인 실패: {response.json()}")
+            return None
+    except Exception as e:
+        print(f"❌ 연결 오류: {e}")
+        return None
+
+def make_landmarks(offset=0.0):
+    """임의의 손 랜드마크 21개 [[x, y], ...] (0~1 정규화 좌표)"""
+    return [[0.4 + offset + random.uniform(-0.1, 0.1), 0.5 + random.uniform(-0.2, 0.2)] for _ in range(21)]
+
+def test_landmarks_realtime(token):
+    """실시간 인식 (랜드마크 입력)"""
+    print("\n=== 1. 실시간 인식 (랜드마크) ===")
+    url = f"{BASE_URL}/api/recognition/landmarks/real-time"
+    headers = {"Authorization": f"Bearer {token}"}
+    data = {
+        "language": "ksl",
+        "landmarks": make_landmarks()
+    }
+    
+    try:
+        response = requests.post(url, json=data, headers=headers)
+        print(f"Status Code: {response.status_code}")
+        print(f"Response: {response.json().get('recognition_result')}")
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
+def test_landmarks_static_analysis(token):
+    """정적 수어 손모양 분석 (랜드마크 입력)"""
+    print("\n=== 2. 정적 수어 분석 (랜드마크) ===")
+    url = f"{BASE_URL}/api/recognition/landmarks/analyze-hand"
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    for sign in ['ㄱ', 'ㄴ', 'ㅏ']:
+        data = {
+            "target_sign": sign,
+            "language": "ksl",
+            "landmarks": make_landmarks()
+        }
+        try:
+            response = requests.post(url, json=data, headers=headers)
+            if response.status_code == 200:
+                analysis = response.json()['analysis']
+                print(f"  📝 {sign}: {analysis['accuracy']}% - 예측 {analysis.get('predicted_sign')}")
+            else:
+                print(f"  ❌ {sign}: 오류 - {response.json()}")
+        except Exception as e:
+            print(f"  ❌ {sign}: 요청 오류 - {e}")
+
+def test_landmarks_sequence_analysis(token):
+    """시퀀스 수어 분석 (랜드마크를 프레임마다 전송, 서버 버퍼 사용)"""
+    print("\n=== 3. 시퀀스 수어 분석 (랜드마크) ===")
+    url = f"{BASE_URL}/api/recognition/landmarks/analyze-hand"
+    headers = {"Authorization": f"Bearer {token}"}
+    
+    for i in range(8):
+        data = {
+            "target_sign": "ㄲ",
+            "language": "ksl",
+            "landmarks": make_landmarks(offset=0.02 * i)
+        }
+        try:
+            response = requests.post(url, json=data, headers=headers)
+            analysis = response.json().get('analysis', {})
+            print(f"  🎬 프레임 {i + 1}: 버퍼 {analysis.get('buffer_size')} - "
+                  f"수집 중={analysis.get('collecting', False)} 예측={analysis.get('predicted_sign')}")
+        except Exception as e:
+            print(f"  ❌ 요청 오류: {e}")
+
+def test_landmarks_no_hand(token):
+    """손 없음 (빈 랜드마크)"""
+    print("\n=== 4. 손 없음 (빈 배열) ===")
+    url = f"{BASE_URL}/api/recognition/landmarks/analyze-hand"
+    headers = {"Authorization": f"Bearer {token}"}
+    data = {"target_sign": "ㄱ", "language": "ksl", "landmarks": []}
+    
+    try:
+        response = requests.post(url, json=data, headers=headers)
+        print(f"Status Code: {response.status_code}")
+        print(f"hand_detected: {response.json()['analysis']['hand_detected']}")
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
+def test_landmarks_invalid(token):
+    """잘못된 랜드마크 형식 → 400"""
+    print("\n=== 5. 잘못된 형식 ===")
+    url = f"{BASE_URL}/api/recognition/landmarks/real-time"
+    headers = {"Authorization": f"Bearer {token}"}
+    data = {"language": "ksl", "landmarks": [[0.1, 0.2]] * 5}
+    
+    try:
+        response = requests.post(url, json=data, headers=headers)
+        print(f"Status Code: {response.status_code} (400 예상)")
+        print(f"Response: {response.json()}")
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
+def test_sequence_clip(token):
+    """시퀀스 클립 분석 (동작 전체를 요청 한 번으로 전송)"""
+    print("\n=== 6. 시퀀스 클립 분석 (랜드마크 16프레임) ===")
+    url = f"{BASE_URL}/api/recognition/analyze-clip"
+    headers = {"Authorization": f"Bearer {token}"}
+    data = {
+        "target_sign": "ㄲ",
+        "language": "ksl",
+        "landmarks": [make_landmarks(offset=0.02 * i) for i in range(16)]
+    }
+    
+    try:
+        response = requests.post(url, json=data, headers=headers)
+        print(f"Status Code: {response.status_code}")
+        analysis = response.json().get('analysis', {})
+        print(f"예측: {analysis.get('predicted_sign')} ({analysis.get('accuracy')}%), 프레임 {analysis.get('frame_count')}")
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
+def test_sequence_clip_static_target(token):
+    """정적 수어를 클립 API로 보내면 400"""
+    print("\n=== 7. 클립 API에 정적 수어 ===")
+    url = f"{BASE_URL}/api/recognition/analyze-clip"
+    headers = {"Authorization": f"Bearer {token}"}
+    data = {"target_sign": "ㄱ", "language": "ksl", "landmarks": [make_landmarks()] * 5}
+    
+    try:
+        response = requests.post(url, json=data, headers=headers)
+        print(f"Status Code: {response.status_code} (400 예상)")
+        print(f"Response: {response.json()}")
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
+if __name__ == "__main__":
+    print("🎯 랜드마크 입력 API 테스트 시작\n")
+    
+    token = get_auth_token()
+    if not token:
+        print("❌ 로그인 실패 - Flask 앱이 실행 중인지 확인하세요!")
+        exit()
+    
+    test_landmarks_realtime(token)
+    test_landmarks_static_analysis(token)
+    test_landmarks_sequence_analysis(token)
+    test_landmarks_no_hand(token)
+    test_landmarks_invalid(token)
+    test_sequence_clip(token)
+    test_sequence_clip_static_target(token)
+    
+    print("\n🎉 랜드마크 입력 API 테스트 완료!")
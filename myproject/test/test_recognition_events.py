@@ -0,0 +1,121 @@
+"""
+인식 결과 푸시 채널 테스트 (SSE + ?since= 조건부 폴링)
+서버 실행 후: python test/test_recognition_events.py
+(/video_feed_ksl을 브라우저로 열어 두고 손을 움직이면 이벤트가 들어옴)
+"""
+import json
+import threading
+import time
+import requests
+
+BASE_URL = "http://localhost:5002"
+
+def get_auth_token():
+    """로그인해서 토큰 받기"""
+    print("=== 로그인 시도 ===")
+    url = f"{BASE_URL}/api/auth/login"
+    data = {
+        "username": "testuser",
+        "password": "password123"
+    }
+    
+    try:
+        response = requests.post(url, json=data)
+        if response.status_code == 200:
+            token = response.json().get('access_token')
+            print(f"✅ 토큰 받음: {token[:50]}...")
+            return token
+        else:
+            print(f"❌ 로그인 실패: {response.json()}")
+            return None
+    except Exception as e:
+        print(f"❌ 연결 오류: {e}")
+        return None
+
+def test_conditional_polling():
+    """?since=<version> 폴링 - 변경이 없으면 304"""
+    print("\n=== 1. 조건부 폴링 ===")
+    url = f"{BASE_URL}/api/recognition/current/ksl"
+    
+    try:
+        response = requests.get(url)
+        data = response.json()
+        print(f"Status Code: {response.status_code}, version: {data.get('version')}, ETag: {response.headers.get('ETag')}")
+        
+        response = requests.get(url, params={'since': data.get('version')})
+        print(f"since={data.get('version')} → Status Code: {response.status_code} (변경 없으면 304)")
+        
+        response = requests.get(url, headers={'If-None-Match': f'"{data.get("version")}"'})
+        print(f"If-None-Match → Status Code: {response.status_code}")
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
+def test_sse_events(duration=10):
+    """SSE 구독 - 인식 결과가 바뀔 때만 이벤트 수신"""
+    print(f"\n=== 2. SSE 이벤트 ({duration}초) ===")
+    url = f"{BASE_URL}/api/recognition/events/ksl"
+    
+    try:
+        # 다른 스레드에서 문자열을 바꿔서 이벤트 발생시키기
+        threading.Timer(1.0, lambda: requests.get(f"{BASE_URL}/clear_string/ksl")).start()
+        
+        deadline = time.time() + duration
+        with requests.get(url, stream=True, timeout=duration + 20) as response:
+            print(f"Status Code: {response.status_code}, Content-Type: {response.headers.get('Content-Type')}")
+            for line in response.iter_lines(decode_unicode=True):
+                if line.startswith('data: '):
+                    event = json.loads(line[len('data: '):])
+                    print(f"📨 v{event['version']} current='{event['current']}' string='{event['string']}'")
+                elif line.startswith(':'):
+                    print("💓 keep-alive")
+                if time.time() > deadline:
+                    break
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
+def test_events_status():
+    """푸시 채널 상태"""
+    print("\n=== 3. 푸시 채널 상태 ===")
+    try:
+        response = requests.get(f"{BASE_URL}/api/recognition/events/status")
+        print(f"Response: {response.json()}")
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
+def test_logged_in_stream_session(token):
+    """로그인 사용자가 카메라 스트림(?stream=0)을 보면 이후 stream 없이 조회해도 같은 스트림 세션"""
+    print("\n=== 4. 로그인 사용자 + 카메라 스트림 세션 ===")
+    url = f"{BASE_URL}/api/recognition/current/ksl"
+    headers = {'Authorization': f'Bearer {token}'}
+    
+    try:
+        # 카메라 루프가 쓰는 스트림 세션에 구분용 문자열 만들기 (익명, 기본 스트림)
+        requests.get(f"{BASE_URL}/clear_string/ksl", params={'stream': '0'})
+        stream_state = requests.get(url, params={'stream': '0'}).json()
+        
+        # 로그인 사용자가 스트림을 지정해서 조회 → 그 스트림에 연결됨
+        response = requests.get(url, params={'stream': '0'}, headers=headers)
+        print(f"stream=0 (로그인) → Status Code: {response.status_code}, version: {response.json().get('version')}")
+        
+        # 이후 stream 없이 조회해도 같은 스트림 세션의 결과
+        response = requests.get(url, headers=headers)
+        data = response.json()
+        same = data.get('version') == stream_state.get('version') and data.get('string') == stream_state.get('string')
+        print(f"stream 없이 (로그인) → version: {data.get('version')} (스트림: {stream_state.get('version')})")
+        print("✅ 카메라 스트림 결과 조회" if same else "❌ 스트림 세션과 다름")
+        
+        # 서버가 열지 않는 스트림은 거부
+        response = requests.get(url, params={'stream': 'other-camera'})
+        print(f"stream=other-camera → Status Code: {response.status_code} (403 예상)")
+    except Exception as e:
+        print(f"❌ 오류: {e}")
+
+if __name__ == "__main__":
+    print("🚀 인식 결과 푸시 채널 테스트 시작\n")
+    test_conditional_polling()
+    test_sse_events()
+    test_events_status()
+    token = get_auth_token()
+    if token:
+        test_logged_in_stream_session(token)
+    print("\n✅ 테스트 완료")